@@ -1,6 +1,9 @@
 import streamlit as st
-import streamlit as st
 
+from utils.db_connection import get_pool
+
+# open the shared connection pool (and create / upgrade the schema) before any page runs
+get_pool()
 
 
 st.title("🏏 Cricbuzz Live Stats Dashboard")
@@ -1,18 +1,19 @@
 # pages/crud_operations.py
 import streamlit as st
-import sqlite3, os
+from utils.live_snapshot import get_live_snapshot
+from utils.status_parser import parse_status
+from utils.write_queue import get_write_queue
 
-st.set_page_config(page_title="CRUD Operations", layout="wide")
-DB_PATH = os.path.abspath("cricbuzz.db")
+WRITE_TIMEOUT_S = 10
 
-def get_conn():
-    return sqlite3.connect(DB_PATH, check_same_thread=False)
+st.set_page_config(page_title="CRUD Operations", layout="wide")
 
 st.title("🛠 CRUD — Manage live_matches (safe demo)")
 
-# Show current rows
-with get_conn() as conn:
-    rows = conn.execute("SELECT match_id, series_name, team1, team2, status FROM live_matches ORDER BY COALESCE(start_ts,0) DESC").fetchall()
+# Show current rows (from the shared snapshot; writes below go through the write queue,
+# whose commit makes the next read pick up a fresh one)
+snapshot = get_live_snapshot()
+rows = [(m.match_id, m.series_name, m.team1, m.team2, m.status) for m in snapshot.recent()]
 
 st.subheader("Current rows")
 if rows:
@@ -34,25 +35,32 @@ with st.form("add_match"):
         if not new_id:
             st.error("Match ID is required.")
         else:
-            with get_conn() as conn:
-                conn.execute("""
-                    INSERT OR REPLACE INTO live_matches
-                    (match_id, series_name, team1, team2, status, updated_at)
-                    VALUES (?, ?, ?, ?, ?, datetime('now'))
-                """, (new_id, series, t1, t2, status))
-                conn.commit()
+            winner, vtype, margin, complete = parse_status(status)
+            # an upsert, not INSERT OR REPLACE: REPLACE's implicit delete skips the
+            # team_results/head_to_head triggers
+            get_write_queue().execute("""
+                INSERT INTO live_matches
+                (match_id, series_name, team1, team2, status,
+                 winner, victory_type, victory_margin, is_complete, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, strftime('%Y-%m-%dT%H:%M:%SZ', 'now'))
+                ON CONFLICT(match_id) DO UPDATE SET
+                    series_name=excluded.series_name, team1=excluded.team1, team2=excluded.team2,
+                    status=excluded.status, winner=excluded.winner, victory_type=excluded.victory_type,
+                    victory_margin=excluded.victory_margin, is_complete=excluded.is_complete,
+                    updated_at=excluded.updated_at
+            """, (new_id, series, t1, t2, status, winner, vtype, margin, complete)).result(timeout=WRITE_TIMEOUT_S)
             st.success("Added/Updated match.")
 
 st.markdown("---")
 st.subheader("Edit / Delete an existing match")
-with get_conn() as conn:
-    choices = [r[0] for r in conn.execute("SELECT match_id FROM live_matches").fetchall()]
+snapshot = get_live_snapshot()   # includes a match added above in this run
+choices = sorted(snapshot.match_ids())
 
 if choices:
     sel = st.selectbox("Select match_id to edit", choices)
     if sel:
-        with get_conn() as conn:
-            r = conn.execute("SELECT match_id, series_name, team1, team2, status FROM live_matches WHERE match_id=?", (sel,)).fetchone()
+        m = snapshot.get(sel)
+        r = (m.match_id, m.series_name, m.team1, m.team2, m.status) if m else None
         if r:
             with st.form("edit_match"):
                 series = st.text_input("Series name", value=r[1])
@@ -62,18 +70,18 @@ if choices:
                 update_btn = st.form_submit_button("Update")
                 delete_btn = st.form_submit_button("Delete")
                 if update_btn:
-                    with get_conn() as conn:
-                        conn.execute("""
-                            UPDATE live_matches
-                            SET series_name=?, team1=?, team2=?, status=?, updated_at=datetime('now')
-                            WHERE match_id=?
-                        """, (series, t1, t2, status, sel))
-                        conn.commit()
+                    winner, vtype, margin, complete = parse_status(status)
+                    get_write_queue().execute("""
+                        UPDATE live_matches
+                        SET series_name=?, team1=?, team2=?, status=?,
+                            winner=?, victory_type=?, victory_margin=?, is_complete=?, updated_at=strftime('%Y-%m-%dT%H:%M:%SZ', 'now')
+                        WHERE match_id=?
+                    """, (series, t1, t2, status, winner, vtype, margin, complete, sel)).result(timeout=WRITE_TIMEOUT_S)
                     st.success("Updated.")
                 if delete_btn:
-                    with get_conn() as conn:
-                        conn.execute("DELETE FROM live_matches WHERE match_id=?", (sel,))
-                        conn.commit()
+                    get_write_queue().execute(
+                        "DELETE FROM live_matches WHERE match_id=?", (sel,)
+                    ).result(timeout=WRITE_TIMEOUT_S)
                     st.success("Deleted.")
 else:
     st.info("No rows to edit/delete yet.")
\ No newline at end of file
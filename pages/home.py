@@ -1,30 +1,57 @@
 # pages/home.py
 import streamlit as st
-import sqlite3, os
 from datetime import datetime
+from utils.db_connection import read_conn
+from utils.db_stats import read_db_stats
+from utils.poller import get_poller
 
 st.set_page_config(page_title="Home - Cricbuzz Live Stats", layout="wide")
 
-DB_PATH = os.path.abspath("cricbuzz.db")
-def get_conn():
-    return sqlite3.connect(DB_PATH, check_same_thread=False)
-
 st.title("🏏 Cricbuzz Live Stats — Home")
 st.write("Welcome — this dashboard shows live matches from the free Cricbuzz feed. Use the sidebar to navigate.")
 
-# Summary metrics
-with get_conn() as conn:
+# Summary metrics: one maintained row (utils/db_stats.py), not a scan per rerun
+with read_conn() as conn:
     try:
-        count = conn.execute("SELECT COUNT(*) FROM live_matches").fetchone()[0]
-        last_update = conn.execute("SELECT MAX(updated_at) FROM live_matches").fetchone()[0]
+        stats = read_db_stats(conn)
     except Exception:
-        count = 0
-        last_update = None
+        stats = None
+stats = stats or {"matches": 0, "live": 0, "complete": 0, "last_updated_at": None,
+                  "changes": 0, "changed_at": None, "formats": {}}
+
+def ago(iso):
+    """'42s ago' / '5m ago' / '3h ago' for an ISO-8601 UTC timestamp."""
+    if not iso:
+        return "never"
+    secs = max(0, int((datetime.utcnow() - datetime.fromisoformat(iso.rstrip("Z"))).total_seconds()))
+    for unit, size in (("d", 86400), ("h", 3600), ("m", 60)):
+        if secs >= size:
+            return f"{secs // size}{unit} ago"
+    return f"{secs}s ago"
+
+col1, col2, col3, col4 = st.columns(4)
+col1.metric("Matches stored", stats["matches"])
+col2.metric("Live / upcoming", stats["live"])
+col3.metric("Completed", stats["complete"])
+col4.write("Last update (UTC)")
+col4.write(stats["last_updated_at"] or "N/A")
+if stats["formats"]:
+    st.caption(" · ".join(f"{fmt}: {n}" for fmt, n in stats["formats"].items()))
+st.caption(f"Data last changed {ago(stats['changed_at'])} ({stats['changes']} changes recorded)")
 
-col1, col2 = st.columns(2)
-col1.metric("Matches stored", count)
-col2.write("Last update (UTC)")
-col2.write(last_update or "N/A")
+# Operational metrics from this server's poller (in memory, so no DB writes per poll)
+status = get_poller().status()
+quota = status["quota"]
+st.subheader("Ingest")
+o1, o2, o3, o4 = st.columns(4)
+o1.metric("Poller", "running" if status["running"] else "stopped", f"last poll {ago(status['last_run_at'])}",
+          delta_color="off")
+o2.metric("Last poll latency", f"{status['last_duration_s']}s" if status["last_duration_s"] is not None else "N/A")
+o3.metric("API errors", f"{status['errors']} / {status['runs']} polls")
+o4.metric("Quota left", max(0, quota["monthly_quota"] - quota["used_this_period"]),
+          f"{quota['tokens_available']} tokens now", delta_color="off")
+if status["last_ok"] is False:
+    st.error(f"Last fetch failed: {status['last_error']}")
 
 st.markdown("---")
 st.subheader("Quick tips")
@@ -1,17 +1,13 @@
 # pages/scorecard.py
 import streamlit as st
-import sqlite3
-import os
 from datetime import datetime
-import pandas as pd
+from utils.db_connection import read_conn
+from utils.live_snapshot import get_live_snapshot
+from utils.match_history import match_timeline
+from utils.queries import SCORECARD_BATTING_SQL, SCORECARD_TEAM_SCORES_SQL
 
 st.set_page_config(page_title="Scorecard", layout="wide")
 
-DB_PATH = os.path.abspath("cricbuzz.db")
-
-def get_conn():
-    return sqlite3.connect(DB_PATH, check_same_thread=False)
-
 def fmt_time(ts):
     """Format timestamp (milliseconds or seconds) to human readable string."""
     if not ts:
@@ -115,14 +111,9 @@ st.markdown('<div class="page-bg">', unsafe_allow_html=True)
 
 st.title("🏏 Live Scorecard — (Free API / DB view)")
 
-# Fetch matches (try to order by start_ts if present; fallback to simple select)
-with get_conn() as conn:
-    try:
-        cur = conn.execute("SELECT * FROM live_matches ORDER BY COALESCE(start_ts, 0) DESC LIMIT 200")
-    except Exception:
-        cur = conn.execute("SELECT * FROM live_matches LIMIT 200")
-    cols = [d[0] for d in cur.description]
-    matches = [dict(zip(cols, r)) for r in cur.fetchall()]
+# Latest 200 matches from the process-wide snapshot (no query per rerun);
+# records support .get() like the row dicts this page used to build
+matches = get_live_snapshot().recent(200)
 
 if not matches:
     st.markdown("</div>", unsafe_allow_html=True)
@@ -194,9 +185,9 @@ st.markdown('</div>', unsafe_allow_html=True)  # close header card
 st.markdown('<div class="scorecard-box">', unsafe_allow_html=True)
 
 # Fetch team-level totals from match_score table if available
-with get_conn() as conn:
+with read_conn() as conn:
     try:
-        rows = conn.execute("SELECT team_name, runs, wickets, overs FROM match_score WHERE match_id = ?", (match_id,)).fetchall()
+        rows = conn.execute(SCORECARD_TEAM_SCORES_SQL, (match_id,)).fetchall()
     except Exception:
         rows = []
 
@@ -247,18 +238,29 @@ with col_a:
     """, unsafe_allow_html=True)
 
     # If there were detailed batting/bowling (player_stats), we can show a small message or a table.
-    with get_conn() as conn:
+    with read_conn() as conn:
         try:
-            bat_rows = conn.execute("SELECT player_name, runs, balls FROM player_stats WHERE match_id = ? AND role = 'Batsman' LIMIT 10", (match_id,)).fetchall()
+            bat_rows = conn.execute(SCORECARD_BATTING_SQL, (match_id,)).fetchall()
         except Exception:
             bat_rows = []
     if bat_rows:
+        import pandas as pd   # only when there's a table to show; the free feed rarely has one
         st.markdown("**Top batting snippets (sample):**")
         df_bat = pd.DataFrame(bat_rows, columns=["Player", "R", "B"])
         st.dataframe(df_bat)
     else:
         st.info("Player-level stats are not available for this match (free API). For demo, add rows via CRUD or use paid API.")
 
+    # How the status moved over the polls we've seen (match_state_history)
+    with read_conn() as conn:
+        try:
+            timeline = match_timeline(conn, match_id)
+        except Exception:
+            timeline = []
+    if len(timeline) > 1:
+        with st.expander(f"Status timeline ({len(timeline)} changes)"):
+            st.dataframe([{"at": t["at"], "status": t["status"]} for t in timeline], hide_index=True)
+
 with col_b:
     # Quick stats card
     st.markdown('<div style="padding:10px;border-radius:10px;background:#fff;">', unsafe_allow_html=True)
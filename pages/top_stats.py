@@ -1,54 +1,78 @@
 import streamlit as st
-import pandas as pd
-import matplotlib.pyplot as plt
+from utils.chart_cache import bar_chart_png
+from utils.db_connection import read_conn
+from utils.leaderboards import MIN_INNINGS, MIN_WICKETS, read_board
 
 st.set_page_config(page_title="Top Cricket Stats", layout="wide")
 
 st.title("📊 Top Cricket Stats Dashboard")
 
-# --- Sample Data ---
-# Mock "Top Batsmen"
-batsmen_data = pd.DataFrame({
-    "Player": ["Virat Kohli", "Babar Azam", "Rohit Sharma", "Steve Smith", "Kane Williamson"],
-    "Runs": [12876, 9802, 10754, 9513, 9401],
-    "Average": [57.3, 54.6, 48.5, 50.1, 47.8],
-    "Centuries": [46, 25, 31, 28, 27]
-})
-
-# Mock "Top Bowlers"
-bowlers_data = pd.DataFrame({
-    "Player": ["Jasprit Bumrah", "Mitchell Starc", "Shaheen Afridi", "Rashid Khan", "Trent Boult"],
-    "Wickets": [217, 210, 178, 180, 195],
-    "Average": [24.6, 26.1, 27.4, 21.5, 25.7],
-    "Economy": [4.5, 4.9, 5.2, 4.1, 4.8]
-})
+
+def load_board(board, fmt, n):
+    """Top `n` of a precomputed leaderboard (a primary-key range read, however many careers are stored)."""
+    import pandas as pd
+
+    with read_conn() as conn:
+        cols, rows = read_board(conn, board, fmt, n)
+    return pd.DataFrame(rows, columns=cols)
+
+
+with read_conn() as conn:
+    formats = [r[0] for r in conn.execute("SELECT DISTINCT format FROM leaderboards ORDER BY format")]
+
+if not formats:
+    st.info("No player statistics yet — ingest some scorecards or run `python -m scripts.generate_dataset`.")
+    st.stop()
+
+c1, c2 = st.columns([2, 1])
+with c1:
+    fmt = st.selectbox("Format", formats, index=formats.index("ODI") if "ODI" in formats else 0)
+with c2:
+    top_n = st.slider("Players", 5, 25, 5)
+
+batsmen = load_board("runs", fmt, top_n)
+bowlers = load_board("wickets", fmt, top_n)
+batsmen_data = batsmen.rename(columns={
+    "player": "Player", "total_runs": "Runs", "batting_average": "Average", "centuries": "Centuries",
+})[["Player", "Runs", "Average", "Centuries"]]
+bowlers_data = bowlers.rename(columns={
+    "player": "Player", "total_wickets": "Wickets", "bowling_average": "Average", "economy": "Economy",
+})[["Player", "Wickets", "Average", "Economy"]]
 
 # --- Layout with columns ---
 col1, col2 = st.columns(2)
 
 with col1:
-    st.subheader("🏏 Top 5 Batsmen (ODI)")
-    st.dataframe(batsmen_data, use_container_width=True)
+    st.subheader(f"🏏 Top {top_n} Batsmen ({fmt})")
+    st.dataframe(batsmen_data, hide_index=True)
 
-    # Bar Chart for Runs
-    fig, ax = plt.subplots()
-    batsmen_data.plot(x="Player", y="Runs", kind="bar", ax=ax, legend=False, color="orange")
-    ax.set_ylabel("Runs")
-    ax.set_title("Runs by Top Batsmen")
-    st.pyplot(fig)
+    # Bar Chart for Runs (rendered once per data change, shared by all sessions)
+    if not batsmen_data.empty:
+        st.image(bar_chart_png(batsmen_data, x="Player", y="Runs", title="Runs by Top Batsmen", color="orange"))
 
 with col2:
-    st.subheader("🔥 Top 5 Bowlers (ODI)")
-    st.dataframe(bowlers_data, use_container_width=True)
+    st.subheader(f"🔥 Top {top_n} Bowlers ({fmt})")
+    st.dataframe(bowlers_data, hide_index=True)
 
     # Bar Chart for Wickets
-    fig, ax = plt.subplots()
-    bowlers_data.plot(x="Player", y="Wickets", kind="bar", ax=ax, legend=False, color="purple")
-    ax.set_ylabel("Wickets")
-    ax.set_title("Wickets by Top Bowlers")
-    st.pyplot(fig)
+    if not bowlers_data.empty:
+        st.image(bar_chart_png(bowlers_data, x="Player", y="Wickets", title="Wickets by Top Bowlers", color="purple"))
 
 # --- Extra Stats ---
 st.subheader("📈 Additional Insights")
-st.write("✔️ Virat Kohli leads in runs with 12,876 ODI runs.")
-st.write("✔️ Jasprit Bumrah has the best bowling economy among the top bowlers.")
\ No newline at end of file
+averages = load_board("batting_average", fmt, 1)
+economies = load_board("economy", fmt, 1)
+if not batsmen.empty:
+    top = batsmen.iloc[0]
+    st.write(f"✔️ {top['player']} leads in runs with {int(top['total_runs']):,} {fmt} runs.")
+if not averages.empty:
+    top = averages.iloc[0]
+    st.write(f"✔️ {top['player']} has the best batting average, {top['batting_average']:.2f} "
+             f"(min. {MIN_INNINGS} innings).")
+if not bowlers.empty:
+    top = bowlers.iloc[0]
+    st.write(f"✔️ {top['player']} leads in wickets with {int(top['total_wickets']):,}.")
+if not economies.empty:
+    top = economies.iloc[0]
+    st.write(f"✔️ {top['player']} has the best bowling economy, {top['economy']:.2f} "
+             f"(min. {MIN_WICKETS} wickets).")
@@ -0,0 +1,161 @@
+# scripts/archive.py
+"""Inspect, fill and reindex the raw payload archive (utils/payload_archive.py).
+
+Usage:
+    python -m scripts.archive stats [--archive PATH]
+    python -m scripts.archive add FILE... [--codec zlib|lzma]   # payload .json or record_live capture
+    python -m scripts.archive show PAYLOAD_ID                  # rebuilt payload JSON on stdout
+    python -m scripts.archive reindex [--workers N] [--since ISO] [--db PATH] [--columnar DIR]
+                                      [--flatten module:function] [--dry-run]
+
+reindex re-runs flatten_match (or --flatten) over every archived payload and
+replays the results into live_matches oldest payload first, each row stamped
+with its payload's fetch time, so new columns are backfilled without
+re-fetching and the status-history and team-results triggers see the
+transitions in order. Each distinct (series, match fragment) is decoded and
+flattened once, in --workers processes; only the upserts are sequential.
+Finishes with a full ETL load and a full columnar export (--columnar), since
+the replayed stamps are older than both watermarks.
+"""
+import argparse
+import importlib
+import json
+import os
+import sqlite3
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from utils.capture import read_capture
+from utils.columnar import export_incremental
+from utils.config import ARCHIVE_PATH, COLUMNAR_DIR, DB_PATH
+from utils.etl import load_incremental
+from utils.live_feed import upsert_matches
+from utils.match_history import to_ts
+from utils.migrations import migrate
+from utils.payload_archive import CODECS, DEFAULT_CODEC, PayloadArchive
+
+DEFAULT_FLATTEN = "utils.live_feed:flatten_match"
+CHUNK = 256            # fragments per worker task
+
+_worker = {}
+
+
+def _load_flatten(spec):
+    module, _, name = spec.partition(":")
+    return getattr(importlib.import_module(module), name)
+
+
+def _init_worker(archive_path, flatten_spec):
+    _worker["archive"] = PayloadArchive(archive_path, read_only=True)
+    _worker["flatten"] = _load_flatten(flatten_spec)
+
+
+def _flatten_chunk(pairs):
+    archive, flatten = _worker["archive"], _worker["flatten"]
+    return [(series, h, flatten(series, archive.fragment(h))) for series, h in pairs]
+
+
+def _iso(ts):
+    return datetime.utcfromtimestamp(ts).isoformat(timespec="seconds") + "Z"
+
+
+def reindex(archive_path, db_path, workers=None, since=None, flatten_spec=DEFAULT_FLATTEN, dry_run=False,
+            columnar_dir=COLUMNAR_DIR):
+    started = time.perf_counter()
+    archive = PayloadArchive(archive_path, read_only=True)
+    payloads = archive.payloads(since)
+    pairs = archive.conn.execute("""
+        SELECT DISTINCT i.series_name, i.fragment
+        FROM archive_items i JOIN archive_payloads p ON p.payload_id = i.payload_id
+        WHERE p.fetched_at >= ?
+    """, (since or 0,)).fetchall()
+    chunks = [pairs[i:i + CHUNK] for i in range(0, len(pairs), CHUNK)]
+    rows = {}
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(archive_path, flatten_spec)) as pool:
+        for result in pool.map(_flatten_chunk, chunks):
+            for series, h, row in result:
+                rows[(series, h)] = row
+    flattened_s = time.perf_counter() - started
+
+    totals = {"payloads": len(payloads), "fragments": len(pairs), "inserted": 0, "updated": 0, "unchanged": 0}
+    if not dry_run:
+        conn = sqlite3.connect(db_path)
+        migrate(conn)
+        last = {}     # match_id -> fragment key last written, to skip repeats cheaply
+        for payload_id, fetched_at in payloads:
+            stamp = _iso(fetched_at)
+            batch = []
+            for series, h in archive.items(payload_id):
+                row = rows[(series, h)]
+                if last.get(row["match_id"]) != (series, h):
+                    last[row["match_id"]] = (series, h)
+                    batch.append(dict(row, updated_at=stamp))
+            if batch:
+                for k, v in upsert_matches(conn, batch).items():
+                    totals[k] += v
+        if totals["inserted"] or totals["updated"]:
+            with conn:
+                totals["etl"] = load_incremental(conn, full=True)
+            totals["columnar"] = export_incremental(conn, columnar_dir, full=True)
+        conn.close()
+    archive.close()
+    totals["flatten_s"] = round(flattened_s, 2)
+    totals["total_s"] = round(time.perf_counter() - started, 2)
+    return totals
+
+
+def add_files(archive_path, paths, codec):
+    archive = PayloadArchive(archive_path, codec=codec)
+    totals = {"payloads": 0, "new_fragments": 0, "stored_bytes": 0}
+    for path in paths:
+        header, frames = read_capture(path)
+        base = to_ts(header["recorded_at"]) if header.get("recorded_at") else int(os.path.getmtime(path))
+        for frame in frames:
+            if frame["status"] != 200:
+                continue
+            added = archive.add(frame["body"], fetched_at=base + frame["t"])
+            totals["payloads"] += 1
+            totals["new_fragments"] += added["new_fragments"]
+            totals["stored_bytes"] += added["stored_bytes"]
+    archive.close()
+    return totals
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Payload archive tools.")
+    ap.add_argument("--archive", default=ARCHIVE_PATH)
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("stats")
+    p_add = sub.add_parser("add")
+    p_add.add_argument("files", nargs="+")
+    p_add.add_argument("--codec", choices=sorted(CODECS), default=DEFAULT_CODEC)
+    p_show = sub.add_parser("show")
+    p_show.add_argument("payload_id", type=int)
+    p_re = sub.add_parser("reindex")
+    p_re.add_argument("--workers", type=int)
+    p_re.add_argument("--since", help="only payloads fetched at/after this ISO time")
+    p_re.add_argument("--db", default=DB_PATH)
+    p_re.add_argument("--columnar", default=COLUMNAR_DIR, help="columnar export to redo (utils/columnar.py)")
+    p_re.add_argument("--flatten", default=DEFAULT_FLATTEN, help="flatten function as module:function")
+    p_re.add_argument("--dry-run", action="store_true", help="flatten everything but write nothing")
+    args = ap.parse_args()
+
+    if args.cmd != "add" and not os.path.exists(args.archive):
+        sys.exit(f"No archive at {args.archive}")
+    if args.cmd == "stats":
+        print(json.dumps(PayloadArchive(args.archive, read_only=True).stats(), indent=2))
+    elif args.cmd == "add":
+        totals = add_files(args.archive, args.files, args.codec)
+        print(f"✅ Archived {totals['payloads']} payloads: {totals['new_fragments']} new fragments, "
+              f"{totals['stored_bytes']:,} bytes stored")
+    elif args.cmd == "show":
+        print(json.dumps(PayloadArchive(args.archive, read_only=True).rebuild(args.payload_id), ensure_ascii=False))
+    else:
+        totals = reindex(args.archive, args.db, args.workers, to_ts(args.since), args.flatten, args.dry_run,
+                         args.columnar)
+        print(f"✅ Reindexed {totals['payloads']} payloads ({totals['fragments']} distinct fragments, "
+              f"flattened in {totals['flatten_s']}s): {totals['inserted']} new, {totals['updated']} changed, "
+              f"{totals['unchanged']} unchanged in {totals['total_s']}s")
@@ -0,0 +1,17 @@
+# scripts/backfill_status.py
+"""Re-derive winner / victory_type / victory_margin / is_complete for every live_matches row.
+
+Usage: python -m scripts.backfill_status [db_path]
+Run after changing utils/status_parser.py so stored rows match the new rules.
+"""
+import sqlite3
+import sys
+
+from utils.config import DB_PATH
+from utils.status_parser import backfill_status
+
+if __name__ == "__main__":
+    db_path = sys.argv[1] if len(sys.argv) > 1 else DB_PATH
+    with sqlite3.connect(db_path) as conn:
+        n = backfill_status(conn)
+    print(f"✅ Re-derived status columns; {n} rows changed")
@@ -0,0 +1,312 @@
+# scripts/benchmark.py
+"""Benchmarks for parsing, ingest and every query the pages run; JSON output + baseline comparison.
+
+Usage:
+    python -m scripts.benchmark [--scale 1] [--repeat 5] [--only query.template]
+                                [--out bench.json] [--baseline base.json] [--threshold 1.25]
+
+Groups:
+  parse.*    flatten_match, parse_status (cold/warm cache), derive_status_columns,
+             the streaming feed parser, all on fixed fixtures
+  ingest.*   upsert_matches rows/sec at 1k/10k/100k rows: first insert, unchanged
+             re-upsert, and every row changed
+  query.*    every FREE_API_QUERIES / TEMPLATE_QUERIES entry and the scorecard lookups,
+             against the deterministic synthetic DB (scripts/generate_dataset.py) at --scale
+
+Each result records median/min/p95 milliseconds over --repeat runs (after one
+warm-up) and, where it makes sense, a throughput. With --baseline, results
+whose median is more than --threshold times the baseline are reported as
+regressions and the exit code is 1.
+"""
+import argparse
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from utils.config import CACHE_DIR
+from utils.db_connection import PRAGMAS, get_pool
+from utils.feed_stream import iter_match_rows, iter_series_matches
+from utils.live_feed import flatten_match, upsert_matches
+from utils.migrations import migrate
+from utils.queries import (
+    FREE_API_QUERIES, SCORECARD_BATTING_SQL, SCORECARD_MATCHES_SQL, SCORECARD_TEAM_SCORES_SQL, TEMPLATE_QUERIES,
+)
+from utils.status_parser import derive_status_columns, parse_status
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "live_payloads", "live_mixed.json")
+BENCH_DIR = os.path.join(os.path.dirname(CACHE_DIR), "bench")
+UPSERT_SIZES = (1_000, 10_000, 100_000)
+UPSERT_BATCH = 500               # what the poller writes per transaction
+DEFAULT_THRESHOLD = 1.25
+SEED = 42
+
+STATUS_FORMS = [
+    "{a} won by {n} wkts", "{a} won by {n} runs", "{a} won by {n} runs (DLS method)",
+    "{a} won by an innings and {n} runs", "Match tied ({a} won the Super Over)",
+    "{a} need {n} runs in 30 balls", "{a} opt to bowl", "{a} lead by {n} runs",
+    "Match drawn", "No result", "Stumps", "Rain stops play",
+]
+TEAMS = ["India", "Australia", "England", "New Zealand A", "Sri Lanka Women", "Kashi Rudras"]
+
+
+# --- helpers ---
+def _timed(fn, repeat):
+    """Run fn() once to warm up, then `repeat` times; returns (durations in ms, last result)."""
+    result = fn()
+    times = []
+    for _ in range(repeat):
+        t = time.perf_counter()
+        result = fn()
+        times.append((time.perf_counter() - t) * 1000)
+    return times, result
+
+
+def _stats(times, **extra):
+    times = sorted(times)
+    p95 = times[min(len(times) - 1, int(round(0.95 * (len(times) - 1))))]
+    out = {"median_ms": round(statistics.median(times), 4), "min_ms": round(times[0], 4),
+           "p95_ms": round(p95, 4), "n": len(times)}
+    out.update(extra)
+    return out
+
+
+def _short(label):
+    """'Q5 - Matches won per team' / 'Q5: Wins per team (...)' / 'Utility: Show latest rows' -> 'Q5' / 'Utility'."""
+    return label.split()[0].rstrip(":")
+
+
+def _fixture_pairs():
+    with open(FIXTURE, "rb") as f:
+        return list(iter_series_matches([f.read()]))
+
+
+def _statuses(n):
+    out = []
+    i = 0
+    while len(out) < n:
+        form = STATUS_FORMS[i % len(STATUS_FORMS)]
+        out.append(form.format(a=TEAMS[i % len(TEAMS)], n=1 + i % 250))
+        i += 1
+    return out
+
+
+def _fresh_db(path):
+    conn = sqlite3.connect(path)
+    migrate(conn)
+    conn.execute("PRAGMA journal_mode=WAL")
+    for pragma in PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
+def _upsert_rows(pairs, n, tag=""):
+    base = [flatten_match(s, m) for s, m in pairs]
+    rows = []
+    for i in range(n):
+        row = dict(base[i % len(base)])
+        row["match_id"] = f"bench-{i}"
+        if tag:
+            row["status"] = f"{row['status']} {tag}"
+        rows.append(row)
+    return rows
+
+
+# --- groups ---
+def bench_parse(repeat):
+    results = {}
+    pairs = _fixture_pairs()
+    calls = 10_000
+    work = (pairs * (calls // len(pairs) + 1))[:calls]
+    times, _ = _timed(lambda: [flatten_match(s, m) for s, m in work], repeat)
+    results["parse.flatten_match"] = _stats(times, calls=calls, per_call_us=round(statistics.median(times) * 1000 / calls, 3))
+
+    statuses = _statuses(5_000)
+
+    def cold():
+        parse_status.cache_clear()
+        return [parse_status(s) for s in statuses]
+
+    times, _ = _timed(cold, repeat)
+    results["parse.parse_status.cold"] = _stats(
+        times, calls=len(statuses), per_call_us=round(statistics.median(times) * 1000 / len(statuses), 3))
+    times, _ = _timed(lambda: [parse_status(s) for s in statuses], repeat)
+    results["parse.parse_status.warm"] = _stats(
+        times, calls=len(statuses), per_call_us=round(statistics.median(times) * 1000 / len(statuses), 3))
+
+    import pandas as pd
+    series = pd.Series(_statuses(50_000))
+    times, _ = _timed(lambda: derive_status_columns(series), repeat)
+    results["parse.derive_status_columns.50k"] = _stats(
+        times, rows_per_s=round(len(series) / (statistics.median(times) / 1000)))
+
+    # the streaming parser on a payload of ~5k matches, fed in 64 KiB chunks like the client does
+    with open(FIXTURE, "rb") as f:
+        doc = json.load(f)
+    type_matches = doc.get("typeMatches", [])
+    doc["typeMatches"] = type_matches * max(1, 5_000 // max(1, len(pairs)))
+    body = json.dumps(doc).encode()
+    chunks = [body[i:i + 65536] for i in range(0, len(body), 65536)]
+    times, rows = _timed(lambda: sum(1 for _ in iter_match_rows(chunks)), repeat)
+    results["parse.feed_stream.5k"] = _stats(
+        times, rows=rows, mb=round(len(body) / 1e6, 2), rows_per_s=round(rows / (statistics.median(times) / 1000)))
+    return results
+
+
+def bench_ingest(repeat, sizes=UPSERT_SIZES):
+    results = {}
+    pairs = _fixture_pairs()
+    for n in sizes:
+        label = f"{n // 1000}k"
+        reps = 1 if n >= 100_000 else max(1, min(repeat, 3))
+        fresh_rows = _upsert_rows(pairs, n)
+        changed_rows = _upsert_rows(pairs, n, tag="(updated)")
+        phases = {"insert": [], "unchanged": [], "changed": []}
+        for _ in range(reps):
+            with tempfile.TemporaryDirectory() as tmp:
+                conn = _fresh_db(os.path.join(tmp, "bench.db"))
+                for phase, rows in (("insert", fresh_rows), ("unchanged", fresh_rows), ("changed", changed_rows)):
+                    t = time.perf_counter()
+                    for i in range(0, n, UPSERT_BATCH):
+                        upsert_matches(conn, rows[i:i + UPSERT_BATCH])
+                    phases[phase].append((time.perf_counter() - t) * 1000)
+                conn.close()
+        for phase, times in phases.items():
+            results[f"ingest.upsert.{label}.{phase}"] = _stats(
+                times, rows=n, rows_per_s=round(n / (statistics.median(times) / 1000)))
+    return results
+
+
+def synthetic_db(scale, seed=SEED):
+    """Path of the benchmark DB for `scale`, generated on first use and reused after."""
+    from scripts.generate_dataset import PRODUCTION_MATCHES, generate
+
+    os.makedirs(BENCH_DIR, exist_ok=True)
+    path = os.path.join(BENCH_DIR, f"synthetic_{scale:g}x_seed{seed}.db")
+    if not os.path.exists(path):
+        print(f"… generating {path}", file=sys.stderr)
+        generate(path, int(PRODUCTION_MATCHES * scale), seed)
+    return path
+
+
+def bench_queries(repeat, db_path):
+    results = {}
+
+    def run(sql, params=()):
+        with get_pool(db_path).read() as conn:
+            return len(conn.execute(sql, params).fetchall())
+
+    named = [(f"query.free_api.{_short(k)}", sql) for k, sql in FREE_API_QUERIES.items()]
+    named += [(f"query.template.{_short(k)}", sql) for k, sql in TEMPLATE_QUERIES.items()]
+    for name, sql in named:
+        try:
+            times, rows = _timed(lambda: run(sql), repeat)
+            results[name] = _stats(times, rows=rows)
+        except sqlite3.Error as e:
+            results[name] = {"error": str(e)}
+
+    with get_pool(db_path).read() as conn:
+        row = conn.execute(SCORECARD_MATCHES_SQL).fetchone()
+    match_id = row[0] if row else ""
+    for name, sql, params in (("query.scorecard.matches", SCORECARD_MATCHES_SQL, ()),
+                              ("query.scorecard.team_scores", SCORECARD_TEAM_SCORES_SQL, (match_id,)),
+                              ("query.scorecard.batting", SCORECARD_BATTING_SQL, (match_id,))):
+        times, rows = _timed(lambda: run(sql, params), repeat)
+        results[name] = _stats(times, rows=rows)
+    return results
+
+
+# --- reporting ---
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """{name: {baseline_ms, current_ms, ratio, regression}} for results present in both runs."""
+    out = {}
+    for name, cur in results.items():
+        base = baseline.get("results", {}).get(name)
+        if not base or "median_ms" not in base or "median_ms" not in cur or not base["median_ms"]:
+            continue
+        ratio = cur["median_ms"] / base["median_ms"]
+        out[name] = {"baseline_ms": base["median_ms"], "current_ms": cur["median_ms"],
+                     "ratio": round(ratio, 3), "regression": ratio > threshold}
+    return out
+
+
+def _meta(args, db_path):
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                                text=True, timeout=5).stdout.strip() or None
+    except Exception:
+        commit = None
+    return {
+        "generated_at": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+        "commit": commit,
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "scale": args.scale,
+        "seed": SEED,
+        "repeat": args.repeat,
+        "db": os.path.basename(db_path) if db_path else None,
+    }
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Benchmark parsing, ingest and page queries.")
+    ap.add_argument("--scale", type=float, default=1.0, help="synthetic DB size, x production volume")
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--only", help="only run results whose name starts with this (e.g. query.template)")
+    ap.add_argument("--out", help="write results JSON here (default: stdout)")
+    ap.add_argument("--baseline", help="compare against a previous results JSON")
+    ap.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    args = ap.parse_args(argv)
+
+    def wanted(group):
+        return not args.only or args.only.startswith(group) or group.startswith(args.only)
+
+    results = {}
+    db_path = None
+    if wanted("parse"):
+        results.update(bench_parse(args.repeat))
+    if wanted("ingest"):
+        results.update(bench_ingest(args.repeat))
+    if wanted("query"):
+        db_path = synthetic_db(args.scale)
+        results.update(bench_queries(args.repeat, db_path))
+    if args.only:
+        results = {k: v for k, v in results.items() if k.startswith(args.only)}
+
+    report = {"meta": _meta(args, db_path), "results": results}
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            report["comparison"] = compare(results, json.load(f), args.threshold)
+        regressions = [k for k, v in report["comparison"].items() if v["regression"]]
+
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    for name, r in results.items():
+        line = f"{name:42} " + (f"{r['median_ms']:>10.3f} ms" if "median_ms" in r else f"ERROR {r.get('error')}")
+        if "rows_per_s" in r:
+            line += f"  {r['rows_per_s']:>12,} rows/s"
+        cmp = report.get("comparison", {}).get(name)
+        if cmp:
+            line += f"  x{cmp['ratio']:.2f}" + ("  ⚠ REGRESSION" if cmp["regression"] else "")
+        print(line, file=sys.stderr)
+    if regressions:
+        print(f"❌ {len(regressions)} regression(s) over x{args.threshold}: {', '.join(regressions)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
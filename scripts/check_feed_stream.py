@@ -0,0 +1,97 @@
+# scripts/check_feed_stream.py
+"""Check the streaming feed parser against flatten_payload on the recorded payload corpus.
+
+Usage: python -m scripts.check_feed_stream [payload.json ...]
+
+Every payload is fed to utils.feed_stream in several chunk sizes and must give
+exactly the rows flatten_payload(json.loads(body)) gives (updated_at aside,
+which is a wall-clock stamp). Also reports time-to-first-row and peak memory for
+a large synthetic schedule built from the corpus.
+"""
+import glob
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+from utils.feed_stream import iter_match_rows
+from utils.live_feed import flatten_payload
+
+CORPUS_DIR = os.path.join(os.path.dirname(__file__), "fixtures", "live_payloads")
+CHUNK_SIZES = (1, 7, 64, 4096, 1 << 20)
+LARGE_CHUNK_SIZES = (1000, 64 * 1024)
+
+
+def _chunks(body, size):
+    for i in range(0, len(body), size):
+        yield body[i:i + size]
+
+def _strip(rows):
+    return [{k: v for k, v in r.items() if k != "updated_at"} for r in rows]
+
+def check_payload(body, chunk_sizes=CHUNK_SIZES):
+    expected = _strip(flatten_payload(json.loads(body)))
+    for size in chunk_sizes:
+        got = _strip(iter_match_rows(_chunks(body, size)))
+        if got != expected:
+            return f"mismatch at chunk size {size}: {len(got)} rows vs {len(expected)} expected"
+    return None
+
+def _large_body(copies=400):
+    """A schedule-sized payload: the mixed corpus payload repeated with fresh match ids."""
+    with open(os.path.join(CORPUS_DIR, "live_mixed.json"), "rb") as f:
+        base = json.load(f)
+    data = {"typeMatches": []}
+    next_id = 1
+    for _ in range(copies):
+        for tm in base["typeMatches"]:
+            tm = json.loads(json.dumps(tm))
+            for s in tm.get("seriesMatches", []):
+                for m in (s.get("seriesAdWrapper") or {}).get("matches") or []:
+                    m["matchInfo"]["matchId"] = next_id
+                    next_id += 1
+            data["typeMatches"].append(tm)
+    return json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+def profile(body, chunk_size=64 * 1024):
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    rows = flatten_payload(json.loads(body))
+    t_full = time.perf_counter() - t0
+    _, peak_full = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    first = None
+    n = 0
+    for _ in iter_match_rows(_chunks(body, chunk_size)):
+        if first is None:
+            first = time.perf_counter() - t0
+        n += 1
+    t_stream = time.perf_counter() - t0
+    _, peak_stream = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  json.loads + walk : {len(rows)} rows, total {t_full * 1000:.1f} ms, "
+          f"peak {peak_full / 1e6:.1f} MB (first row only after the full parse)")
+    print(f"  streaming         : {n} rows, first row {first * 1000:.2f} ms, total {t_stream * 1000:.1f} ms, "
+          f"peak {peak_stream / 1e6:.1f} MB (rows not retained)")
+
+def main(paths):
+    paths = paths or sorted(glob.glob(os.path.join(CORPUS_DIR, "*.json")))
+    failures = 0
+    for path in paths:
+        with open(path, "rb") as f:
+            err = check_payload(f.read())
+        print(("FAIL " if err else "ok   ") + os.path.basename(path) + (f" — {err}" if err else ""))
+        failures += bool(err)
+    body = _large_body()
+    err = check_payload(body, LARGE_CHUNK_SIZES)
+    print(("FAIL " if err else "ok   ") + f"synthetic schedule ({len(body) / 1e6:.1f} MB)" + (f" — {err}" if err else ""))
+    failures += bool(err)
+    profile(body)
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,28 @@
+# scripts/etl_load.py
+"""Load the normalized analytics tables (players, teams, matches, ...) from live_matches.
+
+Usage: python -m scripts.etl_load [--full] [db_path]
+  (default)  incremental: only rows at/after the stored updated_at watermark that changed
+  --full     reload every match and recompute all career stats
+The poller runs the incremental load after every poll that changed live_matches.
+"""
+import sqlite3
+import sys
+import time
+
+from utils.config import DB_PATH
+from utils.etl import load_incremental
+from utils.migrations import migrate
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    full = "--full" in args
+    args = [a for a in args if a != "--full"]
+    db_path = args[0] if args else DB_PATH
+    started = time.perf_counter()
+    with sqlite3.connect(db_path) as conn:
+        migrate(conn)
+        counts = load_incremental(conn, full=full)
+    print(f"✅ {'Full' if full else 'Incremental'} load: {counts['matches']} matches, "
+          f"{counts['deleted']} removed, {counts['players']} players' career stats "
+          f"in {time.perf_counter() - started:.2f}s")
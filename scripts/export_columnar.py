@@ -0,0 +1,34 @@
+# scripts/export_columnar.py
+"""Write (or bring up to date) the partitioned columnar snapshots read by utils.columnar.
+
+Usage: python -m scripts.export_columnar [--full] [--format parquet|arrow] [--out DIR] [db_path]
+  (default)  rewrite only partitions that changed since the last export
+  --full     drop the snapshots and export everything again
+The poller does the incremental export after every ingest that changed data;
+pyarrow must be installed (pip install pyarrow).
+"""
+import argparse
+import sqlite3
+import sys
+import time
+
+from utils.columnar import DEFAULT_FORMAT, EXTENSIONS, export_incremental, have_pyarrow
+from utils.config import COLUMNAR_DIR, DB_PATH
+from utils.migrations import migrate
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Export live_matches / match_state_history to Parquet or Arrow.")
+    ap.add_argument("db_path", nargs="?", default=DB_PATH)
+    ap.add_argument("--out", default=COLUMNAR_DIR)
+    ap.add_argument("--format", choices=sorted(EXTENSIONS), default=DEFAULT_FORMAT)
+    ap.add_argument("--full", action="store_true")
+    args = ap.parse_args()
+    if not have_pyarrow():
+        sys.exit("pyarrow is not installed (pip install pyarrow)")
+    started = time.perf_counter()
+    with sqlite3.connect(args.db_path) as conn:
+        migrate(conn)
+        result = export_incremental(conn, args.out, args.format, full=args.full)
+    for name, r in result.items():
+        print(f"  {name}: {r['partitions']} partitions / {r['rows']} rows written, {r['removed']} removed")
+    print(f"✅ Exported to {args.out} in {time.perf_counter() - started:.2f}s")
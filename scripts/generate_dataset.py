@@ -0,0 +1,407 @@
+# scripts/generate_dataset.py
+"""Deterministic synthetic cricket data for sizing/benchmarking the SQL Queries templates.
+
+Usage: python -m scripts.generate_dataset [--scale 10 | --matches N] [--seed 42] [--out path] [--force]
+
+Produces the normalized tables (players, teams, venues, series, matches,
+player_innings, bowling_figures, partnerships, player_fielding,
+player_career_stats) plus one live_matches row (and match_score rows) per
+match, so every page can be pointed at the file:
+
+    python -m scripts.generate_dataset --scale 100 --out synthetic_100x.db
+    CRICBUZZ_DB=synthetic_100x.db streamlit run app.py
+
+Same seed + same size gives identical data (only schema_version times
+differ). Innings are simulated per match (runs ~ exponential by batting
+position, strike rate and economy ~ normal by format, wickets spread over
+the attack), so the aggregates the templates compute look like real cricket.
+
+Into a new file the load runs in bulk mode: journal and fsync off, indexes
+and triggers dropped and rebuilt once at the end. Into an existing DB it's a
+normal single transaction, and dimension rows are matched on their natural
+keys.
+"""
+import argparse
+import os
+import random
+import sqlite3
+import time
+from datetime import datetime, timedelta, timezone
+
+from utils.db_stats import rebuild_db_stats
+from utils.etl import refresh_career_stats
+from utils.live_feed import content_hash
+from utils.match_history import backfill_history
+from utils.migrations import migrate
+from utils.status_parser import parse_status
+from utils.team_results import rebuild_team_results
+
+PRODUCTION_MATCHES = 1_000      # ~ a season of internationals: the "1x" volume
+BATCH = 20_000                  # rows per executemany
+FIRST_DAY = datetime(2016, 1, 1, tzinfo=timezone.utc)  # aware, so start_ts does not depend on the local zone
+SPAN_DAYS = 10 * 365
+STAMP = "2025-01-01T00:00:00Z"  # updated_at of generated rows (fixed, so output is reproducible)
+SQUAD = 30
+
+# country -> [(venue, city)]
+GROUNDS = {
+    "India": [("Wankhede Stadium", "Mumbai"), ("Eden Gardens", "Kolkata"),
+              ("MA Chidambaram Stadium", "Chennai"), ("Narendra Modi Stadium", "Ahmedabad")],
+    "Australia": [("Melbourne Cricket Ground", "Melbourne"), ("Sydney Cricket Ground", "Sydney"),
+                  ("Adelaide Oval", "Adelaide"), ("Perth Stadium", "Perth")],
+    "England": [("Lord's", "London"), ("Kennington Oval", "London"),
+                ("Old Trafford", "Manchester"), ("Edgbaston", "Birmingham")],
+    "South Africa": [("Wanderers Stadium", "Johannesburg"), ("Newlands", "Cape Town"),
+                     ("Kingsmead", "Durban"), ("SuperSport Park", "Centurion")],
+    "New Zealand": [("Eden Park", "Auckland"), ("Basin Reserve", "Wellington"), ("Hagley Oval", "Christchurch")],
+    "Pakistan": [("Gaddafi Stadium", "Lahore"), ("National Stadium", "Karachi"),
+                 ("Rawalpindi Cricket Stadium", "Rawalpindi")],
+    "Sri Lanka": [("R Premadasa Stadium", "Colombo"), ("Galle International Stadium", "Galle"),
+                  ("Pallekele International Cricket Stadium", "Kandy")],
+    "West Indies": [("Kensington Oval", "Bridgetown"), ("Sabina Park", "Kingston"),
+                    ("Queen's Park Oval", "Port of Spain")],
+    "Bangladesh": [("Shere Bangla National Stadium", "Dhaka"), ("Zahur Ahmed Chowdhury Stadium", "Chattogram")],
+    "Afghanistan": [("Sharjah Cricket Stadium", "Sharjah")],
+    "Zimbabwe": [("Harare Sports Club", "Harare"), ("Queens Sports Club", "Bulawayo")],
+    "Ireland": [("Malahide Cricket Club Ground", "Dublin")],
+}
+FIRST_NAMES = ["Aarav", "Ben", "Charith", "Dean", "Ebadot", "Faf", "Glenn", "Haris", "Ishan", "Jason",
+               "Kane", "Litton", "Mitchell", "Naveen", "Ollie", "Pat", "Quinton", "Rashid", "Shai", "Travis",
+               "Usman", "Virat", "Wanindu", "Yasir", "Zak", "Alzarri", "Babar", "Cameron", "Dinesh", "Evin",
+               "Fazalhaq", "Gus", "Hardik", "Imam", "Jos", "Kusal", "Lockie", "Mehidy", "Nicholas", "Paul"]
+LAST_NAMES = ["Adair", "Bairstow", "Carey", "Dhananjaya", "Ervine", "Ferguson", "Gill", "Hasaranga", "Iqbal",
+              "Jadeja", "Khan", "Latham", "Marsh", "Nortje", "Omarzai", "Pandya", "Rabada", "Santner", "Taylor",
+              "Umar", "Vettori", "Williamson", "Yadav", "Zampa", "Ahmed", "Bumrah", "Conway", "de Kock",
+              "Fernando", "Hope", "Jamieson", "Klaasen", "Lyon", "Mendis", "Nawaz", "Pooran", "Rahul", "Smith",
+              "Stirling", "Tector"]
+BAT_STYLES = ["Right-hand bat"] * 7 + ["Left-hand bat"] * 3
+PACE_STYLES = ["Right-arm fast", "Right-arm fast-medium", "Left-arm fast-medium", "Right-arm medium"]
+SPIN_STYLES = ["Right-arm offbreak", "Right-arm legbreak", "Slow left-arm orthodox", "Left-arm wrist-spin"]
+
+FORMAT_MIX = (("T20I", 0.5), ("ODI", 0.35), ("Test", 0.15))
+FEED_FORMAT = {"Test": "TEST", "ODI": "ODI", "T20I": "T20"}
+FORMAT_PARAMS = {
+    #          innings, wkts mean, bat mean (top order), sr, sr sd, econ, max overs/bowler, max score
+    "T20I": dict(innings=2, wkts=6.5, bat=24.0, sr=132.0, sr_sd=30.0, econ=8.0, max_overs=4, cap=172),
+    "ODI": dict(innings=2, wkts=8.0, bat=36.0, sr=88.0, sr_sd=20.0, econ=5.4, max_overs=10, cap=264),
+    "Test": dict(innings=4, wkts=9.0, bat=38.0, sr=54.0, sr_sd=12.0, econ=3.2, max_overs=45, cap=400),
+}
+# share of the top-order batting mean by batting position
+POSITION_WEIGHT = [1.0, 1.0, 1.05, 1.0, 0.9, 0.75, 0.6, 0.45, 0.3, 0.2, 0.15]
+
+BULK_PRAGMAS = ("PRAGMA journal_mode=OFF", "PRAGMA synchronous=OFF", "PRAGMA cache_size=-200000",
+                "PRAGMA temp_store=MEMORY", "PRAGMA locking_mode=EXCLUSIVE")
+
+_INSERT = {
+    "live_matches": """INSERT INTO live_matches (match_id, series_name, team1, team2, status, match_desc, start_ts,
+        venue_name, venue_city, venue_country, match_format, winner, victory_type, victory_margin, is_complete,
+        updated_at, content_hash) VALUES (:match_id, :series_name, :team1, :team2, :status, :match_desc,
+        :start_ts, :venue_name, :venue_city, :venue_country, :match_format, :winner, :victory_type,
+        :victory_margin, :is_complete, :updated_at, :content_hash)""",
+    "match_score": "INSERT INTO match_score (match_id, team_name, runs, wickets, overs, target, status)"
+                   " VALUES (?, ?, ?, ?, ?, ?, ?)",
+    "matches": """INSERT INTO matches (match_id, cb_match_id, series_id, team1_id, team2_id, venue_id, match_desc,
+        match_date, format, match_status, winner_team_id, result_type, result_margin, toss_winner_id,
+        toss_decision, source_hash) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+    "player_innings": "INSERT INTO player_innings (match_id, player_id, team_id, innings_no, format, runs, balls,"
+                      " not_out) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+    "bowling_figures": "INSERT INTO bowling_figures (match_id, player_id, venue_id, innings_no, format, overs,"
+                       " runs_conceded, wickets) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+    "partnerships": "INSERT INTO partnerships (match_id, innings_no, player_a_id, player_b_id, runs, balls)"
+                    " VALUES (?, ?, ?, ?, ?, ?)",
+    "player_fielding": "INSERT INTO player_fielding (match_id, player_id, catches, stumpings) VALUES (?, ?, ?, ?)",
+}
+
+
+class _Writer:
+    """Buffers rows per table and flushes them with executemany in BATCH-sized chunks."""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.buffers = {name: [] for name in _INSERT}
+        self.counts = dict.fromkeys(_INSERT, 0)
+
+    def add(self, table, row):
+        buf = self.buffers[table]
+        buf.append(row)
+        if len(buf) >= BATCH:
+            self.flush(table)
+
+    def flush(self, table=None):
+        for name in [table] if table else list(self.buffers):
+            buf = self.buffers[name]
+            if buf:
+                self.conn.executemany(_INSERT[name], buf)
+                self.counts[name] += len(buf)
+                buf.clear()
+
+
+class _Dim:
+    """Natural key -> surrogate id for one dimension table, reusing rows already in the DB."""
+
+    def __init__(self, conn, table, id_col, key_cols, cols):
+        self.conn, self.table, self.cols = conn, table, cols
+        self.ids = {tuple(r[1:]): r[0] for r in conn.execute(
+            f"SELECT {id_col}, {', '.join(key_cols)} FROM {table}")}
+        self.next_id = conn.execute(f"SELECT IFNULL(MAX({id_col}), 0) + 1 FROM {table}").fetchone()[0]
+        self.id_col = id_col
+        self.new = []
+
+    def get(self, key, **values):
+        if key not in self.ids:
+            self.ids[key] = self.next_id
+            self.new.append((self.next_id, *(values[c] for c in self.cols)))
+            self.next_id += 1
+        return self.ids[key]
+
+    def flush(self):
+        if self.new:
+            self.conn.executemany(
+                f"INSERT INTO {self.table} ({self.id_col}, {', '.join(self.cols)})"
+                f" VALUES ({', '.join('?' * (len(self.cols) + 1))})", self.new)
+            self.new = []
+
+
+def _deferred_objects(conn):
+    """Indexes/triggers we can drop for the load and recreate afterwards (not UNIQUE/PK autoindexes)."""
+    return conn.execute("""
+        SELECT type, name, sql FROM sqlite_master
+        WHERE type IN ('index', 'trigger') AND sql IS NOT NULL
+        ORDER BY type = 'trigger', name
+    """).fetchall()
+
+
+class Generator:
+    def __init__(self, conn, seed=42):
+        self.conn = conn
+        self.rng = random.Random(seed)
+        self.seed = seed
+        self.teams = _Dim(conn, "teams", "team_id", ["team_name"], ["team_name", "country"])
+        self.venues = _Dim(conn, "venues", "venue_id", ["name", "city"], ["name", "city", "country", "capacity"])
+        self.series = _Dim(conn, "series", "series_id", ["series_name"],
+                           ["series_name", "host_country", "match_type", "start_date", "planned_matches"])
+        self.players = _Dim(conn, "players", "player_id", ["full_name"],
+                            ["full_name", "country", "playing_role", "batting_style", "bowling_style"])
+        self.next_match = conn.execute("SELECT IFNULL(MAX(match_id), 0) + 1 FROM matches").fetchone()[0]
+        self.out = _Writer(conn)
+        self._build_squads()
+
+    # --- dimensions ---
+    def _build_squads(self):
+        rng = self.rng
+        names = [f"{f} {l}" for f in FIRST_NAMES for l in LAST_NAMES]
+        rng.shuffle(names)
+        self.squads = {}      # country -> (team_id, [player ids in squad role order])
+        self.grounds = {}     # country -> [(venue_id, name, city)]
+        for country, grounds in GROUNDS.items():
+            team_id = self.teams.get((country,), team_name=country, country=country)
+            squad = []
+            for i in range(SQUAD):
+                # 0-9 batters (9 = keeper), 10-15 all-rounders, 16+ bowlers
+                role = "Batsman" if i < 9 else "Wicketkeeper" if i == 9 else "All-rounder" if i < 16 else "Bowler"
+                style = rng.choice(PACE_STYLES if rng.random() < 0.6 else SPIN_STYLES) if i >= 10 else None
+                name = names.pop()
+                squad.append(self.players.get((name,), full_name=name, country=country, playing_role=role,
+                                              batting_style=rng.choice(BAT_STYLES), bowling_style=style))
+            self.squads[country] = (team_id, squad)
+            self.grounds[country] = [
+                (self.venues.get((name, city), name=name, city=city, country=country,
+                                 capacity=int(min(132_000, max(5_000, rng.lognormvariate(10.3, 0.5))))),
+                 name, city)
+                for name, city in grounds
+            ]
+
+    def _xi(self, country):
+        rng = self.rng
+        _, squad = self.squads[country]
+        return (sorted(rng.sample(squad[:9], 5)) + [squad[9]] + sorted(rng.sample(squad[10:16], 2))
+                + sorted(rng.sample(squad[16:], 3)))
+
+    # --- one innings ---
+    def _innings(self, mid, inn_no, fmt, venue_id, bat_team, batting, bowling, fielding):
+        rng, p = self.rng, FORMAT_PARAMS[fmt]
+        wickets = min(10, max(0, round(rng.gauss(p["wkts"], 2.0))))
+        batted = batting[:min(11, wickets + 2)]
+        total, legal_balls = 0, 0
+        for pos, pid in enumerate(batted):
+            mean = p["bat"] * POSITION_WEIGHT[pos]
+            runs = min(p["cap"], int(rng.expovariate(1 / mean)))
+            sr = max(25.0, rng.gauss(p["sr"], p["sr_sd"]))
+            balls = max(1, round(runs * 100 / sr))
+            total += runs
+            legal_balls += balls
+            self.out.add("player_innings", (mid, pid, bat_team, inn_no, fmt, runs, balls, int(pos >= wickets)))
+
+        # partnerships between consecutive batters, splitting the innings total
+        weights = [rng.expovariate(1.0) for _ in range(len(batted) - 1)]
+        wsum = sum(weights) or 1.0
+        for k, w in enumerate(weights):
+            a, b = sorted((batted[k], batted[k + 1]))
+            self.out.add("partnerships", (mid, inn_no, a, b, round(total * w / wsum),
+                                          max(1, round(legal_balls * w / wsum))))
+
+        # bowling: the last five of the XI share the overs, capped per bowler
+        attack = bowling[-5:]
+        overs_total = max(1, legal_balls // 6)
+        shares = [rng.uniform(0.6, 1.4) for _ in attack]
+        ssum = sum(shares)
+        overs = [min(p["max_overs"], max(1, round(overs_total * s / ssum))) for s in shares]
+        wkts = [0] * len(attack)
+        for _ in range(wickets):
+            if rng.random() < 0.92:     # the rest are run outs
+                wkts[rng.choices(range(len(attack)), weights=overs)[0]] += 1
+            # ~60% caught (keeper takes a quarter), a few stumpings off the spinners in white-ball games
+            r = rng.random()
+            if r < 0.6:
+                fielder = bowling[5] if rng.random() < 0.25 else rng.choice(bowling)
+                c, s = fielding.get(fielder, (0, 0))
+                fielding[fielder] = (c + 1, s)
+            elif r < 0.63 and fmt != "Test":
+                c, s = fielding.get(bowling[5], (0, 0))
+                fielding[bowling[5]] = (c, s + 1)
+        for pid, o, w in zip(attack, overs, wkts):
+            econ = max(1.5, rng.gauss(p["econ"], p["econ"] * 0.25))
+            self.out.add("bowling_figures", (mid, pid, venue_id, inn_no, fmt, float(o), round(o * econ), w))
+        return total, wickets, legal_balls
+
+    # --- one match ---
+    def _match(self, series_id, series_name, fmt, day, host, visitor):
+        rng = self.rng
+        mid = self.next_match
+        self.next_match += 1
+        cb_id = f"syn{self.seed}-{mid}"
+        venue_id, venue_name, city = rng.choice(self.grounds[host])
+        (host_id, _), (visitor_id, _) = self.squads[host], self.squads[visitor]
+        xi = {host: self._xi(host), visitor: self._xi(visitor)}
+        toss_winner = rng.choice((host, visitor))
+        decision = rng.choice(("bat", "bowl"))
+        first = toss_winner if decision == "bat" else (visitor if toss_winner == host else host)
+        second = visitor if first == host else host
+        order = [first, second] * (FORMAT_PARAMS[fmt]["innings"] // 2)
+
+        fielding = {}
+        totals = {host: 0, visitor: 0}
+        scores = []
+        for inn_no, bat in enumerate(order, 1):
+            bowl = second if bat == first else first
+            team_id = host_id if bat == host else visitor_id
+            runs, wkts, balls = self._innings(mid, inn_no, fmt, venue_id, team_id, xi[bat], xi[bowl], fielding)
+            totals[bat] += runs
+            scores.append((bat, runs, wkts, f"{balls // 6}.{balls % 6}"))
+        for pid, (c, s) in fielding.items():
+            self.out.add("player_fielding", (mid, pid, c, s))
+
+        last_wkts = scores[-1][2]
+        if fmt == "Test" and rng.random() < 0.25:
+            status = "Match drawn"
+        elif totals[second] > totals[first]:
+            status = f"{second} won by {max(1, 10 - last_wkts)} wkts"
+        elif totals[second] < totals[first]:
+            status = f"{first} won by {totals[first] - totals[second]} runs"
+        else:
+            status = "Match tied"
+        winner, vtype, margin, _ = parse_status(status)
+
+        start = FIRST_DAY + timedelta(days=day, hours=rng.choice((4, 9, 14)))
+        live = {
+            "match_id": cb_id, "series_name": series_name, "team1": host, "team2": visitor,
+            "status": status, "match_desc": f"{fmt} match", "start_ts": int(start.timestamp()) * 1000,
+            "venue_name": venue_name, "venue_city": city, "venue_country": host,
+            "match_format": FEED_FORMAT[fmt], "winner": winner, "victory_type": vtype,
+            "victory_margin": margin, "is_complete": 1, "updated_at": STAMP,
+        }
+        live["content_hash"] = content_hash(live)
+        self.out.add("live_matches", live)
+        for bat, runs, wkts, overs in scores:
+            self.out.add("match_score", (cb_id, bat, runs, wkts, overs, None, status))
+        teams = self.teams.ids
+        self.out.add("matches", (
+            mid, cb_id, series_id, host_id, visitor_id, venue_id, live["match_desc"],
+            start.strftime("%Y-%m-%d %H:%M:%S"), fmt, "Complete",
+            teams.get((winner,)) if winner else None, vtype or None, margin,
+            teams[(toss_winner,)], decision, live["content_hash"],
+        ))
+
+    def run(self, n_matches):
+        rng = self.rng
+        countries = list(GROUNDS)
+        fmts, fmt_weights = zip(*FORMAT_MIX)
+        made = 0
+        while made < n_matches:
+            host, visitor = rng.sample(countries, 2)
+            fmt = rng.choices(fmts, weights=fmt_weights)[0]
+            planned = min(n_matches - made, rng.choice((1, 2, 3, 3, 5)))
+            day = rng.randrange(SPAN_DAYS)
+            start = FIRST_DAY + timedelta(days=day)
+            base = f"{visitor} tour of {host} {start.year}"
+            name, k = base, 2
+            while (name,) in self.series.ids:
+                name, k = f"{base} ({k})", k + 1
+            series_id = self.series.get((name,), series_name=name, host_country=host, match_type=fmt,
+                                        start_date=start.strftime("%Y-%m-%d"), planned_matches=planned)
+            gap = 7 if fmt == "Test" else 3
+            for i in range(planned):
+                self._match(series_id, name, fmt, day + i * gap, host, visitor)
+            made += planned
+        for dim in (self.teams, self.venues, self.series, self.players):
+            dim.flush()
+        self.out.flush()
+        return self.out.counts
+
+
+def generate(db_path, n_matches, seed=42):
+    """Generate `n_matches` into `db_path`; returns row counts per table."""
+    bulk = not os.path.exists(db_path)
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    try:
+        migrate(conn)
+        if conn.execute("SELECT 1 FROM live_matches WHERE match_id LIKE ? LIMIT 1", (f"syn{seed}-%",)).fetchone():
+            raise SystemExit(f"{db_path} already has seed {seed} data; use another --seed or --force")
+        deferred = []
+        if bulk:
+            conn.execute("PRAGMA journal_mode=DELETE")
+            for pragma in BULK_PRAGMAS:
+                conn.execute(pragma)
+            deferred = _deferred_objects(conn)
+            for kind, name, _ in deferred:
+                conn.execute(f"DROP {kind.upper()} {name}")
+        conn.execute("BEGIN")
+        counts = Generator(conn, seed).run(n_matches)
+        if bulk:
+            for _, _, sql in deferred:
+                conn.execute(sql)
+        rebuild_team_results(conn)
+        rebuild_db_stats(conn)
+        backfill_history(conn)
+        refresh_career_stats(conn)
+        conn.execute("COMMIT")
+        conn.execute("ANALYZE")
+        if bulk:
+            conn.execute("PRAGMA locking_mode=NORMAL")
+            conn.execute("PRAGMA journal_mode=WAL")
+    finally:
+        conn.close()
+    return counts
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--scale", type=float, default=1.0, help=f"multiple of production volume ({PRODUCTION_MATCHES} matches)")
+    ap.add_argument("--matches", type=int, help="exact number of matches (overrides --scale)")
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--out", help="target DB (default synthetic_<scale>x.db)")
+    ap.add_argument("--force", action="store_true", help="delete --out first")
+    args = ap.parse_args()
+
+    n = args.matches or int(PRODUCTION_MATCHES * args.scale)
+    out = args.out or f"synthetic_{args.scale:g}x.db"
+    if args.force:
+        for suffix in ("", "-wal", "-shm", "-journal"):
+            if os.path.exists(out + suffix):
+                os.remove(out + suffix)
+    started = time.perf_counter()
+    counts = generate(out, n, args.seed)
+    took = time.perf_counter() - started
+    print(f"✅ {n:,} matches into {out} in {took:.1f}s")
+    for table, count in counts.items():
+        print(f"   {table:16} {count:>12,}")
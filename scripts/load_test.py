@@ -0,0 +1,231 @@
+# scripts/load_test.py
+"""Load test: many concurrent dashboard sessions against the scorecard and live matches pages.
+
+Usage:
+    python -m scripts.load_test [--sessions 20] [--reruns 10] [--pages scorecard live_matches]
+                                [--db path.db | --scale 1] [--capture live.jsonl.gz]
+                                [--tracemalloc] [--out load.json]
+
+Each simulated session is its own Streamlit AppTest (the same script runner a
+browser tab gets) driven from its own thread; all sessions start together and
+rerun the page --reruns times (the scorecard sessions pick a different match on
+every rerun). The poller started by the live matches page fetches from
+scripts/replay_server.py (via CRICBUZZ_LIVE_URL) replaying --capture, by default
+the live_mixed fixture, so no RapidAPI key or quota is involved.
+
+The pages run against a throwaway copy of --db (default: the synthetic DB the
+benchmarks use, at --scale). Per page it reports p50/p95/p99 rerun latency,
+first-run latency, reruns/s, SQLite statements executed per rerun (counted with
+a trace callback on the app's pooled connections) and peak memory: process max
+RSS, plus the Python heap peak with --tracemalloc (which also slows every rerun).
+"""
+import argparse
+import json
+import os
+import resource
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURE = os.path.join(ROOT, "scripts", "fixtures", "live_payloads", "live_mixed.json")
+PAGES = {
+    "scorecard": os.path.join(ROOT, "pages", "scorecard.py"),
+    "live_matches": os.path.join(ROOT, "pages", "live_matches.py"),
+}
+RUN_TIMEOUT_S = 120
+
+
+# --- measurement ---
+class StatementCounter:
+    """Counts statements issued from Streamlit script threads (not the poller or writer)."""
+
+    def __init__(self):
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, sql):
+        if threading.current_thread().name.startswith("ScriptRunner") and not sql.startswith("PRAGMA"):
+            with self._lock:
+                self.count += 1
+
+    def reset(self):
+        with self._lock:
+            n, self.count = self.count, 0
+        return n
+
+
+def _percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))]
+
+
+def _max_rss_mb():
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(rss / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _scorecard_step(at, i):
+    if at.selectbox:
+        box = at.selectbox[0]
+        box.select_index(i % max(1, len(box.options)))
+
+
+def share_app_test_runtime():
+    """Let many AppTests run at once in one process, sharing what a real server shares.
+
+    AppTest installs its mock Runtime as the process-wide instance at the start
+    of every run and clears it at the end, so a session finishing would pull the
+    runtime from under the others mid-run: fall back to the last one installed.
+    It also compiles the page afresh on every run; a server keeps one bytecode
+    cache for all sessions, and concurrent ast.parse calls can fail on 3.11.
+    """
+    from streamlit.runtime import Runtime
+    from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+    from streamlit.testing.v1 import app_test, local_script_runner
+
+    shared_cache = ScriptCache()
+    app_test.ScriptCache = local_script_runner.ScriptCache = lambda: shared_cache
+
+    last = []
+
+    def instance(cls):
+        if cls._instance is not None:
+            last[:] = [cls._instance]
+        elif last:
+            return last[0]
+        else:
+            raise RuntimeError("Runtime hasn't been created!")
+        return cls._instance
+
+    def exists(cls):
+        return cls._instance is not None or bool(last)
+
+    Runtime.instance = classmethod(instance)
+    Runtime.exists = classmethod(exists)
+
+
+def _session(page, reruns, barrier, first, latencies, errors):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(PAGES[page], default_timeout=RUN_TIMEOUT_S)
+    at.secrets["RAPIDAPI_KEY"] = "load-test"
+    barrier.wait()
+    for i in range(reruns + 1):
+        if i and page == "scorecard":
+            _scorecard_step(at, i)
+        t = time.perf_counter()
+        at.run()
+        elapsed = (time.perf_counter() - t) * 1000
+        (latencies if i else first).append(elapsed)
+        if at.exception:
+            errors.append(at.exception[0].value)
+
+
+def run_page(page, sessions, reruns, counter, use_tracemalloc=False):
+    import tracemalloc
+
+    first, latencies, errors = [], [], []
+    barrier = threading.Barrier(sessions)
+    counter.reset()
+    if use_tracemalloc:
+        tracemalloc.reset_peak()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=sessions, thread_name_prefix=f"session-{page}") as pool:
+        futures = [pool.submit(_session, page, reruns, barrier, first, latencies, errors)
+                   for _ in range(sessions)]
+        for f in futures:
+            f.result()
+    wall = time.perf_counter() - started
+    runs = len(first) + len(latencies)
+    result = {
+        "sessions": sessions,
+        "reruns": len(latencies),
+        "p50_ms": round(_percentile(latencies, 50), 1),
+        "p95_ms": round(_percentile(latencies, 95), 1),
+        "p99_ms": round(_percentile(latencies, 99), 1),
+        "max_ms": round(max(latencies), 1),
+        "first_run_p50_ms": round(statistics.median(first), 1),
+        "reruns_per_s": round(runs / wall, 1),
+        "queries_per_rerun": round(counter.reset() / runs, 2),
+        "max_rss_mb": _max_rss_mb(),
+        "errors": len(errors),
+        "first_error": errors[0] if errors else None,
+    }
+    if use_tracemalloc:
+        result["py_heap_peak_mb"] = round(tracemalloc.get_traced_memory()[1] / 1e6, 1)
+    return result
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Concurrent-session load test for the dashboard pages.")
+    ap.add_argument("--sessions", type=int, default=20)
+    ap.add_argument("--reruns", type=int, default=10, help="reruns per session after the first run")
+    ap.add_argument("--pages", nargs="+", choices=sorted(PAGES), default=["scorecard", "live_matches"])
+    ap.add_argument("--db", help="DB to copy and load-test against (default: synthetic DB at --scale)")
+    ap.add_argument("--scale", type=float, default=1.0)
+    ap.add_argument("--capture", default=FIXTURE, help="capture (or payload .json) the stand-in API replays")
+    ap.add_argument("--tracemalloc", action="store_true", help="also report the Python heap peak (slower)")
+    ap.add_argument("--out", help="write results JSON here (default: stdout)")
+    args = ap.parse_args(argv)
+
+    from scripts.replay_server import start_replay_server
+    from utils.capture import read_capture
+
+    server = start_replay_server(read_capture(args.capture)[1], loop=True)
+    tmp = tempfile.mkdtemp(prefix="cricbuzz-load-")
+    db_path = os.path.join(tmp, "load.db")
+    # must be in place before utils.config is imported (it reads both once)
+    os.environ["CRICBUZZ_DB"] = db_path
+    os.environ["CRICBUZZ_LIVE_URL"] = server.url
+
+    from scripts.benchmark import synthetic_db
+    from utils.db_connection import set_statement_trace
+
+    source = args.db or synthetic_db(args.scale)
+    with sqlite3.connect(source) as src, sqlite3.connect(db_path) as dst:
+        src.backup(dst)
+    counter = StatementCounter()
+    set_statement_trace(counter)
+    share_app_test_runtime()
+    if args.tracemalloc:
+        import tracemalloc
+        tracemalloc.start()
+
+    report = {
+        "meta": {"sessions": args.sessions, "reruns": args.reruns, "db": os.path.basename(source),
+                 "python": sys.version.split()[0], "sqlite": sqlite3.sqlite_version},
+        "pages": {},
+    }
+    try:
+        for page in args.pages:
+            print(f"… {page}: {args.sessions} sessions x {args.reruns + 1} runs", file=sys.stderr)
+            report["pages"][page] = run_page(page, args.sessions, args.reruns, counter, args.tracemalloc)
+    finally:
+        from utils.poller import get_poller
+        get_poller().stop()
+        server.shutdown()
+        shutil.rmtree(tmp, ignore_errors=True)
+    report["meta"]["api_requests"] = server.stats["requests"]
+
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    for page, r in report["pages"].items():
+        print(f"{page:14} p50 {r['p50_ms']:>8.1f} ms  p95 {r['p95_ms']:>8.1f}  p99 {r['p99_ms']:>8.1f}  "
+              f"{r['queries_per_rerun']:>6.2f} queries/rerun  {r['max_rss_mb']:>7.1f} MB rss  "
+              f"{r['errors']} errors", file=sys.stderr)
+    return 1 if any(r["errors"] for r in report["pages"].values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,183 @@
+# scripts/profile_startup.py
+"""Cold-start profile of the dashboard: import-time breakdown and first-run timing per page.
+
+Usage:
+    python -m scripts.profile_startup [--pages app.py pages/home.py ...] [--repeat 3]
+                                      [--db path.db | --scale 1] [--top 10]
+                                      [--out startup.json] [--baseline old.json] [--threshold 1.25]
+
+Every page is run --repeat times, each in a fresh interpreter started with
+`python -X importtime`, as a Streamlit AppTest (the script runner a browser tab
+gets). Per page it records
+
+  process_ms    wall time from spawning the interpreter to the end of the first run
+  harness_ms    interpreter start-up plus importing streamlit (paid once per server)
+  first_run_ms  the page's first run, including every import it triggers
+  rerun_ms      a second run in the same process (imports already done)
+  import_ms     import time spent during the first run, with the --top packages
+                by self time (from the -X importtime lines printed during it)
+
+so a slow cold start can be traced to the modules a page pulls in. The pages
+read a copy of --db (default: the synthetic benchmark DB at --scale) and the
+live matches page polls scripts/replay_server.py, never the real API. Results
+use the scripts/benchmark.py JSON layout (median over --repeat), so --baseline
+flags regressions the same way and the exit code is 1 when there are any.
+"""
+import argparse
+import json
+import os
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PAGES = ["app.py"] + sorted(f"pages/{f}" for f in os.listdir(os.path.join(ROOT, "pages")) if f.endswith(".py"))
+MARK_START = "#profile_startup: page start"
+MARK_END = "#profile_startup: page end"
+RUN_TIMEOUT_S = 120
+METRICS = ("process_ms", "harness_ms", "first_run_ms", "rerun_ms", "import_ms")
+
+
+def _child(page):
+    """Runs inside the profiled interpreter: one page, timings as JSON on stdout."""
+    started = time.perf_counter()
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(os.path.join(ROOT, page), default_timeout=RUN_TIMEOUT_S)
+    harness = time.perf_counter() - started
+    before = set(sys.modules)
+    print(MARK_START, file=sys.stderr, flush=True)
+    t = time.perf_counter()
+    at.run()
+    first = time.perf_counter() - t
+    print(MARK_END, file=sys.stderr, flush=True)
+    loaded = len(set(sys.modules) - before)
+    t = time.perf_counter()
+    at.run()
+    rerun = time.perf_counter() - t
+    print(json.dumps({
+        "harness_ms": harness * 1000, "first_run_ms": first * 1000, "rerun_ms": rerun * 1000,
+        "modules_loaded": loaded, "exception": [str(e.value) for e in at.exception] or None,
+    }))
+
+
+def parse_importtime(stderr):
+    """{top-level package: self ms} for the imports logged between the page markers."""
+    per_package = defaultdict(float)
+    inside = False
+    for line in stderr.splitlines():
+        if line == MARK_START:
+            inside = True
+        elif line == MARK_END:
+            break
+        elif inside and line.startswith("import time:") and "|" in line:
+            self_us, _, name = (part.strip() for part in line[len("import time:"):].split("|"))
+            if self_us.isdigit():
+                per_package[name.split(".")[0]] += int(self_us) / 1000
+    return dict(per_package)
+
+
+def profile_page(page, env):
+    started = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-m", "scripts.profile_startup", "--child", page],
+                          cwd=ROOT, env=env, capture_output=True, text=True, timeout=RUN_TIMEOUT_S * 3)
+    elapsed = (time.perf_counter() - started) * 1000
+    if proc.returncode != 0:
+        raise RuntimeError(f"{page}: exit {proc.returncode}: {proc.stderr.strip().splitlines()[-1:]}")
+    run = json.loads(proc.stdout.strip().splitlines()[-1])
+    imports = parse_importtime(proc.stderr)
+    # the second run is not in the wall time: subtract it to get spawn -> first run done
+    run["process_ms"] = elapsed - run["rerun_ms"]
+    run["import_ms"] = sum(imports.values())
+    run["imports"] = imports
+    return run
+
+
+def summarize(runs, top):
+    from scripts.benchmark import _stats
+
+    out = {}
+    for metric in METRICS:
+        out[metric] = _stats([r[metric] for r in runs])
+    totals = defaultdict(list)
+    for r in runs:
+        for name, ms in r["imports"].items():
+            totals[name].append(ms)
+    ranked = sorted(totals.items(), key=lambda kv: -sum(kv[1]))[:top]
+    out["top_imports_ms"] = {name: round(sum(v) / len(runs), 1) for name, v in ranked}
+    out["modules_loaded"] = runs[-1]["modules_loaded"]
+    out["exception"] = runs[-1]["exception"]
+    return out
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Import-time and first-run profile of the dashboard pages.")
+    ap.add_argument("--pages", nargs="+", choices=PAGES, default=PAGES)
+    ap.add_argument("--repeat", type=int, default=3, help="fresh processes per page")
+    ap.add_argument("--db", help="DB to copy and run the pages against (default: synthetic DB at --scale)")
+    ap.add_argument("--scale", type=float, default=1.0)
+    ap.add_argument("--top", type=int, default=10, help="packages listed per page")
+    ap.add_argument("--out", help="write results JSON here (default: stdout)")
+    ap.add_argument("--baseline", help="compare against a previous results JSON")
+    ap.add_argument("--threshold", type=float, default=1.25)
+    ap.add_argument("--child", help=argparse.SUPPRESS)
+    args = ap.parse_args(argv)
+    if args.child:
+        _child(args.child)
+        return 0
+
+    from scripts.benchmark import _meta, compare, synthetic_db
+    from scripts.replay_server import start_replay_server
+    from scripts.load_test import FIXTURE
+    from utils.capture import read_capture
+
+    source = args.db or synthetic_db(args.scale)
+    server = start_replay_server(read_capture(FIXTURE)[1], loop=True)
+    tmp = tempfile.mkdtemp(prefix="cricbuzz-startup-")
+    db_path = os.path.join(tmp, "startup.db")
+    with sqlite3.connect(source) as src, sqlite3.connect(db_path) as dst:
+        src.backup(dst)
+    env = dict(os.environ, CRICBUZZ_DB=db_path, CRICBUZZ_LIVE_URL=server.url)
+
+    results, pages = {}, {}
+    try:
+        for page in args.pages:
+            print(f"… {page}: {args.repeat} cold starts", file=sys.stderr)
+            summary = summarize([profile_page(page, env) for _ in range(args.repeat)], args.top)
+            pages[page] = summary
+            for metric in METRICS:
+                results[f"startup.{page}.{metric}"] = summary[metric]
+    finally:
+        server.shutdown()
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    report = {"meta": dict(_meta(args, source), pages=args.pages), "results": results, "pages": pages}
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            report["comparison"] = compare(results, json.load(f), args.threshold)
+        regressions = [k for k, v in report["comparison"].items() if v["regression"]]
+
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    for page, s in pages.items():
+        heavy = ", ".join(f"{name} {ms:.0f}" for name, ms in list(s["top_imports_ms"].items())[:4])
+        print(f"{page:28} process {s['process_ms']['median_ms']:>7.0f} ms  first run {s['first_run_ms']['median_ms']:>6.0f}"
+              f"  (imports {s['import_ms']['median_ms']:>5.0f}: {heavy})  rerun {s['rerun_ms']['median_ms']:>5.0f}"
+              + ("  ⚠ exception" if s["exception"] else ""), file=sys.stderr)
+    if regressions:
+        print(f"❌ {len(regressions)} regression(s) over x{args.threshold}: {', '.join(regressions)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
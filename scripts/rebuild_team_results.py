@@ -0,0 +1,31 @@
+# scripts/rebuild_team_results.py
+"""Rebuild or check the team_results / head_to_head summary tables.
+
+Usage: python -m scripts.rebuild_team_results [--check] [db_path]
+  (default)  recompute both tables from live_matches
+  --check    only report differences from live_matches and from the old LIKE-based Q5/Q22 SQL
+"""
+import sqlite3
+import sys
+
+from utils.config import DB_PATH
+from utils.migrations import migrate
+from utils.team_results import check_team_results, rebuild_team_results
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    check_only = "--check" in args
+    args = [a for a in args if a != "--check"]
+    db_path = args[0] if args else DB_PATH
+    with sqlite3.connect(db_path) as conn:
+        migrate(conn)
+        if not check_only:
+            n = rebuild_team_results(conn)
+            conn.commit()
+            print(f"✅ Rebuilt team_results / head_to_head ({n} teams)")
+        report = check_team_results(conn)
+    for name, rows in report.items():
+        print(f"{name}: {len(rows)} difference(s)")
+        for key, expected, actual in rows[:20]:
+            print(f"   {key}: expected {expected}, stored {actual}")
+    sys.exit(1 if report["drift"] else 0)
@@ -0,0 +1,62 @@
+# scripts/record_live.py
+"""Record live-feed responses, with their timing, to a compressed capture file.
+
+Usage:
+    python -m scripts.record_live [--out captures/live_<utc>.jsonl.gz] [--interval 60]
+                                  [--count 10] [--url URL]
+
+Every request uses the RapidAPI key from .streamlit/secrets.toml (or RAPIDAPI_KEY)
+and counts against the monthly quota, so keep --count small; --count 0 records
+until Ctrl-C. Responses are stored as received (429s and 5xx included) and the
+HTTP cache and retries are bypassed. Serve the capture back with
+scripts/replay_server.py.
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+
+import requests
+
+from utils.api_client import CricbuzzClient
+from utils.capture import CaptureWriter
+from utils.config import LIVE_URL, get_api_key
+
+CAPTURE_DIR = "captures"
+
+
+def record(url, out, interval, count):
+    client = CricbuzzClient(api_key=os.environ.get("RAPIDAPI_KEY") or get_api_key())
+    with CaptureWriter(out, url) as capture:
+        try:
+            while not count or capture.count < count:
+                started = time.perf_counter()
+                try:
+                    r = client.session.get(url, timeout=client.timeout)
+                except (requests.ConnectionError, requests.Timeout) as e:
+                    print(f"  ✖ {type(e).__name__}: {e}", file=sys.stderr)
+                else:
+                    latency_ms = (time.perf_counter() - started) * 1000
+                    capture.add(r.status_code, r.content, r.headers, latency_ms)
+                    print(f"  #{capture.count} {r.status_code} {len(r.content):,} B in {latency_ms:.0f} ms",
+                          file=sys.stderr)
+                if count and capture.count >= count:
+                    break
+                time.sleep(max(0.0, interval - (time.perf_counter() - started)))
+        except KeyboardInterrupt:
+            pass
+    return capture.count
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Record live-feed responses to a capture file.")
+    ap.add_argument("--out")
+    ap.add_argument("--interval", type=float, default=60.0, help="seconds between requests")
+    ap.add_argument("--count", type=int, default=10, help="responses to record (0 = until Ctrl-C)")
+    ap.add_argument("--url", default=LIVE_URL)
+    args = ap.parse_args()
+    out = args.out or os.path.join(CAPTURE_DIR, f"live_{datetime.utcnow():%Y%m%dT%H%M%SZ}.jsonl.gz")
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+    n = record(args.url, out, args.interval, args.count)
+    print(f"✅ Recorded {n} responses to {out}")
@@ -0,0 +1,206 @@
+# scripts/replay_server.py
+"""Local stand-in for the live-feed endpoint that replays a capture, with optional faults.
+
+Usage:
+    python -m scripts.replay_server CAPTURE [--port 8765] [--speed 10] [--loop]
+        [--advance time|request] [--replay-latency] [--latency-ms 0] [--jitter-ms 0]
+        [--error-rate 0] [--rate-limit-rate 0] [--retry-after 1] [--seed N]
+
+    CRICBUZZ_LIVE_URL=http://127.0.0.1:8765/matches/v1/live streamlit run app.py
+
+CAPTURE is a file from scripts/record_live.py or a plain payload .json (e.g.
+scripts/fixtures/live_payloads/live_mixed.json). Any GET except /__stats gets
+the current response:
+
+  --advance time     (default) responses follow the recorded timeline, --speed
+                     times faster; after the last one it is served until --loop
+                     restarts the timeline
+  --advance request  every request gets the next response (wrapping with --loop)
+
+ETag / If-None-Match revalidation answers 304 like the real API. Faults are
+drawn from a seeded RNG, per request: --rate-limit-rate answers 429 with
+Retry-After, --error-rate one of 500/502/503; --latency-ms/--jitter-ms add delay
+and --replay-latency adds each response's recorded latency (divided by --speed).
+GET /__stats returns request, status and fault counters as JSON.
+"""
+import argparse
+import bisect
+import hashlib
+import json
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from utils.capture import read_capture
+
+DEFAULT_PORT = 8765
+ERROR_STATUSES = (500, 502, 503)
+STATS_PATH = "/__stats"
+
+
+class ReplayServer(ThreadingHTTPServer):
+    """Serves capture frames on a timeline (or per request), injecting faults as configured."""
+
+    daemon_threads = True
+
+    def __init__(self, frames, host="127.0.0.1", port=0, speed=1.0, loop=False, advance="time",
+                 replay_latency=False, latency_ms=0.0, jitter_ms=0.0, error_rate=0.0,
+                 rate_limit_rate=0.0, retry_after=1, seed=None):
+        super().__init__((host, port), _ReplayHandler)
+        self.frames = frames
+        self.speed = max(speed, 1e-6)
+        self.loop = loop
+        self.advance = advance
+        self.replay_latency = replay_latency
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._served = 0
+        self._started = time.monotonic()
+        base = frames[0]["t"]
+        self._times = [f["t"] - base for f in frames]
+        gaps = [b - a for a, b in zip(self._times, self._times[1:])]
+        # one more (median) gap after the last frame before a looped timeline restarts
+        self._span = self._times[-1] + (sorted(gaps)[len(gaps) // 2] if gaps else 1.0)
+        for f in frames:
+            f.setdefault("headers", {})
+            f["etag"] = f["headers"].get("ETag") or '"%s"' % hashlib.sha1(f["body"]).hexdigest()
+        self.stats = {"requests": 0, "not_modified": 0, "rate_limited": 0, "errors": 0,
+                      "statuses": {}, "frames_served": [0] * len(frames)}
+
+    @property
+    def url(self):
+        return f"http://{self.server_address[0]}:{self.server_address[1]}/matches/v1/live"
+
+    def next_frame(self):
+        """Index of the frame for the current request."""
+        with self._lock:
+            if self.advance == "request":
+                i = self._served
+                self._served += 1
+                return i % len(self.frames) if self.loop else min(i, len(self.frames) - 1)
+            elapsed = (time.monotonic() - self._started) * self.speed
+            if self.loop:
+                elapsed %= self._span
+            return max(0, bisect.bisect_right(self._times, elapsed) - 1)
+
+    def draw_fault(self):
+        """None, or the status code to fail this request with."""
+        with self._lock:
+            r = self._rng.random()
+            if r < self.rate_limit_rate:
+                return 429
+            if r < self.rate_limit_rate + self.error_rate:
+                return self._rng.choice(ERROR_STATUSES)
+            return None
+
+    def delay_s(self, frame):
+        with self._lock:
+            ms = self.latency_ms + (self._rng.uniform(0, self.jitter_ms) if self.jitter_ms else 0.0)
+        if self.replay_latency and frame.get("latency_ms"):
+            ms += frame["latency_ms"] / self.speed
+        return ms / 1000
+
+    def count(self, key, status):
+        with self._lock:
+            self.stats["requests"] += 1
+            if key:
+                self.stats[key] += 1
+            self.stats["statuses"][str(status)] = self.stats["statuses"].get(str(status), 0) + 1
+
+
+class _ReplayHandler(BaseHTTPRequestHandler):
+    server: ReplayServer
+
+    def _send(self, status, body=b"", headers=()):
+        self.send_response(status)
+        for k, v in headers:
+            self.send_header(k, v)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def do_GET(self):
+        server = self.server
+        if self.path.split("?")[0] == STATS_PATH:
+            with server._lock:
+                body = json.dumps(server.stats).encode()
+            self._send(200, body, [("Content-Type", "application/json")])
+            return
+
+        i = server.next_frame()
+        frame = server.frames[i]
+        delay = server.delay_s(frame)
+        if delay:
+            time.sleep(delay)
+        fault = server.draw_fault()
+        if fault == 429:
+            server.count("rate_limited", 429)
+            self._send(429, b'{"message":"Too many requests"}', [("Retry-After", str(server.retry_after))])
+            return
+        if fault:
+            server.count("errors", fault)
+            self._send(fault, b'{"message":"Injected failure"}')
+            return
+
+        with server._lock:
+            server.stats["frames_served"][i] += 1
+        status = frame["status"]
+        headers = [(k, v) for k, v in frame["headers"].items() if k != "ETag"] + [("ETag", frame["etag"])]
+        if status == 200 and self.headers.get("If-None-Match") == frame["etag"]:
+            server.count("not_modified", 304)
+            self._send(304, headers=[("ETag", frame["etag"])])
+            return
+        server.count(None, status)
+        self._send(status, frame["body"], headers)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_replay_server(frames, **options):
+    """Start a ReplayServer on a daemon thread; returns it (its .url is the LIVE_URL to use)."""
+    server = ReplayServer(frames, **options)
+    threading.Thread(target=server.serve_forever, name="replay-server", daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Replay a live-feed capture over HTTP.")
+    ap.add_argument("capture")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=DEFAULT_PORT)
+    ap.add_argument("--speed", type=float, default=1.0, help="timeline speed-up factor")
+    ap.add_argument("--loop", action="store_true")
+    ap.add_argument("--advance", choices=("time", "request"), default="time")
+    ap.add_argument("--replay-latency", action="store_true", help="add each response's recorded latency")
+    ap.add_argument("--latency-ms", type=float, default=0.0)
+    ap.add_argument("--jitter-ms", type=float, default=0.0)
+    ap.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered 5xx")
+    ap.add_argument("--rate-limit-rate", type=float, default=0.0, help="fraction of requests answered 429")
+    ap.add_argument("--retry-after", type=int, default=1, help="Retry-After seconds sent with 429s")
+    ap.add_argument("--seed", type=int)
+    args = ap.parse_args()
+
+    header, frames = read_capture(args.capture)
+    server = ReplayServer(frames, host=args.host, port=args.port, speed=args.speed, loop=args.loop,
+                          advance=args.advance, replay_latency=args.replay_latency,
+                          latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                          error_rate=args.error_rate, rate_limit_rate=args.rate_limit_rate,
+                          retry_after=args.retry_after, seed=args.seed)
+    print(f"▶ Replaying {len(frames)} responses from {args.capture} (recorded {header.get('recorded_at', 'n/a')})")
+    print(f"  CRICBUZZ_LIVE_URL={server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(json.dumps({k: v for k, v in server.stats.items() if k != "frames_served"}), file=sys.stderr)
@@ -1,15 +1,19 @@
 # scripts/seed_db.py
-import pandas as pd
-from utils.db_connection import get_engine
+"""Seed the app DB (cricbuzz.db, or CRICBUZZ_DB) with a small deterministic demo dataset.
 
-engine = get_engine()
+Usage: python -m scripts.seed_db [n_matches]
+Adds generated matches, players and scorecards next to whatever the poller has
+ingested, so the SQL Queries templates have something to show. For benchmark
+sized data use scripts/generate_dataset.py with its own --out file.
+"""
+import sys
 
-sample_matches = [
-    {"match_id": 1, "teams": "India vs Australia", "score": "250/8", "overs": 50, "status": "Complete"},
-    {"match_id": 2, "teams": "England vs Pakistan", "score": "120/3", "overs": 23.1, "status": "Live"}
-]
+from scripts.generate_dataset import generate
+from utils.config import DB_PATH
 
-df = pd.DataFrame(sample_matches)
-df.to_sql("matches", engine, if_exists="replace", index=False)
+DEMO_MATCHES = 200
 
-print("✅ Sample matches inserted into DB")
\ No newline at end of file
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else DEMO_MATCHES
+    counts = generate(DB_PATH, n)
+    print(f"✅ Seeded {DB_PATH} with {counts['matches']} matches, {counts['player_innings']} innings")
@@ -0,0 +1,66 @@
+"""Payload corpus and helpers shared by the feed tests."""
+import glob
+import json
+import os
+
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "scripts", "fixtures", "live_payloads")
+CORPUS = sorted(glob.glob(os.path.join(CORPUS_DIR, "*.json")))
+CHUNK_SIZES = (1, 7, 64, 4096, 1 << 20)
+LARGE_CHUNK_SIZES = (1000, 64 * 1024)
+
+
+def read_payload(name):
+    with open(os.path.join(CORPUS_DIR, name), "rb") as f:
+        return f.read()
+
+
+def chunked(body, size):
+    for i in range(0, len(body), size):
+        yield body[i:i + size]
+
+
+def without_updated_at(rows):
+    """Rows minus updated_at, which is a wall-clock stamp."""
+    return [{k: v for k, v in r.items() if k != "updated_at"} for r in rows]
+
+
+def large_body(copies=20):
+    """A schedule-sized payload: the mixed corpus payload repeated with fresh match ids."""
+    base = json.loads(read_payload("live_mixed.json"))
+    data = {"typeMatches": []}
+    next_id = 1
+    for _ in range(copies):
+        for tm in json.loads(json.dumps(base["typeMatches"])):
+            for s in tm.get("seriesMatches", []):
+                for m in (s.get("seriesAdWrapper") or {}).get("matches") or []:
+                    m["matchInfo"]["matchId"] = next_id
+                    next_id += 1
+            data["typeMatches"].append(tm)
+    return json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+
+class FakeStream:
+    """Stands in for a streamed requests.Response."""
+
+    def __init__(self, body, status_code=200, headers=None, fail_after=None):
+        self.body = body
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.fail_after = fail_after    # raise after this many chunks
+        self.closed = False
+
+    def iter_content(self, chunk_size):
+        for n, i in enumerate(range(0, len(self.body), chunk_size)):
+            if self.fail_after is not None and n >= self.fail_after:
+                raise ConnectionError("connection reset")
+            yield self.body[i:i + chunk_size]
+
+    @property
+    def content(self):
+        return self.body
+
+    def raise_for_status(self):
+        pass
+
+    def close(self):
+        self.closed = True
@@ -0,0 +1,87 @@
+"""CricbuzzClient streaming: bodies are spooled to disk into the cache, never buffered whole in memory."""
+import hashlib
+import os
+import tracemalloc
+
+import pytest
+
+from tests.feed_payloads import FakeStream, large_body
+from utils.api_client import ApiResponse, CricbuzzClient
+
+URL = "https://example.invalid/matches/v1/live"
+
+
+@pytest.fixture
+def client(tmp_path):
+    return CricbuzzClient(cache_dir=str(tmp_path / "cache"), cache_ttl=30, max_retries=0)
+
+
+def _serve(monkeypatch, client, *responses):
+    sent = []
+
+    def request(url, params, headers, stream):
+        sent.append(headers)
+        return responses[len(sent) - 1]
+
+    monkeypatch.setattr(client, "_request", request)
+    return sent
+
+
+def _leftovers(client):
+    return [f for f in os.listdir(client.cache.cache_dir) if f.endswith(".tmp")]
+
+
+def test_streamed_body_is_cached_from_the_spool_file(client, monkeypatch):
+    body = large_body(copies=5)
+    sent = _serve(monkeypatch, client, FakeStream(body, headers={"ETag": '"v1"'}), FakeStream(b"", status_code=304))
+
+    resp = client.get(URL, stream=True)
+    assert resp.digest is None
+    assert b"".join(resp.iter_content(4096)) == body
+    assert resp.digest == hashlib.sha1(body).hexdigest()
+    assert resp.content == body
+    assert not _leftovers(client)
+
+    hit = client.get(URL, stream=True)
+    assert hit.from_cache and hit.digest == resp.digest and hit.content == body
+    assert len(sent) == 1
+
+    client.cache.ttl = 0
+    revalidated = client.get(URL, stream=True)
+    assert sent[1]["If-None-Match"] == '"v1"'
+    assert revalidated.not_modified and revalidated.digest == resp.digest
+    assert b"".join(revalidated.iter_content()) == body
+
+
+def test_streaming_does_not_hold_the_body(client, monkeypatch):
+    body = large_body(copies=100)
+    _serve(monkeypatch, client, FakeStream(body))
+    resp = client.get(URL, stream=True)
+    tracemalloc.start()
+    try:
+        size = sum(len(chunk) for chunk in resp.iter_content(64 * 1024))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert size == len(body) > 512 * 1024
+    assert peak < len(body) / 4
+
+
+def test_failed_download_leaves_nothing_behind(client, monkeypatch):
+    stream = FakeStream(large_body(copies=2), fail_after=3)
+    _serve(monkeypatch, client, stream)
+    resp = client.get(URL, stream=True)
+    with pytest.raises(ConnectionError):
+        for _ in resp.iter_content(1024):
+            pass
+    assert stream.closed
+    assert not _leftovers(client)
+    assert client.cache.load_meta(client.cache.key(URL)) is None
+
+
+def test_uncached_stream_removes_its_spool_file(tmp_path):
+    resp = ApiResponse(200, stream=FakeStream(b'{"typeMatches": []}'), spool_dir=str(tmp_path))
+    assert resp.json() == {"typeMatches": []}
+    assert len(os.listdir(tmp_path)) == 1
+    del resp
+    assert os.listdir(tmp_path) == []
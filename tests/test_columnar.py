@@ -0,0 +1,79 @@
+"""Columnar snapshots: year partitions sorted by series, incremental rewrites, deletes and moves."""
+import os
+import sqlite3
+
+import pytest
+
+pq = pytest.importorskip("pyarrow.parquet")
+
+import utils.columnar as columnar
+from utils.columnar import export_incremental, read_frame
+from utils.migrations import migrate
+
+MS_2024 = 1_717_200_000_000      # 2024-06-01
+MS_2025 = 1_748_736_000_000      # 2025-06-01
+# stamped before the export's WRITE_LAG_S window, so the next export's watermark is past it
+RECENTLY = "strftime('%Y-%m-%dT%H:%M:%SZ', 'now', '-10 seconds')"
+
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(":memory:", isolation_level=None)
+    migrate(conn)
+    rows = [(str(i), f"Series {i % 5}", (MS_2024 if i % 2 else MS_2025) + i * 60_000) for i in range(200)]
+    rows.append(("nostart", "Series 0", None))
+    conn.executemany("INSERT INTO live_matches (match_id, series_name, start_ts) VALUES (?, ?, ?)", rows)
+    yield conn
+    conn.close()
+
+
+def _years(out):
+    return sorted(os.listdir(os.path.join(out, "live_matches")))
+
+
+def _frame(out, **kw):
+    return read_frame("live_matches", columns=["match_id", "series_name", "start_ts", "year"], export_dir=out, **kw)
+
+
+def test_partitions_by_year_sorted_by_series(conn, tmp_path, monkeypatch):
+    monkeypatch.setattr(columnar, "ROW_GROUP_ROWS", 10)
+    out = str(tmp_path / "col")
+    assert export_incremental(conn, out)["live_matches"] == {"partitions": 3, "rows": 201, "removed": 0}
+    assert _years(out) == ["year=2024", "year=2025", "year=unknown"]
+    df = _frame(out, filters=[("year", "=", "2025")])
+    assert len(df) == 100
+    assert list(df.itertuples(index=False, name=None)) == sorted(df.itertuples(index=False, name=None),
+                                                                  key=lambda r: (r[1], r[2]))
+    # row groups cover disjoint series ranges, so a series filter skips the others
+    meta = pq.ParquetFile(os.path.join(out, "live_matches", "year=2025", "part-0.parquet")).metadata
+    col = meta.schema.names.index("series_name")
+    bounds = [(meta.row_group(i).column(col).statistics.min, meta.row_group(i).column(col).statistics.max)
+              for i in range(meta.num_row_groups)]
+    assert meta.num_row_groups == 10
+    assert sum(lo <= "Series 3" <= hi for lo, hi in bounds) == 2
+    assert set(_frame(out, filters=[("series_name", "=", "Series 3")])["match_id"]) == {
+        str(i) for i in range(200) if i % 5 == 3}
+
+
+def test_incremental_rewrites_only_touched_years(conn, tmp_path):
+    out = str(tmp_path / "col")
+    export_incremental(conn, out)
+    conn.execute(f"UPDATE live_matches SET status = 'Stumps', updated_at = {RECENTLY} WHERE match_id = '1'")
+    assert export_incremental(conn, out)["live_matches"] == {"partitions": 1, "rows": 100, "removed": 0}
+    assert export_incremental(conn, out)["live_matches"]["partitions"] == 0
+
+
+def test_deletes_and_moves_leave_their_partition(conn, tmp_path):
+    out = str(tmp_path / "col")
+    export_incremental(conn, out)
+    conn.execute("DELETE FROM live_matches WHERE match_id = 'nostart'")
+    conn.execute(f"UPDATE live_matches SET start_ts = ?, updated_at = {RECENTLY} WHERE match_id = '1'", (MS_2025,))
+    # a move within the year keeps its partition and records nothing
+    conn.execute(f"UPDATE live_matches SET start_ts = start_ts + 1, updated_at = {RECENTLY} WHERE match_id = '2'")
+    assert conn.execute("SELECT match_id FROM live_matches_tombstones ORDER BY seq").fetchall() == [("nostart",), ("1",)]
+    result = export_incremental(conn, out)["live_matches"]
+    assert result["removed"] == 1
+    assert _years(out) == ["year=2024", "year=2025"]
+    df = _frame(out)
+    assert len(df) == 200
+    assert df.set_index("match_id").loc["1", "year"] == "2025"
@@ -0,0 +1,82 @@
+"""Incremental ETL: watermark loads, deletions through live_matches_tombstones, rows without updated_at."""
+import sqlite3
+
+import pytest
+
+from utils.etl import load_incremental
+from utils.migrations import migrate
+
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(":memory:", isolation_level=None)
+    migrate(conn)
+    for i in range(5):
+        _add(conn, f"m{i}", "2025-01-01T00:00:00Z")
+    yield conn
+    conn.close()
+
+
+def _add(conn, match_id, updated_at):
+    conn.execute("""
+        INSERT INTO live_matches (match_id, series_name, team1, team2, status, match_format, start_ts, updated_at)
+        VALUES (?, 'Series', 'India', 'England', 'India won by 5 runs', 'T20', 1735689600000, ?)""",
+                 (match_id, updated_at))
+
+
+def _loaded(conn):
+    return sorted(r[0] for r in conn.execute("SELECT cb_match_id FROM matches"))
+
+
+def test_incremental_load_only_reads_changes(conn):
+    assert load_incremental(conn)["matches"] == 5
+    assert load_incremental(conn)["matches"] == 0
+    conn.execute("UPDATE live_matches SET status = 'England won by 2 wkts', updated_at = '2025-01-02T00:00:00Z' "
+                 "WHERE match_id = 'm1'")
+    assert load_incremental(conn)["matches"] == 1
+
+
+def test_deletions_come_from_tombstones(conn):
+    load_incremental(conn)
+    conn.execute("DELETE FROM live_matches WHERE match_id IN ('m1', 'm2')")
+    assert conn.execute("SELECT COUNT(*) FROM live_matches_tombstones").fetchone()[0] == 2
+    assert load_incremental(conn)["deleted"] == 2
+    assert _loaded(conn) == ["m0", "m3", "m4"]
+    seq = conn.execute("SELECT tombstone_seq FROM etl_state").fetchone()[0]
+    assert seq == conn.execute("SELECT MAX(seq) FROM live_matches_tombstones").fetchone()[0]
+    assert load_incremental(conn)["deleted"] == 0
+
+
+def test_deleted_then_reinserted_match_is_kept(conn):
+    load_incremental(conn)
+    conn.execute("DELETE FROM live_matches WHERE match_id = 'm3'")
+    _add(conn, "m3", "2025-01-03T00:00:00Z")
+    assert load_incremental(conn)["deleted"] == 0
+    assert "m3" in _loaded(conn)
+
+
+def test_first_load_without_a_seq_compares_every_match(conn):
+    load_incremental(conn)
+    conn.execute("DELETE FROM live_matches WHERE match_id = 'm4'")
+    conn.execute("DELETE FROM live_matches_tombstones")      # e.g. pruned before this load ran
+    conn.execute("UPDATE etl_state SET tombstone_seq = NULL")
+    assert load_incremental(conn)["deleted"] == 1
+    assert "m4" not in _loaded(conn)
+
+
+def test_rows_without_updated_at_are_loaded(conn):
+    load_incremental(conn)
+    conn.execute("INSERT INTO live_matches (match_id, series_name, team1, team2, status) "
+                 "VALUES ('bare', 'Series', 'India', 'England', 'Match drawn')")
+    assert load_incremental(conn)["matches"] == 1
+    assert "bare" in _loaded(conn)
+    assert load_incremental(conn)["matches"] == 0
+
+
+def test_migration_backfills_missing_updated_at():
+    conn = sqlite3.connect(":memory:", isolation_level=None)
+    conn.execute("CREATE TABLE live_matches (match_id TEXT PRIMARY KEY, series_name TEXT, team1 TEXT, team2 TEXT, "
+                 "status TEXT)")
+    conn.execute("INSERT INTO live_matches VALUES ('legacy', 'S', 'India', 'England', 'Match drawn')")
+    migrate(conn)
+    assert conn.execute("SELECT updated_at IS NOT NULL FROM live_matches").fetchone()[0] == 1
@@ -0,0 +1,115 @@
+"""Streaming feed parser against flatten_payload / split_payload on the recorded payload corpus, and
+the poller's archiving and unchanged-payload skip for streamed bodies."""
+import json
+import os
+
+import pytest
+
+from tests.feed_payloads import (CHUNK_SIZES, CORPUS, LARGE_CHUNK_SIZES, FakeStream, chunked, large_body,
+                                 read_payload, without_updated_at)
+from utils.api_client import ApiResponse
+from utils.feed_stream import ingest_stream, iter_match_rows, iter_series_matches
+from utils.live_feed import flatten_payload
+from utils.payload_archive import PayloadArchive, split_payload
+
+
+def test_corpus_is_present():
+    assert {"edge_cases.json", "empty.json", "live_mixed.json"} <= {os.path.basename(p) for p in CORPUS}
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+@pytest.mark.parametrize("path", CORPUS, ids=os.path.basename)
+def test_stream_matches_flatten_payload(path, chunk_size):
+    body = read_payload(os.path.basename(path))
+    expected = without_updated_at(flatten_payload(json.loads(body)))
+    assert without_updated_at(iter_match_rows(chunked(body, chunk_size))) == expected
+
+
+def test_mixed_payload_yields_rows():
+    rows = list(iter_match_rows(chunked(read_payload("live_mixed.json"), 64)))
+    assert rows
+    assert all(r["match_id"] for r in rows)
+
+
+@pytest.mark.parametrize("chunk_size", LARGE_CHUNK_SIZES)
+def test_large_schedule(chunk_size):
+    body = large_body(copies=20)
+    expected = without_updated_at(flatten_payload(json.loads(body)))
+    got = without_updated_at(iter_match_rows(chunked(body, chunk_size)))
+    assert len(got) == len(expected) > 0
+    assert got == expected
+
+
+@pytest.mark.parametrize("chunk_size", [1, 64, 1 << 20])
+@pytest.mark.parametrize("path", CORPUS, ids=os.path.basename)
+def test_stream_skeleton_matches_split_payload(path, chunk_size):
+    body = read_payload(os.path.basename(path))
+    skeleton = {}
+    matches = list(iter_series_matches(chunked(body, chunk_size), skeleton=skeleton))
+    assert (skeleton, matches) == split_payload(json.loads(body))
+
+
+def test_ingest_stream_archives_without_reparsing(tmp_path):
+    body = read_payload("live_mixed.json")
+    archive = PayloadArchive(str(tmp_path / "archive.db"))
+    writer = archive.writer()
+    changes = ingest_stream(chunked(body, 256), lambda rows: {"inserted": len(rows)}, archive=writer)
+    added = writer.finish(len(body), "d1")
+    assert added["matches"] == changes["rows"] > 0
+    assert archive.rebuild(added["payload_id"]) == json.loads(body)
+    # the same payload again stores nothing new
+    assert archive.add(body)["stored_bytes"] == 0
+
+
+def test_aborted_archive_payload_is_not_stored(tmp_path):
+    archive = PayloadArchive(str(tmp_path / "archive.db"))
+    writer = archive.writer()
+    with pytest.raises(ValueError):
+        ingest_stream(chunked(b'{"typeMatches": [{"seriesMatches": [{"seriesAdWrapper": {"seriesName": "S", '
+                              b'"matches": [{"matchInfo": {"matchId": 1}}, {"matchInfo": ', 8),
+                      lambda rows: {}, archive=writer)
+    writer.abort()
+    assert "error" in writer.finish(0)
+    assert archive.stats()["payloads"] == archive.stats()["fragments"] == 0
+
+
+def test_streamed_body_digest_skips_unchanged_payload(tmp_path, monkeypatch):
+    import hashlib
+
+    import utils.poller as poller_mod
+
+    # trailing fields after typeMatches: the parser is done before the body is
+    body = read_payload("live_mixed.json").rstrip()
+    body = body[:-1] + b', "filters": {"matchType": ["International", "League", "Domestic", "Women"]}}'
+    streams, cached = [], {}
+
+    def save(body_file, digest):
+        cached["digest"] = digest
+        os.replace(body_file, tmp_path / "cached.body")
+        return tmp_path / "cached.body"
+
+    def fetch(stream=False):
+        # like ApiClient.get: the digest is cached once a streamed body is complete,
+        # and a 304 for it comes back with that digest
+        if "digest" in cached:
+            return ApiResponse(200, path=tmp_path / "cached.body", digest=cached["digest"], not_modified=True)
+        streams.append(FakeStream(body))
+        return ApiResponse(200, stream=streams[-1], spool_dir=tmp_path, on_complete=save)
+
+    monkeypatch.setattr(poller_mod, "fetch_live_payload", fetch)
+    # the archive is fed from the parse, not from a second read of the body
+    monkeypatch.setattr(ApiResponse, "content", property(lambda self: pytest.fail("body read twice")))
+    poller = poller_mod.LivePoller(db_path=str(tmp_path / "live.db"), archive_path=str(tmp_path / "archive.db"),
+                                   columnar_dir=str(tmp_path / "columnar"))
+    assert poller.poll_once(), poller.status()["last_error"]
+    assert streams[0].closed
+    assert poller.status()["last_count"] > 0
+    assert poller._last_digest == cached["digest"] == hashlib.sha1(body).hexdigest()
+    archived = poller.status()["last_changes"]["archive"]
+    archive = PayloadArchive(str(tmp_path / "archive.db"), read_only=True)
+    assert archive.rebuild(archived["payload_id"]) == json.loads(body)
+    assert archive.conn.execute("SELECT body_size, digest FROM archive_payloads").fetchone() == (
+        len(body), cached["digest"])
+
+    assert poller.poll_once()
+    assert poller.status()["unchanged"] == 1
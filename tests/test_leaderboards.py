@@ -0,0 +1,104 @@
+"""Incremental leaderboard updates against a rebuild from player_career_stats."""
+import random
+import sqlite3
+
+import pytest
+
+from utils.leaderboards import BOARDS, MIN_INNINGS, MIN_WICKETS, read_board, rebuild_leaderboards, update_leaderboards
+from utils.migrations import migrate
+
+DEPTH = 5
+PLAYERS = 40
+FORMATS = ["ODI", "T20I", "Test"]
+
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(":memory:", isolation_level=None)
+    migrate(conn)
+    conn.executemany("INSERT INTO players (player_id, full_name) VALUES (?, ?)",
+                     [(pid, f"Player {pid}") for pid in range(1, PLAYERS + 1)])
+    yield conn
+    conn.close()
+
+
+def _set_career(conn, pid, fmt, runs, innings, wickets, economy):
+    conn.execute("""
+        INSERT INTO player_career_stats (player_id, format, innings, total_runs, batting_average, total_wickets, economy)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT (player_id, format) DO UPDATE SET
+            innings = excluded.innings, total_runs = excluded.total_runs, batting_average = excluded.batting_average,
+            total_wickets = excluded.total_wickets, economy = excluded.economy""",
+                 (pid, fmt, innings, runs, runs / innings if innings else None, wickets, economy))
+
+
+def _random_career(conn, rng, pid, fmt):
+    innings = rng.randint(0, 3 * MIN_INNINGS)
+    _set_career(conn, pid, fmt, rng.randint(0, 2000) if innings else 0, innings,
+                rng.randint(0, 3 * MIN_WICKETS), round(rng.uniform(3, 9), 2))
+
+
+def _boards(conn):
+    return conn.execute("SELECT board, format, rank, player_id, value FROM leaderboards "
+                        "ORDER BY board, format, rank").fetchall()
+
+
+def _rebuilt(conn):
+    conn.execute("SAVEPOINT rebuild")
+    rebuild_leaderboards(conn, DEPTH)
+    boards = _boards(conn)
+    conn.execute("ROLLBACK TO rebuild")
+    conn.execute("RELEASE rebuild")
+    return boards
+
+
+def test_rebuild_ranks_qualifying_players(conn):
+    _set_career(conn, 1, "ODI", 900, MIN_INNINGS, MIN_WICKETS, 4.5)
+    _set_career(conn, 2, "ODI", 950, MIN_INNINGS - 1, MIN_WICKETS - 1, 3.0)
+    _set_career(conn, 3, "ODI", 900, MIN_INNINGS, 0, None)
+    rebuild_leaderboards(conn, DEPTH)
+    ranked = {board: [pid for b, _, _, pid, _ in _boards(conn) if b == board] for board in BOARDS}
+    assert ranked["runs"] == [2, 1, 3]                  # ties broken by player_id
+    assert ranked["batting_average"] == [1, 3]          # player 2 is short of MIN_INNINGS
+    assert ranked["wickets"] == [1, 2]
+    assert ranked["economy"] == [1]                     # lower is better, MIN_WICKETS to qualify
+    cols, rows = read_board(conn, "runs", "ODI", n=2)
+    assert cols[:2] == ["rank", "player"]
+    assert [r[:2] for r in rows] == [(1, "Player 2"), (2, "Player 1")]
+
+
+def test_updates_match_a_rebuild(conn):
+    rng = random.Random(7)
+    for pid in range(1, PLAYERS + 1):
+        for fmt in FORMATS:
+            _random_career(conn, rng, pid, fmt)
+    rebuild_leaderboards(conn, DEPTH)
+    for _ in range(60):
+        changed = rng.sample(range(1, PLAYERS + 1), rng.randint(1, 4))
+        for pid in changed:
+            fmt = rng.choice(FORMATS)
+            if rng.random() < 0.2:
+                conn.execute("DELETE FROM player_career_stats WHERE player_id = ? AND format = ?", (pid, fmt))
+            else:
+                _random_career(conn, rng, pid, fmt)
+        update_leaderboards(conn, changed, DEPTH)
+        assert _boards(conn) == _rebuilt(conn)
+
+
+def test_member_dropping_out_refills_the_board(conn):
+    for pid in range(1, DEPTH + 3):
+        _set_career(conn, pid, "Test", 100 * pid, MIN_INNINGS, 0, None)
+    rebuild_leaderboards(conn, DEPTH)
+    top = DEPTH + 2
+    conn.execute("DELETE FROM player_career_stats WHERE player_id = ?", (top,))
+    assert update_leaderboards(conn, [top], DEPTH) >= 1
+    runs = [pid for b, _, _, pid, _ in _boards(conn) if b == "runs"]
+    assert runs == list(range(DEPTH + 1, 1, -1))        # the next best player moved up into the board
+
+
+def test_unchanged_players_rewrite_nothing(conn):
+    for pid in range(1, 10):
+        _set_career(conn, pid, "ODI", 50 * pid, MIN_INNINGS, MIN_WICKETS + pid, 5.0)
+    rebuild_leaderboards(conn, DEPTH)
+    assert update_leaderboards(conn, [3, 4], DEPTH) == 0
+    assert update_leaderboards(conn, [], DEPTH) == 0
@@ -0,0 +1,68 @@
+"""match_state_history triggers: one row per status change, none lost within the same second."""
+import sqlite3
+
+import pytest
+
+from utils.match_history import backfill_history, changes_between, match_timeline
+from utils.migrations import migrate
+
+T0 = "2025-10-17 10:00:00"
+T1 = "2025-10-17 10:00:05"
+
+UPSERT = """
+INSERT INTO live_matches (match_id, status, is_complete, updated_at) VALUES (?, ?, ?, ?)
+ON CONFLICT (match_id) DO UPDATE SET
+    status = excluded.status, is_complete = excluded.is_complete, updated_at = excluded.updated_at
+"""
+
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(":memory:", isolation_level=None)
+    migrate(conn)
+    yield conn
+    conn.close()
+
+
+def _set(conn, status, at, match_id="1", is_complete=0):
+    conn.execute(UPSERT, (match_id, status, is_complete, at))
+
+
+def _statuses(conn, match_id="1"):
+    return [(e["at"], e["status"]) for e in match_timeline(conn, match_id)]
+
+
+def test_records_only_changes(conn):
+    _set(conn, "Toss: India opt to bat", T0)
+    _set(conn, "Toss: India opt to bat", T1)
+    _set(conn, "India won by 4 wkts", T1, is_complete=1)
+    assert [s for _, s in _statuses(conn)] == ["Toss: India opt to bat", "India won by 4 wkts"]
+    assert match_timeline(conn, "1")[-1]["is_complete"] == 1
+
+
+def test_changes_in_the_same_second_are_all_kept(conn):
+    for status in ["Innings break", "Rain stops play", "Innings break", "Australia need 98 runs"]:
+        _set(conn, status, T0)
+    assert [s for _, s in _statuses(conn)] == [
+        "Innings break", "Rain stops play", "Innings break", "Australia need 98 runs"]
+    assert conn.execute("SELECT seq FROM match_state_history ORDER BY ts, seq").fetchall() == [(0,), (1,), (2,), (3,)]
+    # the last row recorded is the one compared against, so repeating it adds nothing
+    _set(conn, "Australia need 98 runs", T0)
+    assert len(_statuses(conn)) == 4
+
+
+def test_changes_between_orders_by_time_then_match(conn):
+    _set(conn, "Stumps", T1, match_id="2")
+    _set(conn, "Innings break", T0)
+    _set(conn, "Rain stops play", T0)
+    rows = [(e["match_id"], e["status"]) for e in changes_between(conn, T0)]
+    assert rows == [("1", "Innings break"), ("1", "Rain stops play"), ("2", "Stumps")]
+    assert changes_between(conn, T0, T1) == changes_between(conn, T0)[:2]
+
+
+def test_backfill_records_matches_without_history(conn):
+    _set(conn, "Stumps", T0)
+    conn.execute("DELETE FROM match_state_history")
+    assert backfill_history(conn) == 1
+    assert backfill_history(conn) == 0
+    assert _statuses(conn) == [("2025-10-17T10:00:00Z", "Stumps")]
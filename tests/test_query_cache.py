@@ -0,0 +1,95 @@
+"""QueryCache: hits until anything is committed (data_version / write queue generation), plus its budgets."""
+import sqlite3
+
+import pytest
+
+import utils.query_cache as query_cache
+from utils.query_cache import QueryCache, normalize_sql
+from utils.write_queue import get_write_queue
+
+TIMEOUT = 10
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = QueryCache(str(tmp_path / "qc.db"))
+    cache.data_version()        # creates the schema
+    with sqlite3.connect(cache.db_path) as conn:
+        conn.execute("INSERT INTO live_matches (match_id, team1, team2) VALUES ('1', 'India', 'Australia')")
+    return cache
+
+
+def _count(cache):
+    return int(cache.get("SELECT COUNT(*) AS n FROM live_matches")["n"][0])
+
+
+def test_normalize_sql_ignores_layout_but_not_literals():
+    a = normalize_sql("SELECT *\n  FROM t -- all rows\nWHERE team = 'India' ;")
+    b = normalize_sql("/* same */ SELECT * FROM t WHERE team = 'India'")
+    assert a == b == "SELECT * FROM t WHERE team = 'India'"
+    assert normalize_sql("SELECT 'a  --b'") == "SELECT 'a  --b'"
+    assert normalize_sql("SELECT 'India'") != normalize_sql("SELECT 'india'")
+
+
+def test_hit_until_another_connection_commits(cache):
+    assert _count(cache) == 1
+    assert _count(cache) == 1
+    assert cache.stats["hits"] == 1
+    with sqlite3.connect(cache.db_path) as conn:
+        conn.execute("INSERT INTO live_matches (match_id) VALUES ('2')")
+    assert _count(cache) == 2
+    assert cache.stats["stale"] == 1
+
+
+def test_write_queue_commit_invalidates(cache):
+    assert _count(cache) == 1
+    get_write_queue(cache.db_path).execute("INSERT INTO live_matches (match_id) VALUES ('3')").result(TIMEOUT)
+    assert _count(cache) == 2
+
+
+def test_read_only_activity_keeps_entries(cache):
+    assert _count(cache) == 1
+    with sqlite3.connect(cache.db_path) as conn:
+        conn.execute("SELECT * FROM live_matches").fetchall()
+    assert _count(cache) == 1
+    assert cache.stats["hits"] == 1
+
+
+def test_failed_compute_is_not_cached(cache):
+    calls = []
+
+    def compute():
+        calls.append(1)
+        if len(calls) == 1:
+            raise sqlite3.OperationalError("boom")
+        return "ok"
+
+    with pytest.raises(sqlite3.OperationalError):
+        cache.fetch("k", compute, size=len)
+    assert cache.fetch("k", compute, size=len) == "ok"
+    assert len(calls) == 2
+
+
+def test_entry_and_cell_budgets_evict_least_recently_used(cache):
+    cache.max_entries, cache.max_cells = 2, 10
+    cache.fetch("a", lambda: "aaaa", size=len)
+    cache.fetch("b", lambda: "bbbb", size=len)
+    cache.fetch("a", lambda: "never", size=len)        # a is now the most recently used
+    cache.fetch("c", lambda: "cccc", size=len)
+    assert cache.report()["entries"] == 2
+    assert cache.fetch("a", lambda: "recomputed", size=len) == "aaaa"
+    assert cache.fetch("b", lambda: "recomputed", size=len) == "recomputed"
+
+    cache.fetch("huge", lambda: "x" * 11, size=len)     # over the whole budget: never stored
+    assert cache.fetch("huge", lambda: "again", size=len) == "again"
+    assert cache.report()["cells"] <= cache.max_cells
+
+
+def test_entries_expire(cache, monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(query_cache.time, "monotonic", lambda: clock[0])
+    cache.fetch("k", lambda: "old", size=len)
+    clock[0] += cache.max_age_s
+    assert cache.fetch("k", lambda: "new", size=len) == "old"
+    clock[0] += 1
+    assert cache.fetch("k", lambda: "new", size=len) == "new"
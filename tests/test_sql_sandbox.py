@@ -0,0 +1,103 @@
+"""SQL box sandbox: read-only authorizer, paging limits, timeout and cancellation."""
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from utils.sql_sandbox import execute_page, open_sandbox, run_page
+
+ENDLESS = "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n) SELECT COUNT(*) FROM n"
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "sandbox.db")
+    open_sandbox(path).close()      # creates the schema
+    with sqlite3.connect(path) as conn:
+        conn.executemany("INSERT INTO live_matches (match_id, team1) VALUES (?, ?)",
+                         [(str(i), f"Team {i % 7}") for i in range(250)])
+    return path
+
+
+@pytest.fixture
+def sandbox(db_path):
+    conn = open_sandbox(db_path)
+    yield conn
+    conn.close()
+
+
+def test_pages_through_a_result(sandbox):
+    sql = "SELECT match_id FROM live_matches ORDER BY CAST(match_id AS INTEGER)"
+    first = execute_page(sandbox, sql, page=0, page_size=100)
+    assert first["columns"] == ["match_id"]
+    assert [r[0] for r in first["rows"]] == [str(i) for i in range(100)]
+    assert first["has_next"] and not first["capped"]
+    last = execute_page(sandbox, sql, page=2, page_size=100)
+    assert len(last["rows"]) == 50 and not last["has_next"]
+
+
+def test_stops_at_max_rows(sandbox):
+    res = execute_page(sandbox, "SELECT * FROM live_matches", page=1, page_size=100, max_rows=150)
+    assert len(res["rows"]) == 50
+    assert res["capped"] and not res["has_next"]
+    assert execute_page(sandbox, "SELECT * FROM live_matches", page=2, page_size=100, max_rows=150)["rows"] == []
+
+
+@pytest.mark.parametrize("sql", [
+    "INSERT INTO live_matches (match_id) VALUES ('x')",
+    "UPDATE live_matches SET team1 = 'x'",
+    "DELETE FROM live_matches",
+    "DROP TABLE live_matches",
+    "CREATE TABLE evil (x)",
+    "ATTACH DATABASE ':memory:' AS other",
+    "PRAGMA journal_mode=DELETE",
+    "PRAGMA query_only=OFF",
+    "SELECT load_extension('x')",
+])
+def test_refuses_anything_but_reads(sandbox, db_path, sql):
+    with pytest.raises(sqlite3.DatabaseError):
+        execute_page(sandbox, sql)
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM live_matches WHERE team1 <> 'x'").fetchone()[0] == 250
+
+
+def test_allows_introspection_pragmas(sandbox):
+    res = execute_page(sandbox, "PRAGMA table_info(live_matches)")
+    assert "match_id" in [r[1] for r in res["rows"]]
+
+
+def test_times_out(sandbox):
+    started = time.monotonic()
+    with pytest.raises(TimeoutError):
+        execute_page(sandbox, ENDLESS, timeout_s=0.3)
+    assert time.monotonic() - started < 3
+    # the connection is still usable afterwards
+    assert execute_page(sandbox, "SELECT 1")["rows"] == [(1,)]
+
+
+def test_cancel_event_interrupts(sandbox):
+    cancel = threading.Event()
+    threading.Timer(0.2, cancel.set).start()
+    with pytest.raises(sqlite3.OperationalError, match="interrupted"):
+        execute_page(sandbox, ENDLESS, timeout_s=30, cancel=cancel)
+
+
+def test_run_page_interrupts_when_the_caller_unwinds(db_path):
+    class Stop(Exception):
+        pass
+
+    def on_wait(elapsed):
+        if elapsed > 0.3:
+            raise Stop        # what Streamlit does to a script when the user cancels
+
+    started = time.monotonic()
+    with pytest.raises(Stop):
+        run_page(ENDLESS, timeout_s=30, db_path=db_path, on_wait=on_wait)
+    assert time.monotonic() - started < 5
+
+
+def test_run_page_returns_the_page(db_path):
+    ticks = []
+    res = run_page("SELECT COUNT(*) FROM live_matches", db_path=db_path, on_wait=ticks.append)
+    assert res["rows"] == [(250,)]
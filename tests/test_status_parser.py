@@ -0,0 +1,42 @@
+"""parse_status and its vectorized twin derive_status_columns on the status forms the feed uses."""
+import pandas as pd
+import pytest
+
+from utils.status_parser import derive_status_columns, parse_status
+
+CASES = [
+    ("India won by 4 wickets", ("India", "wickets", 4, 1)),
+    ("Australia won by 4 wkts", ("Australia", "wickets", 4, 1)),
+    ("Sri Lanka won by 23 runs (DLS method)", ("Sri Lanka", "runs", 23, 1)),
+    ("England won by an innings and 12 runs", ("England", "innings", 12, 1)),
+    ("Match tied (Pakistan won the Super Over)", ("Pakistan", "super over", None, 1)),
+    ("New Zealand A need 98 runs in 91 balls", ("", "", None, 0)),
+    ("Day 2: Stumps - India lead by 120 runs", ("", "", None, 0)),
+    ("Pakistan trail by 30 runs", ("", "", None, 0)),
+    ("Tie Breakers opt to bat", ("", "", None, 0)),
+    ("Day 2: Stumps", ("", "", None, 0)),
+    ("Stumps", ("", "", None, 0)),
+    ("Match drawn - India lead the series 1-0", ("", "", None, 1)),
+    ("Stumps - Day 5: Match drawn", ("", "", None, 1)),
+    ("Match drawn", ("", "", None, 1)),
+    ("Match tied", ("", "", None, 1)),
+    ("No result", ("", "", None, 1)),
+    ("Match abandoned due to rain", ("", "", None, 1)),
+    ("Match delayed due to wet outfield", ("", "", None, 0)),
+    ("", ("", "", None, 0)),
+]
+
+
+@pytest.mark.parametrize("status, expected", CASES, ids=[c[0] or "empty" for c in CASES])
+def test_parse_status(status, expected):
+    assert parse_status(status) == expected
+
+
+def test_derive_status_columns_agrees_with_parse_status():
+    statuses = pd.Series([status for status, _ in CASES] + [None])
+    derived = derive_status_columns(statuses)
+    for i, (status, _) in enumerate(CASES + [(None, None)]):
+        winner, vtype, margin, done = parse_status(status or "")
+        row = derived.iloc[i]
+        assert (row["winner"], row["victory_type"], row["is_complete"]) == (winner, vtype, done), status
+        assert (None if pd.isna(row["victory_margin"]) else int(row["victory_margin"])) == margin, status
@@ -0,0 +1,71 @@
+"""team_results / head_to_head triggers against a fresh aggregation of live_matches."""
+import random
+import sqlite3
+
+import pytest
+
+from utils.migrations import migrate
+from utils.team_results import check_team_results, rebuild_team_results
+
+TEAMS = ["India", "Australia", "England", "", None]
+
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(":memory:", isolation_level=None)
+    migrate(conn)
+    yield conn
+    conn.close()
+
+
+def _add(conn, match_id, team1, team2, winner):
+    conn.execute("INSERT INTO live_matches (match_id, team1, team2, winner) VALUES (?, ?, ?, ?)",
+                 (match_id, team1, team2, winner))
+
+
+def test_empty_team_names_and_winners_are_not_counted(conn):
+    _add(conn, "1", "", "", "")
+    _add(conn, "2", "India", "", "")
+    _add(conn, "3", "India", "Australia", "India")
+    _add(conn, "4", "Australia", "India", "")
+    assert conn.execute("SELECT * FROM team_results ORDER BY team").fetchall() == [("Australia", 2, 0), ("India", 3, 1)]
+    assert conn.execute("SELECT * FROM head_to_head").fetchall() == [("Australia", "India", 2, 0, 1)]
+    assert check_team_results(conn)["drift"] == []
+
+
+def test_updates_move_matches_and_wins(conn):
+    _add(conn, "1", "India", "England", "")
+    conn.execute("UPDATE live_matches SET winner = 'England' WHERE match_id = '1'")
+    assert conn.execute("SELECT wins_a, wins_b FROM head_to_head").fetchone() == (1, 0)
+    conn.execute("UPDATE live_matches SET team1 = '' WHERE match_id = '1'")
+    assert conn.execute("SELECT * FROM team_results").fetchall() == [("England", 1, 1)]
+    assert conn.execute("SELECT COUNT(*) FROM head_to_head").fetchone()[0] == 0
+    conn.execute("DELETE FROM live_matches")
+    assert conn.execute("SELECT COUNT(*) FROM team_results").fetchone()[0] == 0
+
+
+def test_random_changes_never_drift(conn):
+    rng = random.Random(7)
+    for step in range(400):
+        match_id = str(rng.randrange(30))
+        team1, team2 = rng.choice(TEAMS), rng.choice(TEAMS)
+        winner = rng.choice([team1, team2, "", None, "Somebody else"])
+        action = rng.random()
+        if action < 0.5:
+            conn.execute("""
+                INSERT INTO live_matches (match_id, team1, team2, winner) VALUES (?, ?, ?, ?)
+                ON CONFLICT (match_id) DO UPDATE SET team1 = excluded.team1, team2 = excluded.team2,
+                    winner = excluded.winner""", (match_id, team1, team2, winner))
+        elif action < 0.8:
+            conn.execute("UPDATE live_matches SET winner = ? WHERE match_id = ?", (winner, match_id))
+        else:
+            conn.execute("DELETE FROM live_matches WHERE match_id = ?", (match_id,))
+        assert check_team_results(conn)["drift"] == [], step
+
+
+def test_rebuild_matches_the_triggers(conn):
+    for i, (t1, t2, w) in enumerate([("India", "England", "India"), ("England", "", ""), ("Australia", "India", "")]):
+        _add(conn, str(i), t1, t2, w)
+    before = conn.execute("SELECT * FROM team_results ORDER BY team").fetchall()
+    rebuild_team_results(conn)
+    assert conn.execute("SELECT * FROM team_results ORDER BY team").fetchall() == before
@@ -0,0 +1,97 @@
+"""WriteQueue group commit: per-request SAVEPOINT isolation and resolving every Future when a group fails."""
+import sqlite3
+
+import pytest
+
+import utils.db_connection as db_connection
+from utils.write_queue import WriteQueue
+
+TIMEOUT = 10
+
+
+@pytest.fixture
+def wq(tmp_path, monkeypatch):
+    # a short busy timeout, so a locked DB fails a group quickly
+    monkeypatch.setattr(db_connection, "PRAGMAS", tuple(
+        "PRAGMA busy_timeout=200" if p.startswith("PRAGMA busy_timeout") else p for p in db_connection.PRAGMAS))
+    db_path = str(tmp_path / "wq.db")
+    q = WriteQueue(db_path, commit_window=0.2)
+    q.execute("CREATE TABLE t (x INTEGER PRIMARY KEY)").result(TIMEOUT)
+    yield q
+    q.stop()
+
+
+def _values(wq):
+    with sqlite3.connect(wq.db_path) as conn:
+        return [r[0] for r in conn.execute("SELECT x FROM t ORDER BY x")]
+
+
+def _insert_then_fail(conn):
+    conn.execute("INSERT INTO t VALUES (2)")
+    raise ValueError("bad request")
+
+
+def test_failing_request_rolls_back_only_itself(wq):
+    groups = wq.stats["groups"]
+    futs = [wq.execute("INSERT INTO t VALUES (1)"), wq.submit(_insert_then_fail), wq.execute("INSERT INTO t VALUES (3)")]
+    assert futs[0].result(TIMEOUT) == 1
+    with pytest.raises(ValueError, match="bad request"):
+        futs[1].result(TIMEOUT)
+    assert futs[2].result(TIMEOUT) == 1
+    assert wq.stats["groups"] == groups + 1       # one transaction for all three
+    assert _values(wq) == [1, 3]
+
+
+def test_constraint_error_reaches_its_caller(wq):
+    wq.execute("INSERT INTO t VALUES (1)").result(TIMEOUT)
+    dup, ok = wq.execute("INSERT INTO t VALUES (1)"), wq.execute("INSERT INTO t VALUES (4)")
+    with pytest.raises(sqlite3.IntegrityError):
+        dup.result(TIMEOUT)
+    assert ok.result(TIMEOUT) == 1
+    assert _values(wq) == [1, 4]
+
+
+def test_locked_database_fails_every_request_of_the_group(wq):
+    generation = wq.generation
+    blocker = sqlite3.connect(wq.db_path, isolation_level=None)
+    blocker.execute("BEGIN IMMEDIATE")
+    try:
+        futs = [wq.execute("INSERT INTO t VALUES (?)", (i,)) for i in range(5)]
+        for fut in futs:
+            with pytest.raises(sqlite3.OperationalError, match="locked"):
+                fut.result(TIMEOUT)
+    finally:
+        blocker.rollback()
+        blocker.close()
+    assert wq.generation == generation
+    # the writer thread survived and serves the next caller
+    assert wq.execute("INSERT INTO t VALUES (9)").result(TIMEOUT) == 1
+    assert _values(wq) == [9]
+
+
+def test_unexpected_error_does_not_kill_the_writer(wq, monkeypatch):
+    def broken(group):
+        raise RuntimeError("writer bug")
+
+    with monkeypatch.context() as m:
+        m.setattr(wq, "_run_group", broken)
+        with pytest.raises(RuntimeError, match="writer bug"):
+            wq.execute("INSERT INTO t VALUES (1)").result(TIMEOUT)
+    assert wq.execute("INSERT INTO t VALUES (2)").result(TIMEOUT) == 1
+    assert _values(wq) == [2]
+
+
+def test_cancelled_request_is_skipped(wq):
+    # the 0.2 s commit window leaves time to cancel before the group starts
+    kept = wq.execute("INSERT INTO t VALUES (5)")
+    cancelled = wq.execute("INSERT INTO t VALUES (6)")
+    assert cancelled.cancel()
+    assert kept.result(TIMEOUT) == 1
+    assert _values(wq) == [5]
+
+
+def test_generation_moves_only_after_commit(wq):
+    generation = wq.generation
+    seen = wq.submit(lambda conn: wq.generation).result(TIMEOUT)
+    assert seen == generation
+    assert wq.generation == generation + 1
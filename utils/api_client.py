@@ -0,0 +1,288 @@
+# utils/api_client.py
+"""Shared HTTP client for the Cricbuzz RapidAPI endpoints.
+
+- one keep-alive requests.Session with a connection pool per process
+- jittered exponential backoff on 429/5xx and connection errors (honours Retry-After)
+- gzip/deflate transfer compression
+- ETag / If-Modified-Since revalidation backed by an on-disk TTL cache, so an
+  unchanged payload costs a 304 (or nothing, inside the TTL) and no JSON parsing
+"""
+import hashlib
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+
+from utils.config import API_HOST, CACHE_DIR, get_api_key
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class ApiResponse:
+    """Body + metadata for one GET, whether it came from the network or the cache.
+
+    not_modified: the server answered 304 and the cached body was reused
+    from_cache:   served from the on-disk cache without touching the network
+    digest:       sha1 of the body (for a streamed 200, known once it has been read)
+
+    A body is held in memory (`body`), read from a file (`path`), or streamed
+    from the network (`stream`). A streamed body is spooled to a temp file in
+    `spool_dir` as it arrives, never kept in memory. On completion
+    `on_complete(tmp_path, digest)` may move that file (into the cache) and
+    returns where it ended up. Without on_complete the temp file is removed
+    with the response.
+    """
+
+    def __init__(self, status_code, body=None, path=None, stream=None, digest=None,
+                 not_modified=False, from_cache=False, spool_dir=None, on_complete=None):
+        self.status_code = status_code
+        self.not_modified = not_modified
+        self.from_cache = from_cache
+        self.digest = digest
+        self._body = body
+        self._path = path
+        self._stream = stream
+        self._spool_dir = spool_dir
+        self._on_complete = on_complete
+        self._temp = None
+
+    def iter_content(self, chunk_size=64 * 1024):
+        """Yield the body in chunks; a network body is streamed (and spooled) as it arrives."""
+        if self._body is not None:
+            for i in range(0, len(self._body), chunk_size):
+                yield self._body[i:i + chunk_size]
+            return
+        if self._path is not None:
+            with open(self._path, "rb") as f:
+                for chunk in iter(lambda: f.read(chunk_size), b""):
+                    yield chunk
+            return
+        h = hashlib.sha1()
+        fd, tmp = tempfile.mkstemp(dir=self._spool_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for chunk in self._stream.iter_content(chunk_size):
+                    if chunk:
+                        h.update(chunk)
+                        f.write(chunk)
+                        yield chunk
+        except BaseException:
+            # a failed or abandoned download leaves nothing behind
+            os.unlink(tmp)
+            raise
+        finally:
+            self._stream.close()
+        self.digest = h.hexdigest()
+        if self._on_complete:
+            self._path = self._on_complete(tmp, self.digest)
+        else:
+            self._path = self._temp = tmp
+
+    @property
+    def content(self):
+        if self._body is None:
+            if self._path is None:
+                for _ in self.iter_content():
+                    pass
+            with open(self._path, "rb") as f:
+                self._body = f.read()
+        return self._body
+
+    @property
+    def size(self):
+        """Body bytes; None for a streamed body that hasn't been read yet."""
+        if self._body is not None:
+            return len(self._body)
+        if self._path is not None:
+            return os.path.getsize(self._path)
+        return None
+
+    def json(self):
+        return json.loads(self.content)
+
+    def __del__(self):
+        if self._temp:
+            try:
+                os.unlink(self._temp)
+            except OSError:
+                pass
+
+
+class DiskCache:
+    """Tiny on-disk cache: <key>.json holds validators + fetch time, <key>.body the raw bytes."""
+
+    def __init__(self, cache_dir=CACHE_DIR, ttl=30):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+
+    @staticmethod
+    def key(url, params=None):
+        raw = url + "?" + json.dumps(params or {}, sort_keys=True)
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def _paths(self, key):
+        return (os.path.join(self.cache_dir, key + ".json"),
+                os.path.join(self.cache_dir, key + ".body"))
+
+    def body_path(self, key):
+        return self._paths(key)[1]
+
+    def load_meta(self, key):
+        """Validators + fetch time for `key`, or None unless both files are there."""
+        meta_path, body_path = self._paths(key)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return meta if os.path.exists(body_path) else None
+
+    def is_fresh(self, meta):
+        return meta is not None and time.time() - meta.get("fetched_at", 0) < self.ttl
+
+    def spool_dir(self):
+        """Where a streamed body is written before store(body_file=...) renames it into place."""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        return self.cache_dir
+
+    def _write(self, path, data):
+        # write-then-rename so readers in other processes never see a partial file
+        fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    def store(self, key, meta, body=None, body_file=None):
+        """Save meta, plus the body as bytes or as a finished file in spool_dir() (moved, not copied)."""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        meta_path, body_path = self._paths(key)
+        if body is not None:
+            self._write(body_path, body)
+        elif body_file is not None:
+            os.replace(body_file, body_path)
+        self._write(meta_path, json.dumps(meta).encode("utf-8"))
+
+
+class CricbuzzClient:
+    """Pooled, retrying, cache-revalidating GET client for RapidAPI."""
+
+    def __init__(self, api_key=None, pool_size=4, timeout=20, max_retries=4,
+                 backoff_base=0.5, backoff_cap=30.0, cache_dir=CACHE_DIR, cache_ttl=30):
+        self.api_key = api_key
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.cache = DiskCache(cache_dir, cache_ttl)
+        # requests is imported on first client, not by every module that imports this one
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            "x-rapidapi-host": API_HOST,
+            "Accept": "application/json",
+            "Accept-Encoding": "gzip, deflate",
+        })
+        if api_key:
+            self.session.headers["x-rapidapi-key"] = api_key
+
+    def _backoff(self, attempt, retry_after=None):
+        if retry_after:
+            try:
+                return min(self.backoff_cap, float(retry_after))
+            except ValueError:
+                pass
+        # "full jitter": uniform over [0, base * 2^attempt], capped
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * (2 ** attempt)))
+
+    def _request(self, url, params, headers, stream):
+        import requests
+
+        attempt = 0
+        while True:
+            try:
+                r = self.session.get(url, params=params, headers=headers,
+                                     timeout=self.timeout, stream=stream)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt >= self.max_retries:
+                    raise
+                time.sleep(self._backoff(attempt))
+                attempt += 1
+                continue
+            if r.status_code in RETRY_STATUSES and attempt < self.max_retries:
+                retry_after = r.headers.get("Retry-After")
+                r.close()
+                time.sleep(self._backoff(attempt, retry_after))
+                attempt += 1
+                continue
+            return r
+
+    def get(self, url, params=None, use_cache=True, stream=False):
+        """GET `url`; serves fresh cache hits locally and revalidates stale ones.
+
+        With stream=True a 200 body is read lazily through ApiResponse.iter_content().
+        """
+        key = self.cache.key(url, params)
+        meta = self.cache.load_meta(key) if use_cache else None
+        if self.cache.is_fresh(meta):
+            return ApiResponse(200, path=self.cache.body_path(key), digest=meta.get("digest"), from_cache=True)
+
+        headers = {}
+        if meta is not None:
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+
+        import requests
+
+        r = self._request(url, params, headers, stream)
+        if r.status_code == 304 and meta is not None:
+            r.close()
+            meta["fetched_at"] = time.time()
+            self.cache.store(key, meta)
+            return ApiResponse(200, path=self.cache.body_path(key), digest=meta.get("digest"), not_modified=True)
+        try:
+            r.raise_for_status()
+        except requests.HTTPError:
+            r.close()
+            raise
+
+        new_meta = {
+            "url": url,
+            "etag": r.headers.get("ETag"),
+            "last_modified": r.headers.get("Last-Modified"),
+        }
+
+        if stream:
+            if not use_cache:
+                return ApiResponse(r.status_code, stream=r)
+
+            def save(body_file, digest):
+                self.cache.store(key, dict(new_meta, fetched_at=time.time(), digest=digest), body_file=body_file)
+                return self.cache.body_path(key)
+
+            return ApiResponse(r.status_code, stream=r, spool_dir=self.cache.spool_dir(), on_complete=save)
+        data = r.content
+        digest = hashlib.sha1(data).hexdigest()
+        if use_cache:
+            self.cache.store(key, dict(new_meta, fetched_at=time.time(), digest=digest), data)
+        return ApiResponse(r.status_code, body=data, digest=digest)
+
+
+_client = None
+_client_lock = threading.Lock()
+
+def get_client(api_key=None):
+    """Process-wide client so every caller shares one connection pool."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = CricbuzzClient(api_key=api_key or get_api_key())
+        return _client
@@ -0,0 +1,77 @@
+# utils/capture.py
+"""Capture files: recorded LIVE_URL responses with their timing, for offline replay.
+
+A capture is gzip-compressed JSON Lines: one header line, then one line per response
+
+    {"t": 12.503, "status": 200, "latency_ms": 183.2, "headers": {"ETag": ...}, "body": "..."}
+
+where t is seconds since the recording started. scripts/record_live.py writes
+them and scripts/replay_server.py serves them back; a plain .json payload (e.g.
+the fixtures) reads as a one-response capture.
+"""
+import gzip
+import json
+import time
+from datetime import datetime
+
+FORMAT = "cricbuzz-capture/1"
+KEPT_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Retry-After")
+
+
+class CaptureWriter:
+    """Appends responses to a capture; flushed per response so an interrupted recording stays readable."""
+
+    def __init__(self, path, url):
+        self.path = path
+        self.count = 0
+        self._started = time.monotonic()
+        self._f = gzip.open(path, "wt", encoding="utf-8")
+        self._write({"format": FORMAT, "url": url,
+                     "recorded_at": datetime.utcnow().isoformat(timespec="seconds") + "Z"})
+
+    def _write(self, obj):
+        self._f.write(json.dumps(obj, separators=(",", ":")) + "\n")
+        self._f.flush()
+
+    def add(self, status, body, headers=None, latency_ms=None):
+        headers = headers or {}
+        self._write({
+            "t": round(time.monotonic() - self._started, 3),
+            "status": status,
+            "latency_ms": None if latency_ms is None else round(latency_ms, 1),
+            "headers": {k: headers[k] for k in KEPT_HEADERS if headers.get(k)},
+            "body": body.decode("utf-8", errors="replace"),
+        })
+        self.count += 1
+
+    def close(self):
+        self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_capture(path):
+    """(header, frames) for a capture file; each frame's body is bytes."""
+    if path.endswith(".json"):
+        with open(path, "rb") as f:
+            body = f.read()
+        return {"format": FORMAT, "url": None, "source": path}, [
+            {"t": 0.0, "status": 200, "latency_ms": None,
+             "headers": {"Content-Type": "application/json"}, "body": body}]
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        header = json.loads(f.readline())
+        if header.get("format") != FORMAT:
+            raise ValueError(f"{path}: not a {FORMAT} capture")
+        frames = []
+        for line in f:
+            if line.strip():
+                frame = json.loads(line)
+                frame["body"] = frame["body"].encode("utf-8")
+                frames.append(frame)
+    if not frames:
+        raise ValueError(f"{path}: capture has no responses")
+    return header, frames
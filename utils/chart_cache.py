@@ -0,0 +1,145 @@
+# utils/chart_cache.py
+"""Rendered-chart cache shared by every session of the process.
+
+A chart is rendered once per (spec, data version) and the result kept as
+bytes: PNG/SVG for matplotlib, the figure JSON for plotly. Reruns and other
+sessions get the bytes back without building a figure at all, and since
+st.image() stores media under a hash of its content, every session serves
+the same file.
+
+matplotlib figures are built with the object-oriented Figure API rather than
+pyplot, so nothing is registered in pyplot's global figure list, and each one
+is cleared and dropped as soon as it's saved: resident memory holds only the
+cached bytes, bounded by entry count and a byte budget (least recently used
+first).
+
+    from utils.chart_cache import bar_chart_png
+    st.image(bar_chart_png(df, x="Player", y="Runs", title="Runs", color="orange"))
+
+The data version defaults to a digest of the plotted values; pass version=
+(e.g. QueryCache.data_version()) to skip hashing large frames.
+"""
+import hashlib
+import io
+import threading
+from collections import OrderedDict
+
+MAX_ENTRIES = 128
+MAX_BYTES = 32 * 1024 * 1024
+DPI = 100
+
+
+def data_version(df):
+    """Digest of a DataFrame's columns and values."""
+    import pandas as pd
+
+    h = hashlib.blake2b(digest_size=16)
+    h.update(repr(list(df.columns)).encode())
+    h.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    return h.hexdigest()
+
+
+class ChartCache:
+    def __init__(self, max_entries=MAX_ENTRIES, max_bytes=MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+        self._entries = OrderedDict()   # (spec, version) -> bytes / str
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._render_lock = threading.Lock()
+
+    def _lookup(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+            return value
+
+    def fetch(self, spec, version, render):
+        """Cached output for (spec, version), calling render() on a miss.
+
+        Renders are serialized (matplotlib isn't thread-safe), so sessions that
+        miss on the same chart at once wait for the first one's result.
+        """
+        key = (spec, version)
+        value = self._lookup(key)
+        if value is not None:
+            return value
+        with self._render_lock:
+            value = self._lookup(key)
+            if value is not None:
+                return value
+            value = render()
+        size = len(value)
+        with self._lock:
+            self.stats["misses"] += 1
+            if size <= self.max_bytes:
+                self._entries[key] = value
+                self._bytes += size
+                while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                    _, old = self._entries.popitem(last=False)
+                    self._bytes -= len(old)
+                    self.stats["evictions"] += 1
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def report(self):
+        with self._lock:
+            total = self.stats["hits"] + self.stats["misses"]
+            return dict(self.stats, entries=len(self._entries), bytes=self._bytes,
+                        hit_rate=round(self.stats["hits"] / total, 3) if total else None)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_chart_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ChartCache()
+        return _cache
+
+
+def render_matplotlib(draw, fmt="png", figsize=(6.4, 4.8), dpi=DPI):
+    """Bytes of a figure drawn by draw(fig, ax); the figure is released before returning."""
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=figsize, dpi=dpi)
+    try:
+        ax = fig.subplots()
+        draw(fig, ax)
+        buf = io.BytesIO()
+        fig.savefig(buf, format=fmt, bbox_inches="tight")
+        return buf.getvalue()
+    finally:
+        fig.clear()
+        del fig
+
+
+def matplotlib_chart(spec, draw, version, fmt="png", figsize=(6.4, 4.8), dpi=DPI):
+    """Cached render_matplotlib(); `spec` must identify everything draw() depends on besides the data."""
+    return get_chart_cache().fetch(
+        ("matplotlib", spec, fmt, figsize, dpi), version, lambda: render_matplotlib(draw, fmt, figsize, dpi))
+
+
+def plotly_chart_json(spec, build, version):
+    """Cached JSON of the plotly figure returned by build(); plotly.io.from_json() turns it back."""
+    return get_chart_cache().fetch(("plotly", spec), version, lambda: build().to_json())
+
+
+def bar_chart_png(df, x, y, title="", ylabel=None, color=None, version=None):
+    """PNG bytes of a bar chart of df[y] by df[x] (the pandas .plot(kind="bar") look)."""
+    def draw(fig, ax):
+        df.plot(x=x, y=y, kind="bar", ax=ax, legend=False, color=color)
+        ax.set_ylabel(ylabel or y)
+        ax.set_title(title)
+
+    spec = ("bar", x, y, title, ylabel, color)
+    return matplotlib_chart(spec, draw, version or data_version(df[[x, y]]))
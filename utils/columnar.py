@@ -0,0 +1,253 @@
+# utils/columnar.py
+"""Partitioned columnar snapshots of live_matches / match_state_history, and a memory-mapped reader.
+
+    <COLUMNAR_DIR>/live_matches/year=2025/part-0.parquet               (by start_ts year)
+    <COLUMNAR_DIR>/match_state_history/day=2025-10-17/part-0.parquet   (by transition day)
+
+export_incremental() rewrites only the partitions that hold rows stamped after
+the last export's watermark (updated_at / ts, both seeks on an index), plus,
+for live_matches, the partitions rows were deleted from or moved out of since
+then (live_matches_tombstones, migration 4). A poll that changes a few
+matches rewrites the current year's file, and nothing is aggregated over the
+whole table. The watermark is held WRITE_LAG_S behind the clock, so a row
+stamped just before an export but committed after it is still picked up.
+Writers that stamp rows with past times (scripts/archive.py reindex, the
+synthetic generator) need a --full export; reindex runs one. Partitioning
+stays a few directories deep: a year holds every series, sorted by
+series_name, start_ts and written in row groups of ROW_GROUP_ROWS, so Parquet
+row-group statistics skip the other series when a scan filters on
+series_name (one directory per series made whole-table scans open thousands
+of tiny files). History files are sorted by match and time. The poller runs
+the export after every ingest that changed something.
+
+scan() / read_frame() open the files memory-mapped through pyarrow.dataset and
+push the column projection and filters down (partition directories that can't
+match are never opened), so a large scan skips SQLite's row-by-row decoding:
+
+    from utils.columnar import read_frame
+    df = read_frame("live_matches", columns=["match_id", "status"],
+                    filters=[("year", ">=", "2024"), ("series_name", "=", "Asia Cup 2025")])
+
+Partition values are URI-encoded in directory names and decoded again by the
+reader. pyarrow is listed in requirements.txt; without it export_incremental()
+does nothing and the readers raise ImportError.
+format="arrow" writes uncompressed Arrow IPC files instead of Parquet, which
+map with no decoding at all at the cost of disk.
+"""
+import json
+import os
+import shutil
+from datetime import datetime
+from urllib.parse import quote
+
+from utils.config import COLUMNAR_DIR
+from utils.migrations import LIVE_MATCHES_COLUMNS
+
+DEFAULT_FORMAT = "parquet"
+LAYOUT = 3                # directory layout version; an export in an older one is redone in full
+STATE_FILE = "_state.json"
+EXTENSIONS = {"parquet": "parquet", "arrow": "arrow"}
+UNKNOWN = "unknown"       # partition value for rows without a series / date
+WRITE_LAG_S = 5           # a row is committed at most this long after its updated_at / ts stamp
+ROW_GROUP_ROWS = 8192     # Parquet row group / Arrow batch size: the unit statistics prune
+
+_YEAR = f"IFNULL(strftime('%Y', start_ts / 1000, 'unixepoch'), '{UNKNOWN}')"
+_DAY = "strftime('%Y-%m-%d', ts, 'unixepoch')"
+# rows of one year partition, both a range on idx_live_matches_sort
+_YEAR_ROWS = {
+    False: """COALESCE(start_ts, 0) >= CAST(strftime('%s', :year || '-01-01') AS INTEGER) * 1000
+              AND COALESCE(start_ts, 0) < CAST(strftime('%s', :year || '-01-01', '+1 year') AS INTEGER) * 1000
+              AND start_ts IS NOT NULL""",
+    True: "COALESCE(start_ts, 0) = 0 AND start_ts IS NULL",
+}
+
+DATASETS = {
+    "live_matches": {
+        "partitions": ("year",),
+        "all": f"SELECT DISTINCT {_YEAR} FROM live_matches",
+        "watermark": f"""
+            SELECT MIN(IFNULL((SELECT MAX(updated_at) FROM live_matches), ''),
+                       strftime('%Y-%m-%dT%H:%M:%SZ', 'now', '-{WRITE_LAG_S} seconds')) AS mark,
+                   (SELECT IFNULL(MAX(seq), 0) FROM live_matches_tombstones) AS seq""",
+        "touched": f"""
+            SELECT DISTINCT {_YEAR} FROM live_matches WHERE updated_at > :mark
+            UNION SELECT {_YEAR} FROM live_matches_tombstones WHERE seq > :seq""",
+        # highest tombstone seq already pruned (utils/etl.py); an export older than that missed some
+        "pruned": """
+            SELECT IFNULL((SELECT MIN(seq) - 1 FROM live_matches_tombstones),
+                          (SELECT seq FROM sqlite_sequence WHERE name = 'live_matches_tombstones'))""",
+        "rows": f"""
+            SELECT {", ".join(name for name, _ in LIVE_MATCHES_COLUMNS)}
+            FROM live_matches WHERE {{year}}
+            ORDER BY series_name, start_ts, match_id""",
+        "columns": [(name, "int64" if decl.startswith("INTEGER") else "string")
+                    for name, decl in LIVE_MATCHES_COLUMNS],
+    },
+    "match_state_history": {
+        "partitions": ("day",),
+        "all": f"SELECT DISTINCT {_DAY} FROM match_state_history",
+        "watermark": f"""
+            SELECT MIN(IFNULL((SELECT MAX(ts) FROM match_state_history), 0),
+                       CAST(strftime('%s', 'now') AS INTEGER) - {WRITE_LAG_S}) AS mark""",
+        # append-only: an index range scan on idx_match_state_history_ts
+        "touched": f"SELECT DISTINCT {_DAY} FROM match_state_history WHERE ts > :mark",
+        "rows": """
+            SELECT h.match_id, h.ts, s.status, h.is_complete
+            FROM match_state_history h JOIN status_strings s ON s.status_id = h.status_id
+            WHERE h.ts >= CAST(strftime('%s', :day) AS INTEGER) AND h.ts < CAST(strftime('%s', :day, '+1 day') AS INTEGER)
+            ORDER BY h.match_id, h.ts, h.seq""",
+        "columns": [("match_id", "string"), ("ts", "int64"), ("status", "string"), ("is_complete", "int64")],
+    },
+}
+
+
+def _pyarrow():
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+    return pa, ds, pq
+
+
+def have_pyarrow():
+    try:
+        _pyarrow()
+    except ImportError:
+        return False
+    return True
+
+
+def _load_state(export_dir):
+    try:
+        with open(os.path.join(export_dir, STATE_FILE)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_state(export_dir, state):
+    path = os.path.join(export_dir, STATE_FILE)
+    with open(path + ".tmp", "w") as f:
+        json.dump(state, f, indent=1, sort_keys=True)
+    os.replace(path + ".tmp", path)
+
+
+def _schema(pa, name):
+    return pa.schema([(col, getattr(pa, typ)()) for col, typ in DATASETS[name]["columns"]])
+
+
+def _partition_dir(export_dir, name, key):
+    return os.path.join(export_dir, name, *(f"{col}={quote(str(value), safe='')}"
+                                            for col, value in zip(DATASETS[name]["partitions"], key)))
+
+
+def _remove_partition(export_dir, name, key):
+    part_dir = _partition_dir(export_dir, name, key)
+    shutil.rmtree(part_dir, ignore_errors=True)
+
+
+def _write_partition(conn, name, key, export_dir, fmt):
+    """Rewrite one partition from SQLite; an empty one is removed. Returns the rows written."""
+    pa, _, pq = _pyarrow()
+    spec = DATASETS[name]
+    params = dict(zip(spec["partitions"], key))
+    sql = spec["rows"].format(year=_YEAR_ROWS[params.get("year") == UNKNOWN])
+    rows = conn.execute(sql, params).fetchall()
+    if not rows:
+        _remove_partition(export_dir, name, key)
+        return 0
+    schema = _schema(pa, name)
+    table = pa.Table.from_arrays(
+        [pa.array([r[i] for r in rows], type=schema.field(i).type) for i in range(len(schema))], schema=schema)
+    part_dir = _partition_dir(export_dir, name, key)
+    os.makedirs(part_dir, exist_ok=True)
+    path = os.path.join(part_dir, f"part-0.{EXTENSIONS[fmt]}")
+    # write-then-rename so a reader never maps a half-written file (dataset
+    # discovery skips dot-files, so the temp file is never picked up either)
+    tmp = os.path.join(part_dir, f".part-0.{EXTENSIONS[fmt]}.tmp")
+    if fmt == "parquet":
+        pq.write_table(table, tmp, compression="zstd", row_group_size=ROW_GROUP_ROWS)
+    else:
+        with pa.OSFile(tmp, "wb") as sink, pa.ipc.new_file(sink, schema) as writer:
+            writer.write_table(table, max_chunksize=ROW_GROUP_ROWS)
+    os.replace(tmp, path)
+    return len(rows)
+
+
+def export_incremental(conn, export_dir=COLUMNAR_DIR, fmt=DEFAULT_FORMAT, full=False):
+    """Bring the snapshots in `export_dir` up to date; returns partitions/rows written per dataset.
+
+    Returns None when pyarrow isn't installed.
+    """
+    if not have_pyarrow():
+        return None
+    state = _load_state(export_dir)
+    if state.get("format") != fmt or state.get("layout") != LAYOUT:
+        full = True
+    if full:
+        state = {"format": fmt, "layout": LAYOUT, "watermarks": {}}
+    os.makedirs(export_dir, exist_ok=True)
+    # watermarks and partition rows from one read snapshot
+    own_txn = not conn.in_transaction
+    if own_txn:
+        conn.execute("BEGIN")
+    try:
+        result = {}
+        for name, spec in DATASETS.items():
+            cur = conn.execute(spec["watermark"])
+            mark = dict(zip([d[0] for d in cur.description], cur.fetchone()))
+            last = state["watermarks"].get(name)
+            redo = last is None or ("pruned" in spec and (conn.execute(spec["pruned"]).fetchone()[0] or 0) > last["seq"])
+            if redo:
+                shutil.rmtree(os.path.join(export_dir, name), ignore_errors=True)
+                keys = conn.execute(spec["all"]).fetchall()
+            else:
+                keys = conn.execute(spec["touched"], last).fetchall()
+            written = rows = removed = 0
+            for key in keys:
+                n = _write_partition(conn, name, key, export_dir, fmt)
+                rows += n
+                written += n > 0
+                removed += n == 0
+            state["watermarks"][name] = mark
+            result[name] = {"partitions": written, "rows": rows, "removed": removed}
+    finally:
+        if own_txn:
+            conn.rollback()
+    state["exported_at"] = datetime.utcnow().isoformat(timespec="seconds") + "Z"
+    _save_state(export_dir, state)
+    return result
+
+
+def open_dataset(name, export_dir=COLUMNAR_DIR):
+    """pyarrow Dataset over one exported table, files memory-mapped, hive partition column included."""
+    pa, ds, _ = _pyarrow()
+    from pyarrow import fs
+
+    if name not in DATASETS:
+        raise KeyError(f"unknown dataset {name!r} (expected one of {', '.join(DATASETS)})")
+    fmt = _load_state(export_dir).get("format", DEFAULT_FORMAT)
+    root = os.path.join(export_dir, name)
+    if not os.path.isdir(root):
+        raise FileNotFoundError(f"no {name} snapshot in {export_dir}; run scripts/export_columnar.py")
+    partitioning = ds.partitioning(pa.schema([(col, pa.string()) for col in DATASETS[name]["partitions"]]),
+                                   flavor="hive")
+    return ds.dataset(root, format="ipc" if fmt == "arrow" else "parquet", partitioning=partitioning,
+                      filesystem=fs.LocalFileSystem(use_mmap=True))
+
+
+def _expression(filters):
+    """A pyarrow expression from one, or DNF-style [(col, op, value), ...] tuples (ANDed)."""
+    if filters is None or not isinstance(filters, (list, tuple)):
+        return filters
+    _, _, pq = _pyarrow()
+    return pq.filters_to_expression(filters)
+
+
+def scan(name, columns=None, filters=None, export_dir=COLUMNAR_DIR):
+    """Read `columns` of the rows matching `filters` as a pyarrow Table."""
+    return open_dataset(name, export_dir).to_table(columns=columns, filter=_expression(filters))
+
+
+def read_frame(name, columns=None, filters=None, export_dir=COLUMNAR_DIR):
+    """scan() as a pandas DataFrame."""
+    return scan(name, columns, filters, export_dir).to_pandas()
@@ -1,4 +1,26 @@
-import streamlit as st
+import os
 
+# Shared SQLite file used by every page and the background ingest worker
+# (CRICBUZZ_DB points the whole app at another file, e.g. a generated benchmark DB)
+DB_PATH = os.path.abspath(os.environ.get("CRICBUZZ_DB", "cricbuzz.db"))
+# Compressed archive of every raw live-feed payload (utils/payload_archive.py)
+ARCHIVE_PATH = os.path.abspath(os.environ.get("CRICBUZZ_ARCHIVE", os.path.splitext(DB_PATH)[0] + "_archive.db"))
+# Partitioned Parquet/Arrow snapshots for analytics (utils/columnar.py)
+COLUMNAR_DIR = os.path.abspath(os.environ.get("CRICBUZZ_COLUMNAR", os.path.splitext(DB_PATH)[0] + "_columnar"))
+# On-disk HTTP response cache (ETag/Last-Modified + body) for the API client
+CACHE_DIR = os.path.abspath(os.path.join(".cache", "cricbuzz_api"))
+
+API_HOST = "cricbuzz-cricket.p.rapidapi.com"
+# CRICBUZZ_LIVE_URL points the poller at a local stand-in (load tests, replayed captures)
+LIVE_URL = os.environ.get("CRICBUZZ_LIVE_URL", f"https://{API_HOST}/matches/v1/live")
+
+# streamlit is imported only where secrets are read: every utils module imports
+# this one, and scripts / worker processes shouldn't pay for it at startup
 def get_api_key():
-    return st.secrets.get("RAPIDAPI_KEY", "")
\ No newline at end of file
+    import streamlit as st
+    return st.secrets.get("RAPIDAPI_KEY", "")
+
+def get_monthly_quota(default=200):
+    """Requests per month allowed by the RapidAPI plan (free Basic plan by default)."""
+    import streamlit as st
+    return int(st.secrets.get("RAPIDAPI_MONTHLY_QUOTA", default))
@@ -1,20 +1,157 @@
 # utils/db_connection.py
-from sqlalchemy import create_engine, text
+"""Process-wide SQLite access for every page, the poller and the scripts.
+
+Connections are opened once per process and reused across Streamlit reruns:
+a small pool of read-only reader connections plus a single writer guarded by
+a lock. PRAGMAs are applied once when a connection is created, and each
+connection keeps a cache of prepared statements (keyed by SQL text), so
+a page rerun only pays for executing its queries.
+
+    from utils.db_connection import read_conn, write_conn
+
+    with read_conn() as conn:
+        rows = conn.execute("SELECT ...").fetchall()
+    with write_conn() as conn:          # commits on success, rolls back on error
+        conn.execute("UPDATE ...")
+"""
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+from utils.config import DB_PATH
+from utils.migrations import ensure_schema
+
+DATABASE_URL = f"sqlite:///{DB_PATH}"
+
+READ_POOL_SIZE = 4
+STATEMENT_CACHE = 256                  # prepared statements kept per connection
+PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",       # safe with WAL, one fsync per checkpoint instead of per commit
+    "PRAGMA mmap_size=268435456",      # 256 MB of the file read through the page cache, no copies
+    "PRAGMA cache_size=-16000",        # ~16 MB page cache per connection
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA temp_store=MEMORY",
+)
+
+
+_statement_trace = None
+
+
+def set_statement_trace(callback):
+    """Call `callback(sql)` for every statement on connections opened after this (load tests)."""
+    global _statement_trace
+    _statement_trace = callback
+
+
+def _connect(db_path, read_only=False):
+    conn = sqlite3.connect(db_path, check_same_thread=False, cached_statements=STATEMENT_CACHE)
+    for pragma in PRAGMAS:
+        conn.execute(pragma)
+    if _statement_trace is not None:
+        conn.set_trace_callback(_statement_trace)
+    if read_only:
+        conn.execute("PRAGMA query_only=ON")
+    return conn
+
+
+class ConnectionPool:
+    """Reader pool + single writer for one SQLite file."""
+
+    def __init__(self, db_path=DB_PATH, readers=READ_POOL_SIZE):
+        self.db_path = db_path
+        ensure_schema(db_path)
+        # WAL is persistent in the file; setting it once lets readers and the writer overlap
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+        self._readers = queue.LifoQueue()
+        self._max_readers = readers
+        self._opened = 0
+        self._open_lock = threading.Lock()
+        self._writer = None
+        self._write_lock = threading.RLock()
+
+    def _get_reader(self):
+        try:
+            return self._readers.get_nowait()
+        except queue.Empty:
+            pass
+        with self._open_lock:
+            if self._opened < self._max_readers:
+                self._opened += 1
+                return _connect(self.db_path, read_only=True)
+        return self._readers.get()   # all readers busy: wait for one to come back
+
+    @contextmanager
+    def read(self):
+        conn = self._get_reader()
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            self._readers.put(conn)
+
+    @contextmanager
+    def write(self):
+        with self._write_lock:
+            if self._writer is None:
+                self._writer = _connect(self.db_path)
+            conn = self._writer
+            try:
+                yield conn
+                if conn.in_transaction:
+                    conn.commit()
+            except Exception:
+                if conn.in_transaction:
+                    conn.rollback()
+                raise
+
+    def close(self):
+        with self._write_lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+        while True:
+            try:
+                self._readers.get_nowait().close()
+            except queue.Empty:
+                break
+        self._opened = 0
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+def get_pool(db_path=DB_PATH):
+    """The shared pool for `db_path` (created, and the schema migrated, on first use)."""
+    pool = _pools.get(db_path)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(db_path)
+            if pool is None:
+                pool = _pools[db_path] = ConnectionPool(db_path)
+    return pool
+
+def read_conn(db_path=DB_PATH):
+    return get_pool(db_path).read()
+
+def write_conn(db_path=DB_PATH):
+    return get_pool(db_path).write()
 
-# SQLite database file will be created in project folder
-DATABASE_URL = "sqlite:///cricket.db"
 
 def get_engine(echo: bool = False):
+    """SQLAlchemy engine on the same DB file (used by pandas.to_sql in scripts)."""
+    from sqlalchemy import create_engine  # only the scripts need SQLAlchemy
     return create_engine(DATABASE_URL, echo=echo, future=True)
 
 def test_connection():
-    engine = get_engine()
     try:
-        with engine.connect() as conn:
-            conn.execute(text("SELECT 1"))
+        with read_conn() as conn:
+            conn.execute("SELECT 1")
         print("✅ Database connection successful")
     except Exception as e:
         print("❌ Database connection failed:", e)
 
 if __name__ == "__main__":
-    test_connection()
\ No newline at end of file
+    test_connection()
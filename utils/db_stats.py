@@ -0,0 +1,69 @@
+# utils/db_stats.py
+"""One-row summary of live_matches for the home page, kept current by triggers.
+
+db_stats (a single row, id = 1) holds the match count, how many are live
+(not complete) and complete, MAX(updated_at), a change counter and the wall
+clock of the last change; db_stats_formats holds the match count per
+match_format ('' when unknown). Triggers on live_matches (migration 7) adjust
+both on every insert, update and delete, so the home page reads one row plus
+a handful of format rows instead of scanning the table on every rerun.
+
+`changes` only moves when live_matches does, which makes it a cheap freshness
+check: compare it with the value read last time.
+
+rebuild_db_stats() recomputes everything from live_matches (after a bulk load
+with the triggers dropped); check_db_stats() reports any drift.
+"""
+
+STATS_SQL = """
+SELECT matches, live, complete, last_updated_at, changes, changed_at
+FROM db_stats WHERE id = 1
+"""
+
+FORMATS_SQL = "SELECT match_format, matches FROM db_stats_formats ORDER BY matches DESC, match_format"
+
+_EXPECTED_SQL = """
+SELECT COUNT(*), IFNULL(SUM(IFNULL(is_complete, 0) = 0), 0), IFNULL(SUM(IFNULL(is_complete = 1, 0)), 0),
+       MAX(updated_at)
+FROM live_matches
+"""
+
+_EXPECTED_FORMATS_SQL = """
+SELECT IFNULL(match_format, ''), COUNT(*) FROM live_matches GROUP BY 1
+"""
+
+
+def rebuild_db_stats(conn):
+    """Recompute db_stats and db_stats_formats from live_matches. The caller owns the transaction."""
+    matches, live, complete, last = conn.execute(_EXPECTED_SQL).fetchone()
+    conn.execute("""
+        INSERT INTO db_stats (id, matches, live, complete, last_updated_at, changes, changed_at)
+        VALUES (1, ?, ?, ?, ?, 0, strftime('%Y-%m-%dT%H:%M:%SZ', 'now'))
+        ON CONFLICT (id) DO UPDATE SET matches = excluded.matches, live = excluded.live,
+            complete = excluded.complete, last_updated_at = excluded.last_updated_at,
+            changes = changes + 1, changed_at = excluded.changed_at
+    """, (matches, live, complete, last))
+    conn.execute("DELETE FROM db_stats_formats")
+    conn.execute(f"INSERT INTO db_stats_formats (match_format, matches) {_EXPECTED_FORMATS_SQL}")
+    return matches
+
+
+def read_db_stats(conn):
+    """The summary row as a dict, with "formats" {match_format: matches}; None before migration 7."""
+    row = conn.execute(STATS_SQL).fetchone()
+    if row is None:
+        return None
+    stats = dict(zip(("matches", "live", "complete", "last_updated_at", "changes", "changed_at"), row))
+    stats["formats"] = {fmt or "unknown": n for fmt, n in conn.execute(FORMATS_SQL)}
+    return stats
+
+
+def check_db_stats(conn):
+    """[(field, expected, actual)] where the stored summary differs from a fresh aggregation."""
+    expected = dict(zip(("matches", "live", "complete", "last_updated_at"), conn.execute(_EXPECTED_SQL).fetchone()))
+    actual = read_db_stats(conn) or {}
+    drift = [(k, v, actual.get(k)) for k, v in expected.items() if actual.get(k) != v]
+    formats = {fmt or "unknown": n for fmt, n in conn.execute(_EXPECTED_FORMATS_SQL)}
+    if formats != actual.get("formats"):
+        drift.append(("formats", formats, actual.get("formats")))
+    return drift
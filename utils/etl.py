@@ -0,0 +1,367 @@
+# utils/etl.py
+"""ETL from the ingested feed into the normalized tables the SQL Queries templates use.
+
+Source                      -> target
+live_matches                -> series, teams, venues, matches (surrogate integer keys)
+player_stats (Batsman rows) -> players, player_innings
+player_stats (Bowler rows)  -> players, bowling_figures
+facts                       -> player_career_stats (per player and format)
+player_career_stats         -> leaderboards (top-N per format, utils/leaderboards.py)
+
+load_incremental() only reads live_matches rows whose updated_at is at or after
+the stored watermark, skips those whose content hash matches what was loaded
+last time, and re-derives facts/career stats only for the matches and players
+those rows touch. Deleted rows are found through live_matches_tombstones
+(migration 4) rather than by comparing every match. full=True reloads
+everything. partnerships and player_fielding have no source in the free feed;
+they're filled by scripts/generate_dataset.py.
+
+The caller owns the transaction (run it through the write queue, or commit after).
+"""
+import re
+from datetime import datetime
+
+from utils.leaderboards import update_leaderboards
+from utils.live_feed import content_hash
+
+ETL_NAME = "live_matches"
+CHUNK = 500
+TOMBSTONE_TTL_DAYS = 30   # consumed live_matches_tombstones are kept this long
+
+FORMATS = {"TEST": "Test", "ODI": "ODI", "T20": "T20I", "T20I": "T20I"}
+TOSS_RE = re.compile(r"^(?P<team>.+?)\s+opt(?:ed)?\s+to\s+(?P<decision>bat|bowl)\b", re.IGNORECASE)
+
+_SOURCE_SQL = """
+SELECT match_id, series_name, team1, team2, status, match_desc, start_ts,
+       venue_name, venue_city, venue_country, match_format,
+       winner, victory_type, victory_margin, is_complete, updated_at
+FROM live_matches
+"""
+
+_MATCH_UPSERT = """
+INSERT INTO matches (cb_match_id, series_id, team1_id, team2_id, venue_id, match_desc, match_date,
+                     format, match_status, winner_team_id, result_type, result_margin,
+                     toss_winner_id, toss_decision, source_hash)
+VALUES (:cb_match_id, :series_id, :team1_id, :team2_id, :venue_id, :match_desc, :match_date,
+        :format, :match_status, :winner_team_id, :result_type, :result_margin,
+        :toss_winner_id, :toss_decision, :source_hash)
+ON CONFLICT (cb_match_id) DO UPDATE SET
+  series_id=excluded.series_id, team1_id=excluded.team1_id, team2_id=excluded.team2_id,
+  venue_id=excluded.venue_id, match_desc=excluded.match_desc, match_date=excluded.match_date,
+  format=excluded.format, match_status=excluded.match_status, winner_team_id=excluded.winner_team_id,
+  result_type=excluded.result_type, result_margin=excluded.result_margin,
+  -- the toss only shows in the status until play starts; keep what we saw
+  toss_winner_id=COALESCE(excluded.toss_winner_id, matches.toss_winner_id),
+  toss_decision=COALESCE(excluded.toss_decision, matches.toss_decision),
+  source_hash=excluded.source_hash
+"""
+
+_CAREER_SQL = """
+INSERT INTO player_career_stats (player_id, format, matches, innings, total_runs, batting_average,
+                                 strike_rate, centuries, half_centuries, total_wickets,
+                                 bowling_average, economy)
+WITH bat AS (
+    SELECT player_id, format, COUNT(DISTINCT match_id) AS matches, COUNT(*) AS innings,
+           SUM(runs) AS runs, SUM(balls) AS balls, SUM(not_out) AS not_outs,
+           SUM(runs >= 100) AS hundreds, SUM(runs >= 50 AND runs < 100) AS fifties
+    FROM player_innings {where}
+    GROUP BY player_id, format
+), bowl AS (
+    SELECT player_id, format, COUNT(DISTINCT match_id) AS matches, SUM(wickets) AS wickets,
+           SUM(runs_conceded) AS conceded, SUM(overs) AS overs
+    FROM bowling_figures {where}
+    GROUP BY player_id, format
+), k AS (
+    SELECT player_id, format FROM bat UNION SELECT player_id, format FROM bowl
+)
+SELECT k.player_id, k.format,
+       MAX(IFNULL(bat.matches, 0), IFNULL(bowl.matches, 0)),
+       IFNULL(bat.innings, 0),
+       IFNULL(bat.runs, 0),
+       ROUND(bat.runs * 1.0 / NULLIF(bat.innings - bat.not_outs, 0), 2),
+       ROUND(bat.runs * 100.0 / NULLIF(bat.balls, 0), 2),
+       IFNULL(bat.hundreds, 0),
+       IFNULL(bat.fifties, 0),
+       IFNULL(bowl.wickets, 0),
+       ROUND(bowl.conceded * 1.0 / NULLIF(bowl.wickets, 0), 2),
+       ROUND(bowl.conceded * 1.0 / NULLIF(bowl.overs, 0), 2)
+FROM k
+LEFT JOIN bat ON bat.player_id = k.player_id AND bat.format = k.format
+LEFT JOIN bowl ON bowl.player_id = k.player_id AND bowl.format = k.format
+WHERE k.format IS NOT NULL
+"""
+
+
+def _chunks(seq, size=CHUNK):
+    seq = list(seq)
+    for i in range(0, len(seq), size):
+        yield seq[i:i + size]
+
+
+def normalize_format(fmt):
+    if not fmt:
+        return None
+    return FORMATS.get(fmt.upper(), fmt)
+
+
+def overs_to_decimal(overs):
+    """Cricket overs notation ("3.4" = 3 overs 4 balls) to decimal overs."""
+    if overs in (None, ""):
+        return None
+    whole, _, balls = str(overs).partition(".")
+    try:
+        return round(int(whole or 0) + int(balls or 0) / 6, 3)
+    except ValueError:
+        return None
+
+
+def _match_date(start_ts):
+    if start_ts in (None, ""):
+        return None
+    return datetime.utcfromtimestamp(int(start_ts) / 1000).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _ensure_dim(conn, table, key_cols, id_col, rows):
+    """Insert missing dimension rows; returns {key tuple: surrogate id} for `rows`' keys."""
+    if not rows:
+        return {}
+    cols = list(next(iter(rows.values())).keys())
+    conn.executemany(
+        f"INSERT INTO {table} ({', '.join(cols)}) VALUES ({', '.join('?' * len(cols))}) "
+        f"ON CONFLICT ({', '.join(key_cols)}) DO NOTHING",
+        [tuple(r[c] for c in cols) for r in rows.values()],
+    )
+    ids = {}
+    for chunk in _chunks(rows):
+        where = " OR ".join(f"({' AND '.join(f'{c} = ?' for c in key_cols)})" for _ in chunk)
+        params = [v for key in chunk for v in key]
+        for r in conn.execute(f"SELECT {id_col}, {', '.join(key_cols)} FROM {table} WHERE {where}", params):
+            ids[tuple(r[1:])] = r[0]
+    return ids
+
+
+def get_watermark(conn):
+    row = conn.execute("SELECT watermark FROM etl_state WHERE name = ?", (ETL_NAME,)).fetchone()
+    return row[0] if row else None
+
+
+def _set_watermark(conn, watermark):
+    conn.execute("""
+        INSERT INTO etl_state (name, watermark, loaded_at) VALUES (?, ?, ?)
+        ON CONFLICT (name) DO UPDATE SET watermark=excluded.watermark, loaded_at=excluded.loaded_at
+    """, (ETL_NAME, watermark, datetime.utcnow().isoformat(timespec="seconds") + "Z"))
+
+
+def _load_matches(conn, rows, full):
+    """Upsert dimensions + matches for live_matches rows; returns {cb_match_id: match_id} of changed ones."""
+    stored = {}
+    if not full:
+        for chunk in _chunks([r["match_id"] for r in rows]):
+            stored.update(conn.execute(
+                f"SELECT cb_match_id, source_hash FROM matches WHERE cb_match_id IN ({','.join('?' * len(chunk))})",
+                chunk,
+            ).fetchall())
+    changed = []
+    for r in rows:
+        r["source_hash"] = content_hash(r)
+        if full or stored.get(r["match_id"]) != r["source_hash"]:
+            changed.append(r)
+    if not changed:
+        return {}
+
+    teams, venues, series = {}, {}, {}
+    for r in changed:
+        for t in (r["team1"], r["team2"]):
+            if t:
+                teams[(t,)] = {"team_name": t}
+        if r["venue_name"]:
+            venues[(r["venue_name"], r["venue_city"] or "")] = {
+                "name": r["venue_name"], "city": r["venue_city"] or "", "country": r["venue_country"]}
+        if r["series_name"]:
+            series[(r["series_name"],)] = {
+                "series_name": r["series_name"], "host_country": r["venue_country"],
+                "match_type": normalize_format(r["match_format"])}
+    team_ids = _ensure_dim(conn, "teams", ["team_name"], "team_id", teams)
+    venue_ids = _ensure_dim(conn, "venues", ["name", "city"], "venue_id", venues)
+    series_ids = _ensure_dim(conn, "series", ["series_name"], "series_id", series)
+
+    params = []
+    for r in changed:
+        toss = TOSS_RE.match(r["status"] or "")
+        params.append({
+            "cb_match_id": r["match_id"],
+            "series_id": series_ids.get((r["series_name"],)),
+            "team1_id": team_ids.get((r["team1"],)),
+            "team2_id": team_ids.get((r["team2"],)),
+            "venue_id": venue_ids.get((r["venue_name"], r["venue_city"] or "")) if r["venue_name"] else None,
+            "match_desc": r["match_desc"],
+            "match_date": _match_date(r["start_ts"]),
+            "format": normalize_format(r["match_format"]),
+            "match_status": "Complete" if r["is_complete"] else "Live",
+            "winner_team_id": team_ids.get((r["winner"],)) if r["winner"] else None,
+            "result_type": r["victory_type"] or None,
+            "result_margin": r["victory_margin"],
+            "toss_winner_id": team_ids.get((toss.group("team").strip(),)) if toss else None,
+            "toss_decision": toss.group("decision").lower() if toss else None,
+            "source_hash": r["source_hash"],
+        })
+    conn.executemany(_MATCH_UPSERT, params)
+
+    ids = {}
+    for chunk in _chunks([r["match_id"] for r in changed]):
+        ids.update(conn.execute(
+            f"SELECT cb_match_id, match_id FROM matches WHERE cb_match_id IN ({','.join('?' * len(chunk))})",
+            chunk,
+        ).fetchall())
+    # series start = first match seen; series rows are few, so just refresh the touched ones
+    touched = {p["series_id"] for p in params if p["series_id"] is not None}
+    for chunk in _chunks(touched):
+        conn.execute(f"""
+            UPDATE series SET start_date = (SELECT date(MIN(match_date)) FROM matches m WHERE m.series_id = series.series_id)
+            WHERE series_id IN ({','.join('?' * len(chunk))})
+        """, chunk)
+    return ids
+
+
+def _load_player_facts(conn, match_ids):
+    """Replace innings/bowling facts from player_stats for matches that have scorecard rows.
+
+    Returns the set of player_ids whose facts changed.
+    """
+    players = set()
+    for chunk in _chunks(match_ids.items()):
+        by_cb = dict(chunk)
+        stats = conn.execute(f"""
+            SELECT ps.match_id, ps.player_name, ps.team_name, ps.role, ps.runs, ps.balls,
+                   ps.wickets, ps.overs, m.format, m.venue_id
+            FROM player_stats ps JOIN matches m ON m.cb_match_id = ps.match_id
+            WHERE ps.match_id IN ({','.join('?' * len(by_cb))}) AND ps.player_name IS NOT NULL
+        """, list(by_cb)).fetchall()
+        if not stats:
+            continue
+        team_ids = _ensure_dim(conn, "teams", ["team_name"], "team_id",
+                               {(s[2],): {"team_name": s[2]} for s in stats if s[2]})
+        player_ids = _ensure_dim(conn, "players", ["full_name"], "player_id", {
+            (s[1],): {"full_name": s[1], "country": s[2],
+                      "playing_role": "Batsman" if (s[3] or "").lower().startswith("bat") else "Bowler"}
+            for s in stats})
+        scored = sorted({by_cb[s[0]] for s in stats})
+        marks = ",".join("?" * len(scored))
+        old = conn.execute(f"""
+            SELECT player_id FROM player_innings WHERE match_id IN ({marks})
+            UNION SELECT player_id FROM bowling_figures WHERE match_id IN ({marks})
+        """, scored + scored).fetchall()
+        players.update(r[0] for r in old)
+        conn.execute(f"DELETE FROM player_innings WHERE match_id IN ({marks})", scored)
+        conn.execute(f"DELETE FROM bowling_figures WHERE match_id IN ({marks})", scored)
+        innings, bowling = [], []
+        for cb_id, name, team, role, runs, balls, wkts, overs, fmt, venue_id in stats:
+            pid = player_ids[(name,)]
+            players.add(pid)
+            if (role or "").lower().startswith("bowl"):
+                bowling.append((by_cb[cb_id], pid, venue_id, fmt, overs_to_decimal(overs), runs, wkts))
+            else:
+                innings.append((by_cb[cb_id], pid, team_ids.get((team,)), fmt, runs, balls))
+        conn.executemany(
+            "INSERT INTO player_innings (match_id, player_id, team_id, format, runs, balls) VALUES (?, ?, ?, ?, ?, ?)",
+            innings)
+        conn.executemany(
+            "INSERT INTO bowling_figures (match_id, player_id, venue_id, format, overs, runs_conceded, wickets)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?)", bowling)
+    return players
+
+
+def refresh_career_stats(conn, player_ids=None):
+    """Recompute player_career_stats for `player_ids` (all players if None), then the leaderboards."""
+    if player_ids is None:
+        conn.execute("DELETE FROM player_career_stats")
+        conn.execute(_CAREER_SQL.format(where=""))
+    else:
+        for chunk in _chunks(sorted(player_ids)):
+            marks = ",".join("?" * len(chunk))
+            conn.execute(f"DELETE FROM player_career_stats WHERE player_id IN ({marks})", chunk)
+            conn.execute(_CAREER_SQL.format(where=f"WHERE player_id IN ({marks})"), chunk + chunk)
+    update_leaderboards(conn, player_ids)
+
+
+def _get_tombstone_seq(conn):
+    row = conn.execute("SELECT tombstone_seq FROM etl_state WHERE name = ?", (ETL_NAME,)).fetchone()
+    return row[0] if row else None
+
+
+def _set_tombstone_seq(conn, seq):
+    conn.execute("""
+        INSERT INTO etl_state (name, tombstone_seq) VALUES (?, ?)
+        ON CONFLICT (name) DO UPDATE SET tombstone_seq=excluded.tombstone_seq
+    """, (ETL_NAME, seq))
+
+
+def _delete_removed(conn, full=False):
+    """Drop matches (and their facts) whose live_matches row was deleted.
+
+    Reads the tombstones the delete trigger (migration 4) wrote since the last
+    load; a match inserted again since is kept. A full load, or the first load
+    after the migration, compares every match instead.
+    """
+    last_seq = None if full else _get_tombstone_seq(conn)
+    top = conn.execute("SELECT IFNULL(MAX(seq), 0) FROM live_matches_tombstones").fetchone()[0]
+    if last_seq is None:
+        gone = [r[0] for r in conn.execute(
+            "SELECT match_id FROM matches WHERE cb_match_id NOT IN (SELECT match_id FROM live_matches)")]
+    else:
+        gone = [r[0] for r in conn.execute("""
+            SELECT DISTINCT m.match_id FROM live_matches_tombstones t
+            JOIN matches m ON m.cb_match_id = t.match_id
+            WHERE t.seq > ? AND NOT EXISTS (SELECT 1 FROM live_matches l WHERE l.match_id = t.match_id)
+        """, (last_seq,))]
+    players = set()
+    for chunk in _chunks(gone):
+        marks = ",".join("?" * len(chunk))
+        players.update(r[0] for r in conn.execute(f"""
+            SELECT player_id FROM player_innings WHERE match_id IN ({marks})
+            UNION SELECT player_id FROM bowling_figures WHERE match_id IN ({marks})
+        """, chunk + chunk))
+        for table in ("player_innings", "bowling_figures", "partnerships", "player_fielding", "matches"):
+            conn.execute(f"DELETE FROM {table} WHERE match_id IN ({marks})", chunk)
+    if top != last_seq:
+        _set_tombstone_seq(conn, top)
+    # consumed and old enough that no other reader (e.g. a columnar export) still needs them
+    conn.execute("DELETE FROM live_matches_tombstones WHERE seq <= ? AND removed_at < strftime('%Y-%m-%dT%H:%M:%SZ', 'now', ?)",
+                 (top, f"-{TOMBSTONE_TTL_DAYS} days"))
+    return len(gone), players
+
+
+def load_incremental(conn, full=False):
+    """Bring the normalized tables up to date with live_matches/player_stats.
+
+    Returns counts: matches (changed), deleted, players (career rows refreshed).
+    """
+    watermark = None if full else get_watermark(conn)
+    # rows written without updated_at never pass a comparison; they're hash-skipped once loaded
+    sql = _SOURCE_SQL + ("" if watermark is None else " WHERE updated_at >= ? OR updated_at IS NULL")
+    cur = conn.execute(sql, () if watermark is None else (watermark,))
+    cols = [d[0] for d in cur.description]
+    rows = [dict(zip(cols, r)) for r in cur]
+
+    match_ids = _load_matches(conn, rows, full)
+    players = _load_player_facts(conn, match_ids)
+    deleted, gone_players = _delete_removed(conn, full)
+    players |= gone_players
+    if full:
+        refresh_career_stats(conn)
+    elif players:
+        refresh_career_stats(conn, players)
+    # international sides: the team name is the country
+    conn.execute("""
+        UPDATE teams SET country = REPLACE(team_name, ' Women', '')
+        WHERE country IS NULL AND REPLACE(team_name, ' Women', '') IN (SELECT country FROM venues)
+    """)
+
+    stamps = [r["updated_at"] for r in rows if r["updated_at"]]
+    if stamps:
+        new_mark = max(stamps)
+        if watermark is None or new_mark > watermark:
+            _set_watermark(conn, new_mark)
+    elif watermark is None:
+        _set_watermark(conn, None)
+    return {"matches": len(match_ids), "deleted": deleted, "players": len(players)}
@@ -0,0 +1,271 @@
+# utils/feed_stream.py
+"""Streaming parser for the live feed: typeMatches -> seriesMatches -> seriesAdWrapper -> matches.
+
+Instead of building the whole document with r.json(), the response body is read
+chunk by chunk and only the skeleton along that path is walked. Each match
+object is decoded on its own as soon as its bytes have arrived, so rows start
+flowing before the download finishes and peak memory is one chunk plus one
+match, not the whole payload.
+
+Produces the same (series_name, match) pairs, in the same order, as
+utils.live_feed.flatten_payload(json.loads(body)) for any well-formed payload.
+"""
+import codecs
+import itertools
+import json
+
+from utils.live_feed import flatten_match
+from utils.payload_archive import FRAGMENT_REF
+
+DEFAULT_BATCH_SIZE = 500
+_WS = " \t\n\r"
+_MIN_REFILL = 4096
+_DECODER = json.JSONDecoder()
+
+
+class _Reader:
+    """Pull reader over an iterable of byte chunks with just enough JSON structure support."""
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self, min_chars=1):
+        """Append at least `min_chars` of input (less only at end of input)."""
+        if self.eof:
+            return False
+        # drop consumed text so the buffer never holds more than the unread tail
+        if self.pos:
+            self.buf = self.buf[self.pos:]
+            self.pos = 0
+        parts = []
+        added = 0
+        for chunk in self._chunks:
+            text = self._utf8.decode(chunk)
+            parts.append(text)
+            added += len(text)
+            if added >= min_chars:
+                break
+        else:
+            parts.append(self._utf8.decode(b"", final=True))
+            self.eof = True
+        self.buf += "".join(parts)
+        return added > 0 or bool(parts[-1])
+
+    def peek(self):
+        """Next non-whitespace character ('' at end of input), not consumed."""
+        while True:
+            buf, pos, n = self.buf, self.pos, len(self.buf)
+            while pos < n and buf[pos] in _WS:
+                pos += 1
+            self.pos = pos
+            if pos < n:
+                return buf[pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, ch):
+        got = self.peek()
+        if got != ch:
+            raise ValueError(f"Expected {ch!r} at offset {self.pos}, got {got!r}")
+        self.pos += 1
+
+    def value(self):
+        """Decode one complete JSON value at the cursor, reading more input as needed."""
+        self.peek()
+        while True:
+            try:
+                obj, end = _DECODER.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                # incomplete value: grow the buffer geometrically so tiny chunks don't
+                # turn into one failed decode per byte
+                if self._fill(max(_MIN_REFILL, len(self.buf) - self.pos)):
+                    continue
+                raise
+            # a number (or literal) touching the end of the buffer may continue in the next chunk
+            if end == len(self.buf) and not self.eof and self._fill():
+                continue
+            self.pos = end
+            return obj
+
+    skip = value
+
+    def object_keys(self):
+        """Iterate keys of the object at the cursor; the caller must consume each value."""
+        self.expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(":")
+            yield key
+            if self.peek() == ",":
+                self.pos += 1
+                continue
+            self.expect("}")
+            return
+
+    def array_items(self):
+        """Iterate elements of the array at the cursor; the caller must consume each element."""
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield
+            if self.peek() == ",":
+                self.pos += 1
+                continue
+            self.expect("]")
+            return
+
+
+def _wrapper_matches(r, adw, refs):
+    """Yield (series_name, match) for one seriesAdWrapper object.
+
+    With a skeleton being built, `adw` receives the wrapper's other fields and
+    a {"$frag": i} placeholder per match; `refs` counts the matches so far.
+    """
+    series_name = None
+    held = []          # matches seen before seriesName (rare): hold them until the wrapper ends
+    for key in r.object_keys():
+        if key == "seriesName":
+            value = r.value()
+            if adw is not None:
+                adw[key] = value
+            series_name = value or ""
+            for m in held:
+                yield series_name, m
+            held = []
+        elif key == "matches" and r.peek() == "[":
+            if adw is not None:
+                adw[key] = []
+            for _ in r.array_items():
+                m = r.value()
+                if adw is not None:
+                    adw[key].append({FRAGMENT_REF: next(refs)})
+                if series_name is None:
+                    held.append(m)
+                else:
+                    yield series_name, m
+        elif adw is not None:
+            adw[key] = r.value()
+        else:
+            r.skip()
+    for m in held:
+        yield "", m
+
+
+def iter_series_matches(chunks, skeleton=None):
+    """Yield (series_name, raw match dict) pairs from a streamed body.
+
+    If `skeleton` is a dict, it is filled with everything else in the document,
+    each match replaced by {"$frag": i} (i = its position in the yielded
+    sequence), as payload_archive.split_payload() would build it. The parts
+    off the matches path are small, so that costs no more memory than a match.
+    """
+    keep = skeleton is not None
+    refs = itertools.count()
+    r = _Reader(chunks)
+    if r.peek() != "{":
+        return
+    for key in r.object_keys():
+        if key != "typeMatches" or r.peek() != "[":
+            _keep(r, skeleton, key)
+            continue
+        type_list = [] if keep else None
+        if keep:
+            skeleton[key] = type_list
+        for _ in r.array_items():
+            if r.peek() != "{":
+                _keep(r, type_list)
+                continue
+            t = _child(type_list)
+            for k2 in r.object_keys():
+                if k2 != "seriesMatches" or r.peek() != "[":
+                    _keep(r, t, k2)
+                    continue
+                series_list = [] if keep else None
+                if keep:
+                    t[k2] = series_list
+                for _ in r.array_items():
+                    if r.peek() != "{":
+                        _keep(r, series_list)
+                        continue
+                    s = _child(series_list)
+                    for k3 in r.object_keys():
+                        if k3 == "seriesAdWrapper" and r.peek() == "{":
+                            adw = None
+                            if keep:
+                                adw = s[k3] = {}
+                            yield from _wrapper_matches(r, adw, refs)
+                        else:
+                            _keep(r, s, k3)
+
+
+def _keep(r, node, key=None):
+    """Consume the value at the cursor into `node` (a dict at `key`, or a list); just skip it without one."""
+    if node is None:
+        r.skip()
+    elif key is None:
+        node.append(r.value())
+    else:
+        node[key] = r.value()
+
+
+def _child(node):
+    """A new dict appended to list `node`, or None when no skeleton is being built."""
+    if node is None:
+        return None
+    node.append({})
+    return node[-1]
+
+
+def iter_match_rows(chunks):
+    """Flattened live_matches rows, yielded while the body is still arriving."""
+    for series_name, m in iter_series_matches(chunks):
+        yield flatten_match(series_name, m)
+
+
+def batched(rows, size=DEFAULT_BATCH_SIZE):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def ingest_stream(chunks, write_batch, batch_size=DEFAULT_BATCH_SIZE, archive=None):
+    """Parse a streamed body and hand it to `write_batch(rows) -> counts` in fixed-size batches.
+
+    write_batch is called once per batch (e.g. lambda rows: upsert_matches(conn, rows)),
+    so a writer only needs to be held while a batch is written, not while the
+    body downloads. Returns the summed change counts plus the row total.
+
+    With `archive` (a PayloadArchive.writer()), each match object is also
+    handed to archive.add() as it is parsed and archive.skeleton is filled in,
+    so the payload is archived without decoding the body a second time.
+    """
+    pairs = iter_series_matches(chunks, skeleton=archive.skeleton if archive is not None else None)
+    if archive is not None:
+        pairs = _tee(pairs, archive)
+    totals = {"inserted": 0, "updated": 0, "unchanged": 0, "rows": 0}
+    for batch in batched((flatten_match(series_name, m) for series_name, m in pairs), batch_size):
+        counts = write_batch(batch)
+        for k, v in counts.items():
+            totals[k] += v
+        totals["rows"] += len(batch)
+    return totals
+
+
+def _tee(pairs, archive):
+    for series_name, m in pairs:
+        archive.add(series_name, m)
+        yield series_name, m
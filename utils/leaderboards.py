@@ -0,0 +1,124 @@
+# utils/leaderboards.py
+"""Precomputed top-N leaderboards per format, maintained incrementally from player_career_stats.
+
+leaderboards (board, format, rank) -> player_id, value holds the best DEPTH
+players of each board, so the Top Stats page reads a handful of primary-key
+rows however many careers are stored. refresh_career_stats() calls
+update_leaderboards() with the players it just recomputed:
+
+  - a changed player who improved (or a newcomer) is merged into the stored
+    top-k: nobody outside the board can have overtaken anyone inside it, so
+    ranking members + changed players is exact;
+  - if a member got worse or stopped qualifying (averages move both ways,
+    deleted matches take runs away) and the board was full, that board/format
+    is refilled from player_career_stats with one ORDER BY ... LIMIT query
+    (indexed for runs and wickets).
+
+Migration 6 creates the table and builds it once.
+"""
+import heapq
+
+DEPTH = 100              # players kept per board and format; the page shows up to 25
+MIN_INNINGS = 10         # qualification for the batting average board
+MIN_WICKETS = 20         # qualification for the economy board
+
+# board -> (player_career_stats column, higher is better, qualification)
+BOARDS = {
+    "runs": ("total_runs", True, "total_runs > 0"),
+    "wickets": ("total_wickets", True, "total_wickets > 0"),
+    "batting_average": ("batting_average", True, f"innings >= {MIN_INNINGS} AND batting_average IS NOT NULL"),
+    "economy": ("economy", False, f"total_wickets >= {MIN_WICKETS} AND economy IS NOT NULL"),
+}
+
+BOARD_SQL = """
+SELECT l.rank, p.full_name AS player, c.*
+FROM leaderboards l
+JOIN players p ON p.player_id = l.player_id
+JOIN player_career_stats c ON c.player_id = l.player_id AND c.format = l.format
+WHERE l.board = ? AND l.format = ? AND l.rank <= ?
+ORDER BY l.rank
+"""
+
+
+def _candidates_sql(board, where=""):
+    col, _, qualifies = BOARDS[board]
+    return f"SELECT player_id, format, {col} FROM player_career_stats WHERE {qualifies} {where}"
+
+
+def _ranked(entries, higher_better, depth):
+    """Top `depth` of {player_id: value}, best first; ties broken by player_id."""
+    sign = 1 if higher_better else -1
+    return heapq.nsmallest(depth, entries.items(), key=lambda kv: (-sign * kv[1], kv[0]))
+
+
+def _write(conn, board, fmt, ranked):
+    conn.execute("DELETE FROM leaderboards WHERE board = ? AND format = ?", (board, fmt))
+    conn.executemany(
+        "INSERT INTO leaderboards (board, format, rank, player_id, value) VALUES (?, ?, ?, ?, ?)",
+        [(board, fmt, i, pid, value) for i, (pid, value) in enumerate(ranked, 1)])
+
+
+def _refill(conn, board, fmt, depth):
+    col, higher_better, _ = BOARDS[board]
+    rows = conn.execute(
+        _candidates_sql(board, f"AND format = ? ORDER BY {col} {'DESC' if higher_better else 'ASC'}, player_id LIMIT ?"),
+        (fmt, depth)).fetchall()
+    _write(conn, board, fmt, [(pid, value) for pid, _, value in rows])
+
+
+def rebuild_leaderboards(conn, depth=DEPTH):
+    """Recompute every board from player_career_stats."""
+    conn.execute("DELETE FROM leaderboards")
+    formats = [r[0] for r in conn.execute("SELECT DISTINCT format FROM player_career_stats")]
+    for board in BOARDS:
+        for fmt in formats:
+            _refill(conn, board, fmt, depth)
+
+
+def update_leaderboards(conn, player_ids=None, depth=DEPTH):
+    """Fold the current career rows of `player_ids` into the boards (all players: rebuild).
+
+    Returns the number of board/format lists rewritten.
+    """
+    if player_ids is None:
+        rebuild_leaderboards(conn, depth)
+        return None
+    player_ids = sorted(set(player_ids))
+    if not player_ids:
+        return 0
+    rewritten = 0
+    for board, (col, higher_better, _) in BOARDS.items():
+        members = {}     # format -> {player_id: value}
+        for fmt, pid, value in conn.execute(
+                "SELECT format, player_id, value FROM leaderboards WHERE board = ?", (board,)):
+            members.setdefault(fmt, {})[pid] = value
+        changed = {}     # format -> {player_id: value} for the changed players that qualify
+        for i in range(0, len(player_ids), 500):
+            chunk = player_ids[i:i + 500]
+            marks = ",".join("?" * len(chunk))
+            for pid, fmt, value in conn.execute(_candidates_sql(board, f"AND player_id IN ({marks})"), chunk):
+                changed.setdefault(fmt, {})[pid] = value
+        touched = set(player_ids)
+        for fmt in set(members) | set(changed):
+            board_now = members.get(fmt, {})
+            new = changed.get(fmt, {})
+            sign = 1 if higher_better else -1
+            worse = any(pid not in new or sign * new[pid] < sign * value
+                        for pid, value in board_now.items() if pid in touched)
+            if worse and len(board_now) >= depth:
+                _refill(conn, board, fmt, depth)
+                rewritten += 1
+                continue
+            merged = {pid: v for pid, v in board_now.items() if pid not in touched}
+            merged.update(new)
+            ranked = _ranked(merged, higher_better, depth)
+            if ranked != _ranked(board_now, higher_better, depth):
+                _write(conn, board, fmt, ranked)
+                rewritten += 1
+    return rewritten
+
+
+def read_board(conn, board, fmt, n=10):
+    """Top `n` of a board as (columns, rows): rank, player, then the player's career row."""
+    cur = conn.execute(BOARD_SQL, (board, fmt, n))
+    return [d[0] for d in cur.description], cur.fetchall()
@@ -0,0 +1,158 @@
+# utils/live_feed.py
+"""Fetch, flatten and store the free Cricbuzz live feed (shared by pages and the poller)."""
+import hashlib
+import json
+from datetime import datetime
+
+from utils.api_client import get_client
+from utils.config import LIVE_URL
+from utils.status_parser import parse_status  # noqa: F401 (re-exported)
+
+# Columns that make up a match's content; updated_at is bookkeeping and not hashed
+CONTENT_COLUMNS = (
+    "series_name", "team1", "team2", "status", "match_desc", "start_ts",
+    "venue_name", "venue_city", "venue_country", "match_format",
+    "winner", "victory_type", "victory_margin", "is_complete",
+)
+
+# Only rows whose content hash changed are touched; the WHERE keeps that true
+# even if another writer got there first.
+UPSERT_SQL = f"""
+INSERT INTO live_matches
+(match_id, {", ".join(CONTENT_COLUMNS)}, content_hash, updated_at)
+VALUES
+(:match_id, {", ".join(":" + c for c in CONTENT_COLUMNS)}, :content_hash, :updated_at)
+ON CONFLICT(match_id) DO UPDATE SET
+  {", ".join(f"{c}=excluded.{c}" for c in CONTENT_COLUMNS)},
+  content_hash=excluded.content_hash,
+  updated_at=excluded.updated_at
+WHERE live_matches.content_hash IS NOT excluded.content_hash
+"""
+
+LOOKUP_CHUNK = 500   # stay well under SQLite's bound-parameter limit
+
+def to_int_or_none(x):
+    try:
+        return int(x)
+    except:
+        return None
+
+def flatten_match(series_name: str, match_obj: dict):
+    """Safely flatten one match record from the free live endpoint."""
+    info = match_obj.get("matchInfo", {})
+    teams1 = info.get("team1", {}) or {}
+    teams2 = info.get("team2", {}) or {}
+    venue = info.get("venueInfo", {}) or {}
+
+    match_id = str(info.get("matchId", ""))
+    team1 = teams1.get("teamName") or teams1.get("teamSName") or ""
+    team2 = teams2.get("teamName") or teams2.get("teamSName") or ""
+    status = info.get("status") or info.get("stateTitle") or info.get("statusText") or ""
+    match_desc = info.get("matchDesc") or ""
+    match_format = info.get("matchFormat") or info.get("matchType") or ""
+
+    # Many feeds provide ms since epoch as string in 'startDate'; try a few keys
+    start_ts = info.get("startDate") or info.get("startTime") or info.get("matchStartTimestamp")
+    start_ts = to_int_or_none(start_ts)
+
+    venue_name = venue.get("ground") or venue.get("name") or ""
+    venue_city = venue.get("city") or ""
+    venue_country = venue.get("country") or ""
+
+    winner, victory_type, victory_margin, is_complete = parse_status(status)
+    updated_at = datetime.utcnow().isoformat(timespec="seconds") + "Z"
+
+    return {
+        "match_id": match_id,
+        "series_name": series_name or "",
+        "team1": team1,
+        "team2": team2,
+        "status": status,
+        "match_desc": match_desc,
+        "start_ts": start_ts,
+        "venue_name": venue_name,
+        "venue_city": venue_city,
+        "venue_country": venue_country,
+        "match_format": match_format,
+        "winner": winner,
+        "victory_type": victory_type,
+        "victory_margin": victory_margin,
+        "is_complete": is_complete,
+        "updated_at": updated_at
+    }
+
+def flatten_payload(data: dict):
+    """Walk typeMatches -> seriesMatches -> seriesAdWrapper -> matches and flatten every match."""
+    rows = []
+    for t in data.get("typeMatches", []):
+        # t example: {"matchType":"International", "seriesMatches":[...]}
+        series_list = t.get("seriesMatches", [])
+        for s in series_list:
+            adw = s.get("seriesAdWrapper", {}) or {}
+            series_name = adw.get("seriesName") or ""
+            matches = adw.get("matches", []) or []
+            for m in matches:
+                rows.append(flatten_match(series_name, m))
+    return rows
+
+def fetch_live_payload(client=None, stream=False):
+    """GET the live endpoint through the shared client (pooled, retried, revalidated)."""
+    return (client or get_client()).get(LIVE_URL, stream=stream)
+
+def fetch_live_matches(client=None):
+    return fetch_live_payload(client).json()
+
+def content_hash(row):
+    """Stable hash of a flattened row's content columns."""
+    payload = json.dumps([row.get(c) for c in CONTENT_COLUMNS], separators=(",", ":"))
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+def _stored_hashes(conn, match_ids):
+    stored = {}
+    for i in range(0, len(match_ids), LOOKUP_CHUNK):
+        chunk = match_ids[i:i + LOOKUP_CHUNK]
+        marks = ",".join("?" * len(chunk))
+        stored.update(conn.execute(
+            f"SELECT match_id, content_hash FROM live_matches WHERE match_id IN ({marks})", chunk
+        ).fetchall())
+    return stored
+
+def apply_upsert(conn, rows):
+    """Delta-UPSERT flattened rows inside the caller's transaction.
+
+    Rows whose content hash matches the stored one are skipped, so updated_at
+    only moves when a match actually changed. Returns inserted/updated/unchanged
+    counts. Used directly by the write queue, which owns the transaction.
+    """
+    counts = {"inserted": 0, "updated": 0, "unchanged": 0}
+    # a match listed twice in one payload: the last occurrence wins
+    latest = {}
+    for row in rows:
+        latest[row["match_id"]] = row
+    stored = _stored_hashes(conn, list(latest))
+    pending = []
+    for match_id, row in latest.items():
+        h = content_hash(row)
+        if match_id not in stored:
+            counts["inserted"] += 1
+        elif stored[match_id] == h:
+            counts["unchanged"] += 1
+            continue
+        else:
+            counts["updated"] += 1
+        pending.append(dict(row, content_hash=h))
+    if pending:
+        conn.executemany(UPSERT_SQL, pending)
+    return counts
+
+
+def upsert_matches(conn, rows):
+    """apply_upsert() in its own transaction. The caller owns the connection."""
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        counts = apply_upsert(conn, rows)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return counts
@@ -0,0 +1,193 @@
+# utils/live_snapshot.py
+"""Process-wide, immutable in-memory snapshot of live_matches shared by every session.
+
+The list / scorecard / CRUD / live display pages all show the same few hundred
+rows, so instead of each rerun of each session querying live_matches, one
+LiveSnapshot per process holds every row as a compact __slots__ record, in
+the pages' two sort orders, with indexes by match_id, series and team. It is
+never modified: a reload builds a new snapshot and swaps the reference, so a
+rerun keeps reading a consistent one even while the next is built.
+
+    from utils.live_snapshot import get_live_snapshot
+    snap = get_live_snapshot()
+    snap.recent(50), snap.by_series_order(), snap.get(match_id), snap.team("India")
+
+The poller refreshes it right after an ingest that changed something. Other
+writers are picked up on a later read. A commit through this process's write
+queue (the CRUD page) bumps its generation, which is seen immediately. A
+commit from another process shows up in `PRAGMA data_version` (no table
+access), which is checked at most every CHECK_INTERVAL_S. Only when either
+moved is db_stats.changes (one row, migration 7) compared with the snapshot's,
+to decide whether live_matches itself changed. With hundreds of sessions
+reading, live_matches is loaded about once per ingest cycle.
+"""
+import sqlite3
+import threading
+import time
+from types import MappingProxyType
+
+from utils.config import DB_PATH
+from utils.db_connection import get_pool, read_conn
+from utils.migrations import LIVE_MATCHES_COLUMNS
+
+FIELDS = tuple(name for name, _ in LIVE_MATCHES_COLUMNS if name != "content_hash")
+_ROWS_SQL = f"SELECT {', '.join(FIELDS)} FROM live_matches ORDER BY COALESCE(start_ts, 0) DESC, series_name"
+_CHANGES_SQL = "SELECT changes FROM db_stats WHERE id = 1"
+CHECK_INTERVAL_S = 1.0     # how stale another process's commits may be
+
+
+class MatchRecord:
+    """One live_matches row; read-only attributes named after the columns."""
+
+    __slots__ = FIELDS
+
+    def __init__(self, row):
+        for name, value in zip(FIELDS, row):
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("MatchRecord is immutable")
+
+    def get(self, name, default=None):
+        """dict-style access, so code written against row dicts keeps working."""
+        return getattr(self, name, default) if name in FIELDS else default
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in FIELDS}
+
+    def __repr__(self):
+        return f"MatchRecord({self.match_id!r}, {self.team1!r} vs {self.team2!r})"
+
+
+def _group(records, key):
+    groups = {}
+    for r in records:
+        for k in key(r):
+            if k is not None:
+                groups.setdefault(k, []).append(r)
+    return MappingProxyType({k: tuple(v) for k, v in groups.items()})
+
+
+class LiveSnapshot:
+    """Immutable view of every live_matches row at one point in time."""
+
+    __slots__ = ("changes", "loaded_at", "_recent", "_by_series_order", "_by_id", "_by_series", "_by_team")
+
+    def __init__(self, rows, changes=None):
+        records = tuple(MatchRecord(r) for r in rows)     # already ORDER BY start_ts DESC, series
+        setattr_ = object.__setattr__
+        setattr_(self, "changes", changes)
+        setattr_(self, "loaded_at", time.time())
+        setattr_(self, "_recent", records)
+        setattr_(self, "_by_series_order", tuple(sorted(
+            records, key=lambda r: (r.series_name is not None, r.series_name or "", r.team1 is not None, r.team1 or ""))))
+        setattr_(self, "_by_id", MappingProxyType({r.match_id: r for r in records}))
+        setattr_(self, "_by_series", _group(records, lambda r: (r.series_name,)))
+        setattr_(self, "_by_team", _group(records, lambda r: {r.team1, r.team2}))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("LiveSnapshot is immutable")
+
+    def __len__(self):
+        return len(self._recent)
+
+    def recent(self, limit=None):
+        """Records newest start first (ORDER BY COALESCE(start_ts, 0) DESC, series_name)."""
+        return self._recent if limit is None else self._recent[:limit]
+
+    def by_series_order(self):
+        """Records ORDER BY series_name, team1 (NULLs first, as SQLite sorts them)."""
+        return self._by_series_order
+
+    def get(self, match_id):
+        return self._by_id.get(match_id)
+
+    def match_ids(self):
+        return tuple(self._by_id)
+
+    def series(self, name):
+        return self._by_series.get(name, ())
+
+    def team(self, name):
+        return self._by_team.get(name, ())
+
+
+class LiveSnapshotStore:
+    """Holds the current LiveSnapshot for one DB and swaps in a new one when live_matches changes."""
+
+    def __init__(self, db_path=DB_PATH, check_interval_s=CHECK_INTERVAL_S):
+        self.db_path = db_path
+        self.check_interval_s = check_interval_s
+        self.stats = {"reads": 0, "checks": 0, "loads": 0}
+        self._snapshot = None
+        self._seen_version = None       # (PRAGMA data_version, write queue generation)
+        self._checked_at = 0.0
+        self._lock = threading.Lock()   # serializes checks and loads
+        self._watch = None
+
+    def _generation(self):
+        from utils.write_queue import get_write_queue
+        return get_write_queue(self.db_path).generation
+
+    def _data_version(self):
+        if self._watch is None:
+            get_pool(self.db_path)      # make sure the schema exists first
+            self._watch = sqlite3.connect(self.db_path, check_same_thread=False)
+        return self._watch.execute("PRAGMA data_version").fetchone()[0], self._generation()
+
+    def _load(self):
+        with read_conn(self.db_path) as conn:
+            conn.execute("BEGIN")       # counter and rows from the same read transaction
+            changes = conn.execute(_CHANGES_SQL).fetchone()
+            rows = conn.execute(_ROWS_SQL).fetchall()
+        self.stats["loads"] += 1
+        return LiveSnapshot(rows, changes[0] if changes else None)
+
+    def refresh(self, force=True):
+        """Reload now (force) or only if live_matches changed since the current snapshot; returns it."""
+        with self._lock:
+            version = self._data_version()
+            self._checked_at = time.monotonic()
+            snap = self._snapshot
+            if not force and snap is not None:
+                if version == self._seen_version:
+                    return snap
+                # something was committed; reload only if it touched live_matches
+                self.stats["checks"] += 1
+                with read_conn(self.db_path) as conn:
+                    changes = conn.execute(_CHANGES_SQL).fetchone()
+                if changes is not None and changes[0] == snap.changes:
+                    self._seen_version = version
+                    return snap
+            self._snapshot = self._load()       # a single reference assignment: readers see old or new
+            self._seen_version = version
+            return self._snapshot
+
+    def current(self):
+        """The up-to-date snapshot; no SQLite access unless a commit may have happened."""
+        self.stats["reads"] += 1
+        snap = self._snapshot
+        if (snap is not None and self._seen_version is not None
+                and self._seen_version[1] == self._generation()
+                and time.monotonic() - self._checked_at < self.check_interval_s):
+            return snap
+        return self.refresh(force=False)
+
+    def report(self):
+        snap = self._snapshot
+        return dict(self.stats, rows=len(snap) if snap else 0,
+                    loaded_at=snap.loaded_at if snap else None, changes=snap.changes if snap else None)
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+def get_live_snapshots(db_path=DB_PATH):
+    with _stores_lock:
+        store = _stores.get(db_path)
+        if store is None:
+            store = _stores[db_path] = LiveSnapshotStore(db_path)
+        return store
+
+def get_live_snapshot(db_path=DB_PATH):
+    return get_live_snapshots(db_path).current()
@@ -0,0 +1,95 @@
+# utils/match_history.py
+"""Append-only history of live_matches status transitions.
+
+match_state_history (match_id, ts, seq, status_id, is_complete) gets a row only
+when a match's status text actually changes ("opt to bat" -> "need 98 runs in
+91 balls" -> "won by 4 wkts"). The triggers on live_matches that write it are
+created by migration 5 from utils/migrations.py:_history_add(), so every
+writer (poller, CRUD, scripts) is covered. Status strings are stored once in
+status_strings and referenced by id; ts is unix seconds, taken from the row's
+updated_at, and seq numbers the transitions of one match within the same
+second, so none is overwritten.
+
+The primary key (match_id, ts, seq) serves a match's timeline and the covering
+(ts, match_id, seq, ...) index serves "what changed between t0 and t1", so
+neither scans the whole history.
+"""
+from datetime import datetime, timezone
+
+TIMELINE_SQL = """
+SELECT h.ts, s.status, h.is_complete
+FROM match_state_history h
+JOIN status_strings s ON s.status_id = h.status_id
+WHERE h.match_id = ? AND h.ts >= ? AND h.ts < ?
+ORDER BY h.ts, h.seq
+"""
+
+WINDOW_SQL = """
+SELECT h.ts, h.match_id, s.status, h.is_complete
+FROM match_state_history h
+JOIN status_strings s ON s.status_id = h.status_id
+WHERE h.ts >= ? AND h.ts < ?
+ORDER BY h.ts, h.match_id, h.seq
+LIMIT ?
+"""
+
+# live_matches rows with no history yet (pre-migration rows, bulk-loaded data)
+_BACKFILL_SQL = [
+    """
+    INSERT OR IGNORE INTO status_strings (status)
+    SELECT DISTINCT status FROM live_matches WHERE status IS NOT NULL
+    """,
+    """
+    INSERT OR IGNORE INTO match_state_history (match_id, ts, status_id, is_complete)
+    SELECT m.match_id,
+           COALESCE(CAST(strftime('%s', m.updated_at) AS INTEGER), CAST(strftime('%s', 'now') AS INTEGER)),
+           s.status_id, m.is_complete
+    FROM live_matches m
+    JOIN status_strings s ON s.status = m.status
+    WHERE NOT EXISTS (SELECT 1 FROM match_state_history h WHERE h.match_id = m.match_id)
+    """,
+]
+
+_MAX_TS = 2 ** 63 - 1
+
+
+def to_ts(value):
+    """Unix seconds from an int/float, a datetime (naive = UTC) or an ISO-8601 string."""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp())
+
+
+def _iso(ts):
+    return datetime.utcfromtimestamp(ts).isoformat(timespec="seconds") + "Z"
+
+
+def match_timeline(conn, match_id, start=None, end=None):
+    """Status transitions of one match, oldest first, optionally within [start, end)."""
+    lo = to_ts(start) if start is not None else 0
+    hi = to_ts(end) if end is not None else _MAX_TS
+    return [
+        {"ts": ts, "at": _iso(ts), "status": status, "is_complete": is_complete}
+        for ts, status, is_complete in conn.execute(TIMELINE_SQL, (match_id, lo, hi))
+    ]
+
+
+def changes_between(conn, start, end=None, limit=10_000):
+    """Every transition (any match) with start <= ts < end, oldest first, at most `limit` rows."""
+    hi = to_ts(end) if end is not None else _MAX_TS
+    return [
+        {"ts": ts, "at": _iso(ts), "match_id": match_id, "status": status, "is_complete": is_complete}
+        for ts, match_id, status, is_complete in conn.execute(WINDOW_SQL, (to_ts(start), hi, limit))
+    ]
+
+
+def backfill_history(conn):
+    """Record the current status of every match that has no history; returns rows added."""
+    conn.execute(_BACKFILL_SQL[0])
+    return conn.execute(_BACKFILL_SQL[1]).rowcount
@@ -0,0 +1,545 @@
+# utils/migrations.py
+"""Versioned schema migrations for cricbuzz.db.
+
+Each migration runs once, in order, inside its own transaction and is recorded
+in schema_version. Pages and the poller call ensure_schema() at startup, so a
+fresh file, a legacy 5-column live_matches table and an up-to-date DB all end
+up with the same schema.
+"""
+import sqlite3
+import threading
+from datetime import datetime
+
+from utils.config import DB_PATH
+
+LIVE_MATCHES_COLUMNS = [
+    ("match_id", "TEXT PRIMARY KEY"),
+    ("series_name", "TEXT"),
+    ("team1", "TEXT"),
+    ("team2", "TEXT"),
+    ("status", "TEXT"),
+    ("match_desc", "TEXT"),
+    ("start_ts", "INTEGER"),          # unix ms timestamp if available
+    ("venue_name", "TEXT"),
+    ("venue_city", "TEXT"),
+    ("venue_country", "TEXT"),
+    ("match_format", "TEXT"),
+    ("winner", "TEXT"),
+    ("victory_type", "TEXT"),         # 'runs' / 'wickets' / 'innings' / 'super over'
+    ("victory_margin", "INTEGER"),
+    ("is_complete", "INTEGER"),       # 0/1 inferred from status
+    ("updated_at", "TEXT"),           # only moves when the content changes
+    ("content_hash", "TEXT"),
+]
+
+
+def _v1_base_tables(conn):
+    cols = ",\n    ".join(f"{name} {decl}" for name, decl in LIVE_MATCHES_COLUMNS)
+    conn.execute(f"CREATE TABLE IF NOT EXISTS live_matches (\n    {cols}\n)")
+    # older DBs were created with only the first five columns
+    existing = {r[1] for r in conn.execute("PRAGMA table_info(live_matches)")}
+    for name, decl in LIVE_MATCHES_COLUMNS:
+        if name not in existing:
+            conn.execute(f"ALTER TABLE live_matches ADD COLUMN {name} {decl}")
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS match_score (
+        match_id TEXT,
+        team_name TEXT,
+        runs INTEGER,
+        wickets INTEGER,
+        overs TEXT,
+        target TEXT,
+        status TEXT
+    )""")
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS player_stats (
+        match_id TEXT,
+        player_name TEXT,
+        team_name TEXT,
+        role TEXT,
+        runs INTEGER,
+        balls INTEGER,
+        wickets INTEGER,
+        overs TEXT,
+        economy REAL
+    )""")
+
+
+_V2_INDEXES = """
+-- list/scorecard/CRUD pages: ORDER BY COALESCE(start_ts, 0) DESC [, series_name]
+CREATE INDEX IF NOT EXISTS idx_live_matches_sort ON live_matches (COALESCE(start_ts, 0) DESC, series_name);
+CREATE INDEX IF NOT EXISTS idx_live_matches_series ON live_matches (series_name, team1);
+CREATE INDEX IF NOT EXISTS idx_live_matches_updated ON live_matches (updated_at);
+CREATE INDEX IF NOT EXISTS idx_live_matches_teams ON live_matches (team1, team2);
+CREATE INDEX IF NOT EXISTS idx_match_score_match ON match_score (match_id);
+CREATE INDEX IF NOT EXISTS idx_player_stats_match ON player_stats (match_id, role);
+"""
+
+
+def _v2_indexes(conn):
+    for stmt in _V2_INDEXES.split(";"):
+        stmt = "\n".join(l for l in stmt.splitlines() if not l.strip().startswith("--")).strip()
+        if stmt:
+            conn.execute(stmt)
+    conn.execute("ANALYZE")
+
+
+def _won(ref, team):
+    # flatten_match stores a missing winner as '', which must not match a missing team
+    return f"IFNULL({ref}.winner <> '' AND {ref}.winner = {team}, 0)"
+
+
+def _results_add(ref):
+    """Trigger statements adding row `ref` (NEW/OLD) to team_results and head_to_head.
+
+    An empty team name ('' when the feed has none) is not a team.
+    """
+    a, b = f"MIN({ref}.team1, {ref}.team2)", f"MAX({ref}.team1, {ref}.team2)"
+    return f"""
+    INSERT INTO team_results (team, matches, wins)
+        SELECT {ref}.team1, 1, {_won(ref, f"{ref}.team1")} WHERE IFNULL({ref}.team1, '') <> ''
+        ON CONFLICT (team) DO UPDATE SET matches = matches + 1, wins = wins + excluded.wins;
+    INSERT INTO team_results (team, matches, wins)
+        SELECT {ref}.team2, 1, {_won(ref, f"{ref}.team2")} WHERE IFNULL({ref}.team2, '') <> ''
+        ON CONFLICT (team) DO UPDATE SET matches = matches + 1, wins = wins + excluded.wins;
+    INSERT INTO head_to_head (team_a, team_b, matches, wins_a, wins_b)
+        SELECT {a}, {b}, 1, {_won(ref, a)}, {_won(ref, b)}
+        WHERE IFNULL({ref}.team1, '') <> '' AND IFNULL({ref}.team2, '') <> ''
+        ON CONFLICT (team_a, team_b) DO UPDATE SET matches = matches + 1,
+            wins_a = wins_a + excluded.wins_a, wins_b = wins_b + excluded.wins_b;"""
+
+
+def _results_remove(ref):
+    a, b = f"MIN({ref}.team1, {ref}.team2)", f"MAX({ref}.team1, {ref}.team2)"
+    return f"""
+    UPDATE team_results SET matches = matches - 1, wins = wins - {_won(ref, f"{ref}.team1")}
+        WHERE team = {ref}.team1 AND {ref}.team1 <> '';
+    UPDATE team_results SET matches = matches - 1, wins = wins - {_won(ref, f"{ref}.team2")}
+        WHERE team = {ref}.team2 AND {ref}.team2 <> '';
+    UPDATE head_to_head SET matches = matches - 1,
+        wins_a = wins_a - {_won(ref, a)}, wins_b = wins_b - {_won(ref, b)}
+        WHERE team_a = {a} AND team_b = {b} AND {ref}.team1 <> '' AND {ref}.team2 <> '';
+    DELETE FROM team_results WHERE team IN ({ref}.team1, {ref}.team2) AND matches <= 0;
+    DELETE FROM head_to_head WHERE team_a = {a} AND team_b = {b} AND matches <= 0;"""
+
+
+def _v3_team_results(conn):
+    from utils.status_parser import parse_status
+    from utils.team_results import rebuild_team_results
+
+    # rows stored before the status parser existed have no winner yet; fill it in
+    # so the summaries start out right (this also reopens rows the old keyword
+    # list marked complete at stumps)
+    todo = conn.execute(
+        "SELECT match_id, status FROM live_matches WHERE IFNULL(winner, '') = '' AND IFNULL(status, '') <> ''"
+    ).fetchall()
+    conn.executemany(
+        "UPDATE live_matches SET winner=?, victory_type=?, victory_margin=?, is_complete=? WHERE match_id=?",
+        [(*parse_status(status), match_id) for match_id, status in todo],
+    )
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS team_results (
+        team TEXT PRIMARY KEY,
+        matches INTEGER NOT NULL,
+        wins INTEGER NOT NULL
+    ) WITHOUT ROWID""")
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS head_to_head (
+        team_a TEXT NOT NULL,              -- team_a < team_b
+        team_b TEXT NOT NULL,
+        matches INTEGER NOT NULL,
+        wins_a INTEGER NOT NULL,
+        wins_b INTEGER NOT NULL,
+        PRIMARY KEY (team_a, team_b)
+    ) WITHOUT ROWID""")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_team_results_wins ON team_results (wins DESC)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_head_to_head_matches ON head_to_head (matches DESC)")
+    conn.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS trg_live_matches_results_ins AFTER INSERT ON live_matches
+    BEGIN{_results_add("NEW")}
+    END""")
+    conn.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS trg_live_matches_results_del AFTER DELETE ON live_matches
+    BEGIN{_results_remove("OLD")}
+    END""")
+    conn.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS trg_live_matches_results_upd AFTER UPDATE OF team1, team2, winner ON live_matches
+    WHEN OLD.team1 IS NOT NEW.team1 OR OLD.team2 IS NOT NEW.team2 OR OLD.winner IS NOT NEW.winner
+    BEGIN{_results_remove("OLD")}{_results_add("NEW")}
+    END""")
+    rebuild_team_results(conn)
+
+
+_V4_ANALYTICS = """
+CREATE TABLE IF NOT EXISTS teams (
+    team_id INTEGER PRIMARY KEY,
+    team_name TEXT NOT NULL UNIQUE,
+    country TEXT
+);
+CREATE TABLE IF NOT EXISTS venues (
+    venue_id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    city TEXT NOT NULL DEFAULT '',
+    country TEXT,
+    capacity INTEGER,
+    UNIQUE (name, city)
+);
+CREATE TABLE IF NOT EXISTS series (
+    series_id INTEGER PRIMARY KEY,
+    series_name TEXT NOT NULL UNIQUE,
+    host_country TEXT,
+    match_type TEXT,
+    start_date TEXT,
+    planned_matches INTEGER
+);
+CREATE TABLE IF NOT EXISTS players (
+    player_id INTEGER PRIMARY KEY,
+    full_name TEXT NOT NULL UNIQUE,
+    country TEXT,
+    playing_role TEXT,
+    batting_style TEXT,
+    bowling_style TEXT
+);
+CREATE TABLE IF NOT EXISTS matches (
+    match_id INTEGER PRIMARY KEY,
+    cb_match_id TEXT NOT NULL UNIQUE,      -- live_matches.match_id
+    series_id INTEGER REFERENCES series (series_id),
+    team1_id INTEGER REFERENCES teams (team_id),
+    team2_id INTEGER REFERENCES teams (team_id),
+    venue_id INTEGER REFERENCES venues (venue_id),
+    match_desc TEXT,
+    match_date TEXT,                       -- 'YYYY-MM-DD HH:MM:SS' UTC
+    format TEXT,                           -- 'Test' / 'ODI' / 'T20I' / feed value
+    match_status TEXT,                     -- 'Complete' / 'Live'
+    winner_team_id INTEGER REFERENCES teams (team_id),
+    result_type TEXT,
+    result_margin INTEGER,
+    toss_winner_id INTEGER REFERENCES teams (team_id),
+    toss_decision TEXT,
+    source_hash TEXT
+);
+CREATE TABLE IF NOT EXISTS player_innings (
+    innings_id INTEGER PRIMARY KEY,
+    match_id INTEGER NOT NULL REFERENCES matches (match_id),
+    player_id INTEGER NOT NULL REFERENCES players (player_id),
+    team_id INTEGER REFERENCES teams (team_id),
+    innings_no INTEGER,
+    format TEXT,
+    runs INTEGER,
+    balls INTEGER,
+    not_out INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS bowling_figures (
+    figure_id INTEGER PRIMARY KEY,
+    match_id INTEGER NOT NULL REFERENCES matches (match_id),
+    player_id INTEGER NOT NULL REFERENCES players (player_id),
+    venue_id INTEGER REFERENCES venues (venue_id),
+    innings_no INTEGER,
+    format TEXT,
+    overs REAL,                            -- decimal overs: "3.4" is stored as 3.667
+    runs_conceded INTEGER,
+    wickets INTEGER
+);
+CREATE TABLE IF NOT EXISTS partnerships (
+    partnership_id INTEGER PRIMARY KEY,
+    match_id INTEGER NOT NULL REFERENCES matches (match_id),
+    innings_no INTEGER,
+    player_a_id INTEGER NOT NULL REFERENCES players (player_id),   -- player_a_id < player_b_id
+    player_b_id INTEGER NOT NULL REFERENCES players (player_id),
+    runs INTEGER,
+    balls INTEGER
+);
+CREATE TABLE IF NOT EXISTS player_fielding (
+    match_id INTEGER NOT NULL REFERENCES matches (match_id),
+    player_id INTEGER NOT NULL REFERENCES players (player_id),
+    catches INTEGER NOT NULL DEFAULT 0,
+    stumpings INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (match_id, player_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS player_career_stats (
+    player_id INTEGER NOT NULL REFERENCES players (player_id),
+    format TEXT NOT NULL,
+    matches INTEGER,
+    innings INTEGER,
+    total_runs INTEGER,
+    batting_average REAL,
+    strike_rate REAL,
+    centuries INTEGER,
+    half_centuries INTEGER,
+    total_wickets INTEGER,
+    bowling_average REAL,
+    economy REAL,
+    PRIMARY KEY (player_id, format)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS etl_state (
+    name TEXT PRIMARY KEY,
+    watermark TEXT,
+    loaded_at TEXT,
+    tombstone_seq INTEGER                  -- last live_matches_tombstones.seq applied (NULL: compare every match)
+);
+-- deleted live_matches rows (and rows whose start moved to another year), so
+-- incremental consumers (the ETL, columnar exports) find them by seeking past
+-- their last seq instead of diffing every match
+CREATE TABLE IF NOT EXISTS live_matches_tombstones (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    match_id TEXT NOT NULL,
+    series_name TEXT,
+    start_ts INTEGER,                      -- where the row was (its export partition is the year)
+    removed_at TEXT NOT NULL
+);
+-- covering indexes for the joins/filters in pages/sql_queries.py
+CREATE INDEX IF NOT EXISTS idx_matches_date ON matches (match_date, format);
+CREATE INDEX IF NOT EXISTS idx_matches_team1 ON matches (team1_id, winner_team_id);
+CREATE INDEX IF NOT EXISTS idx_matches_team2 ON matches (team2_id, winner_team_id);
+CREATE INDEX IF NOT EXISTS idx_matches_winner ON matches (winner_team_id);
+CREATE INDEX IF NOT EXISTS idx_matches_series ON matches (series_id);
+CREATE INDEX IF NOT EXISTS idx_matches_venue ON matches (venue_id);
+CREATE INDEX IF NOT EXISTS idx_matches_format ON matches (format, match_id);
+CREATE INDEX IF NOT EXISTS idx_player_innings_player ON player_innings (player_id, match_id, runs, balls);
+CREATE INDEX IF NOT EXISTS idx_player_innings_match ON player_innings (match_id);
+CREATE INDEX IF NOT EXISTS idx_player_innings_format ON player_innings (format, runs);
+CREATE INDEX IF NOT EXISTS idx_bowling_player ON bowling_figures (player_id, venue_id, match_id, overs, runs_conceded, wickets);
+CREATE INDEX IF NOT EXISTS idx_bowling_match ON bowling_figures (match_id);
+CREATE INDEX IF NOT EXISTS idx_partnerships_pair ON partnerships (player_a_id, player_b_id, runs);
+CREATE INDEX IF NOT EXISTS idx_partnerships_match ON partnerships (match_id);
+CREATE INDEX IF NOT EXISTS idx_partnerships_runs ON partnerships (runs);
+CREATE INDEX IF NOT EXISTS idx_player_fielding_player ON player_fielding (player_id, catches, stumpings);
+CREATE INDEX IF NOT EXISTS idx_career_format_runs ON player_career_stats (format, total_runs DESC);
+CREATE INDEX IF NOT EXISTS idx_players_country ON players (country);
+CREATE INDEX IF NOT EXISTS idx_players_role ON players (playing_role);
+CREATE INDEX IF NOT EXISTS idx_venues_capacity ON venues (capacity);
+CREATE INDEX IF NOT EXISTS idx_series_start ON series (start_date);
+"""
+
+
+def _v4_analytics_tables(conn):
+    # scripts/seed_db.py used to write a flat demo `matches` table; keep it out of the way
+    cols = {r[1] for r in conn.execute("PRAGMA table_info(matches)")}
+    if cols and "cb_match_id" not in cols:
+        conn.execute("ALTER TABLE matches RENAME TO matches_legacy")
+    for stmt in _V4_ANALYTICS.split(";"):
+        stmt = "\n".join(l for l in stmt.splitlines() if not l.strip().startswith("--")).strip()
+        if stmt:
+            conn.execute(stmt)
+    conn.execute("""
+    CREATE TRIGGER IF NOT EXISTS trg_live_matches_tombstone_del AFTER DELETE ON live_matches
+    BEGIN
+        INSERT INTO live_matches_tombstones (match_id, series_name, start_ts, removed_at)
+        VALUES (OLD.match_id, OLD.series_name, OLD.start_ts, strftime('%Y-%m-%dT%H:%M:%SZ', 'now'));
+    END""")
+    # a row whose start moved to another year left its columnar partition
+    # (utils/columnar.py); the ETL keeps it, since the match still exists
+    conn.execute("""
+    CREATE TRIGGER IF NOT EXISTS trg_live_matches_tombstone_move AFTER UPDATE OF start_ts ON live_matches
+    WHEN strftime('%Y', OLD.start_ts / 1000, 'unixepoch') IS NOT strftime('%Y', NEW.start_ts / 1000, 'unixepoch')
+    BEGIN
+        INSERT INTO live_matches_tombstones (match_id, series_name, start_ts, removed_at)
+        VALUES (OLD.match_id, OLD.series_name, OLD.start_ts, strftime('%Y-%m-%dT%H:%M:%SZ', 'now'));
+    END""")
+    # rows from before updated_at was always set; a watermark comparison never matches NULL
+    conn.execute("UPDATE live_matches SET updated_at = strftime('%Y-%m-%dT%H:%M:%SZ', 'now') WHERE updated_at IS NULL")
+
+
+def _history_add():
+    """Trigger statements recording NEW.status in match_state_history if it isn't the last one recorded.
+
+    Upsert clauses rather than OR IGNORE/OR REPLACE: a trigger's conflict
+    algorithm is overridden by the firing statement's (the poller's upsert).
+    ts has one-second resolution, so seq numbers the transitions of a match
+    within the same second instead of one overwriting the other.
+    """
+    return """
+    INSERT INTO status_strings (status) SELECT NEW.status WHERE true
+        ON CONFLICT (status) DO NOTHING;
+    INSERT INTO match_state_history (match_id, ts, seq, status_id, is_complete)
+        SELECT NEW.match_id, t.ts,
+               (SELECT IFNULL(MAX(seq) + 1, 0) FROM match_state_history WHERE match_id = NEW.match_id AND ts = t.ts),
+               s.status_id, NEW.is_complete
+        FROM status_strings s,
+             (SELECT COALESCE(CAST(strftime('%s', NEW.updated_at) AS INTEGER),
+                              CAST(strftime('%s', 'now') AS INTEGER)) AS ts) t
+        WHERE s.status = NEW.status
+          AND s.status_id IS NOT (SELECT status_id FROM match_state_history
+                                  WHERE match_id = NEW.match_id ORDER BY ts DESC, seq DESC LIMIT 1)
+        ON CONFLICT (match_id, ts, seq) DO NOTHING;"""
+
+
+def _v5_match_state_history(conn):
+    from utils.match_history import backfill_history
+
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS status_strings (
+        status_id INTEGER PRIMARY KEY,
+        status TEXT NOT NULL UNIQUE
+    )""")
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS match_state_history (
+        match_id TEXT NOT NULL,
+        ts INTEGER NOT NULL,               -- unix seconds (live_matches.updated_at)
+        seq INTEGER NOT NULL DEFAULT 0,    -- order of transitions within the same second
+        status_id INTEGER NOT NULL REFERENCES status_strings (status_id),
+        is_complete INTEGER,
+        PRIMARY KEY (match_id, ts, seq)
+    ) WITHOUT ROWID""")
+    # covering index for time-window queries, in their ORDER BY order
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_match_state_history_ts "
+                 "ON match_state_history (ts, match_id, seq, status_id, is_complete)")
+    conn.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS trg_live_matches_history_ins AFTER INSERT ON live_matches
+    WHEN NEW.status IS NOT NULL
+    BEGIN{_history_add()}
+    END""")
+    conn.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS trg_live_matches_history_upd AFTER UPDATE OF status ON live_matches
+    WHEN NEW.status IS NOT NULL AND OLD.status IS NOT NEW.status
+    BEGIN{_history_add()}
+    END""")
+    backfill_history(conn)
+
+
+def _v6_leaderboards(conn):
+    from utils.leaderboards import rebuild_leaderboards
+
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS leaderboards (
+        board TEXT NOT NULL,               -- 'runs' / 'wickets' / 'batting_average' / 'economy'
+        format TEXT NOT NULL,
+        rank INTEGER NOT NULL,
+        player_id INTEGER NOT NULL REFERENCES players (player_id),
+        value REAL,
+        PRIMARY KEY (board, format, rank)
+    ) WITHOUT ROWID""")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_career_format_wickets ON player_career_stats (format, total_wickets DESC)")
+    rebuild_leaderboards(conn)
+
+
+def _stats_add(ref):
+    """Trigger statements counting row `ref` (NEW/OLD) into db_stats / db_stats_formats."""
+    return f"""
+    UPDATE db_stats SET matches = matches + 1,
+        live = live + (IFNULL({ref}.is_complete, 0) = 0), complete = complete + IFNULL({ref}.is_complete = 1, 0)
+        WHERE id = 1;
+    INSERT INTO db_stats_formats (match_format, matches) VALUES (IFNULL({ref}.match_format, ''), 1)
+        ON CONFLICT (match_format) DO UPDATE SET matches = matches + 1;"""
+
+
+def _stats_remove(ref):
+    return f"""
+    UPDATE db_stats SET matches = matches - 1,
+        live = live - (IFNULL({ref}.is_complete, 0) = 0), complete = complete - IFNULL({ref}.is_complete = 1, 0)
+        WHERE id = 1;
+    UPDATE db_stats_formats SET matches = matches - 1 WHERE match_format = IFNULL({ref}.match_format, '');
+    DELETE FROM db_stats_formats WHERE match_format = IFNULL({ref}.match_format, '') AND matches <= 0;"""
+
+
+# every change bumps the counter; MAX(updated_at) is an index lookup (idx_live_matches_updated)
+# when it can go down, and a comparison when it can only go up
+_STATS_TOUCH = """
+    UPDATE db_stats SET changes = changes + 1, changed_at = strftime('%Y-%m-%dT%H:%M:%SZ', 'now'),
+        last_updated_at = {last} WHERE id = 1;"""
+_LAST_UPDATED_SCAN = "(SELECT MAX(updated_at) FROM live_matches)"
+_LAST_UPDATED_INS = "COALESCE(MAX(last_updated_at, NEW.updated_at), NEW.updated_at, last_updated_at)"
+_LAST_UPDATED_UPD = f"""CASE WHEN NEW.updated_at >= OLD.updated_at
+            THEN COALESCE(MAX(last_updated_at, NEW.updated_at), NEW.updated_at)
+            ELSE {_LAST_UPDATED_SCAN} END"""
+
+
+def _v7_db_stats(conn):
+    from utils.db_stats import rebuild_db_stats
+
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS db_stats (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        matches INTEGER NOT NULL,
+        live INTEGER NOT NULL,             -- is_complete 0 / NULL
+        complete INTEGER NOT NULL,
+        last_updated_at TEXT,              -- MAX(live_matches.updated_at)
+        changes INTEGER NOT NULL,          -- bumped on every change to live_matches
+        changed_at TEXT                    -- wall clock of the last change
+    )""")
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS db_stats_formats (
+        match_format TEXT PRIMARY KEY,     -- '' when unknown
+        matches INTEGER NOT NULL
+    ) WITHOUT ROWID""")
+    conn.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS trg_live_matches_stats_ins AFTER INSERT ON live_matches
+    BEGIN{_stats_add("NEW")}{_STATS_TOUCH.format(last=_LAST_UPDATED_INS)}
+    END""")
+    conn.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS trg_live_matches_stats_del AFTER DELETE ON live_matches
+    BEGIN{_stats_remove("OLD")}{_STATS_TOUCH.format(last=_LAST_UPDATED_SCAN)}
+    END""")
+    conn.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS trg_live_matches_stats_upd AFTER UPDATE ON live_matches
+    BEGIN{_STATS_TOUCH.format(last=_LAST_UPDATED_UPD)}
+    END""")
+    conn.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS trg_live_matches_stats_counts_upd AFTER UPDATE OF is_complete, match_format ON live_matches
+    WHEN OLD.is_complete IS NOT NEW.is_complete OR OLD.match_format IS NOT NEW.match_format
+    BEGIN{_stats_remove("OLD")}{_stats_add("NEW")}
+    END""")
+    rebuild_db_stats(conn)
+
+
+# (version, description, callable) — append only; never edit a released migration
+MIGRATIONS = [
+    (1, "live_matches full schema + scorecard tables", _v1_base_tables),
+    (2, "indexes for sort key, series, updated_at, team pair", _v2_indexes),
+    (3, "team_results / head_to_head summaries maintained by triggers", _v3_team_results),
+    (4, "normalized analytics tables for the SQL Queries templates + ETL tombstones", _v4_analytics_tables),
+    (5, "append-only match_state_history of status transitions", _v5_match_state_history),
+    (6, "top-N leaderboards per format, maintained from player_career_stats", _v6_leaderboards),
+    (7, "db_stats summary row of live_matches maintained by triggers", _v7_db_stats),
+]
+
+
+def current_version(conn):
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS schema_version (
+        version INTEGER PRIMARY KEY,
+        description TEXT,
+        applied_at TEXT
+    )""")
+    row = conn.execute("SELECT MAX(version) FROM schema_version").fetchone()
+    return row[0] or 0
+
+
+def migrate(conn):
+    """Apply pending migrations; returns the resulting schema version."""
+    version = current_version(conn)
+    for v, description, apply in MIGRATIONS:
+        if v <= version:
+            continue
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # another process may have migrated while we waited for the lock
+            if current_version(conn) >= v:
+                conn.rollback()
+                continue
+            apply(conn)
+            conn.execute(
+                "INSERT INTO schema_version (version, description, applied_at) VALUES (?, ?, ?)",
+                (v, description, datetime.utcnow().isoformat(timespec="seconds") + "Z"),
+            )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        version = v
+    return version
+
+
+_migrated = set()
+_migrate_lock = threading.Lock()
+
+def ensure_schema(db_path=DB_PATH):
+    """Run migrations once per process for `db_path`."""
+    if db_path in _migrated:
+        return
+    with _migrate_lock:
+        if db_path in _migrated:
+            return
+        with sqlite3.connect(db_path) as conn:
+            migrate(conn)
+        _migrated.add(db_path)
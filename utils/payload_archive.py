@@ -0,0 +1,276 @@
+# utils/payload_archive.py
+"""Content-addressed, compressed archive of every raw live-feed payload.
+
+flatten_match keeps a dozen columns; the rest of each match object (toss,
+innings scores, state titles, ...) is kept here so new columns can be
+backfilled without re-fetching. A payload is split into
+
+  - one fragment per match object, and
+  - a skeleton: the payload with every match replaced by {"$frag": "<hash>"},
+
+each stored once under the blake2b hash of its canonical JSON and compressed
+(zlib, or lzma for a smaller cold archive). Between polls most matches don't
+change, so a new payload usually adds only its skeleton and the few fragments
+that moved. archive_payloads records each fetch (time, body digest, skeleton).
+
+The archive is its own SQLite file (ARCHIVE_PATH, next to the app DB) with a
+single writer, the poller, which feeds a PayloadWriter the match objects its
+streaming parse yields (feed_stream.ingest_stream) rather than decoding the
+body again; scripts/archive.py adds files, rebuilds payloads and re-runs
+flatten_match over the whole archive (reindex).
+"""
+import hashlib
+import json
+import lzma
+import sqlite3
+import threading
+import time
+import zlib
+
+from utils.config import ARCHIVE_PATH
+
+DEFAULT_CODEC = "zlib"
+FRAGMENT_REF = "$frag"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS archive_fragments (
+    hash BLOB PRIMARY KEY,               -- blake2b-128 of the canonical JSON
+    codec TEXT NOT NULL,                 -- 'zlib' / 'lzma' / 'none'
+    raw_size INTEGER NOT NULL,
+    data BLOB NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS archive_payloads (
+    payload_id INTEGER PRIMARY KEY,
+    fetched_at INTEGER NOT NULL,         -- unix seconds
+    digest TEXT,                         -- sha1 of the body as received
+    body_size INTEGER NOT NULL,
+    skeleton BLOB NOT NULL REFERENCES archive_fragments (hash)
+);
+CREATE TABLE IF NOT EXISTS archive_items (
+    payload_id INTEGER NOT NULL REFERENCES archive_payloads (payload_id),
+    pos INTEGER NOT NULL,
+    series_name TEXT NOT NULL,
+    fragment BLOB NOT NULL REFERENCES archive_fragments (hash),
+    PRIMARY KEY (payload_id, pos)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_archive_payloads_fetched ON archive_payloads (fetched_at);
+"""
+
+CODECS = {
+    "zlib": (lambda b: zlib.compress(b, 6), zlib.decompress),
+    "lzma": (lambda b: lzma.compress(b, preset=6), lzma.decompress),
+    "none": (bytes, bytes),
+}
+
+
+def canonical(obj):
+    return json.dumps(obj, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def fragment_hash(data):
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+def split_payload(doc):
+    """(skeleton, [(series_name, match), ...]) for a decoded live-feed payload.
+
+    Walks typeMatches -> seriesMatches -> seriesAdWrapper -> matches like
+    flatten_payload; the skeleton is a copy of `doc` whose match objects are
+    placeholders {"$frag": i} indexing into the returned list.
+    """
+    matches = []
+    skeleton = dict(doc)
+    skeleton["typeMatches"] = []
+    for t in doc.get("typeMatches", []) or []:
+        t = dict(t)
+        series_list = []
+        for s in t.get("seriesMatches", []) or []:
+            s = dict(s)
+            adw = s.get("seriesAdWrapper")
+            if isinstance(adw, dict):
+                adw = dict(adw)
+                if isinstance(adw.get("matches"), list):
+                    refs = []
+                    for m in adw["matches"]:
+                        refs.append({FRAGMENT_REF: len(matches)})
+                        matches.append((adw.get("seriesName") or "", m))
+                    adw["matches"] = refs
+                s["seriesAdWrapper"] = adw
+            series_list.append(s)
+        if "seriesMatches" in t:
+            t["seriesMatches"] = series_list
+        skeleton["typeMatches"].append(t)
+    if "typeMatches" not in doc:
+        del skeleton["typeMatches"]
+    return skeleton, matches
+
+
+def _fill(node, fragments):
+    if isinstance(node, dict):
+        if len(node) == 1 and FRAGMENT_REF in node:
+            return fragments[node[FRAGMENT_REF]]
+        return {k: _fill(v, fragments) for k, v in node.items()}
+    if isinstance(node, list):
+        return [_fill(v, fragments) for v in node]
+    return node
+
+
+class PayloadArchive:
+    """Reads and (from one thread at a time) writes an archive file."""
+
+    def __init__(self, path=ARCHIVE_PATH, codec=DEFAULT_CODEC, read_only=False):
+        if codec not in CODECS:
+            raise ValueError(f"unknown codec {codec!r} (expected one of {', '.join(CODECS)})")
+        self.path = path
+        self.codec = codec
+        if read_only:
+            self.conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+        else:
+            self.conn = sqlite3.connect(path, check_same_thread=False)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+    # --- writing ---
+    def _put(self, obj):
+        """Store one fragment if new; returns (hash, stored bytes added)."""
+        raw = canonical(obj)
+        h = fragment_hash(raw)
+        if self.conn.execute("SELECT 1 FROM archive_fragments WHERE hash = ?", (h,)).fetchone():
+            return h, 0
+        data = CODECS[self.codec][0](raw)
+        self.conn.execute("INSERT INTO archive_fragments (hash, codec, raw_size, data) VALUES (?, ?, ?, ?)",
+                          (h, self.codec, len(raw), data))
+        return h, len(data)
+
+    def add(self, body, fetched_at=None, digest=None):
+        """Archive one payload body (bytes); returns payload_id, matches, new fragments and bytes stored."""
+        skeleton, matches = split_payload(json.loads(body))
+        writer = self.writer(fetched_at)
+        for series_name, m in matches:
+            writer.add(series_name, m)
+        if writer.error is not None:
+            raise writer.error
+        writer.skeleton = skeleton
+        return writer.finish(len(body), digest or hashlib.sha1(body).hexdigest())
+
+    def writer(self, fetched_at=None):
+        """A PayloadWriter archiving one payload from its match objects as a parser yields them."""
+        return PayloadWriter(self, fetched_at)
+
+    # --- reading ---
+    def fragment(self, h):
+        row = self.conn.execute("SELECT codec, data FROM archive_fragments WHERE hash = ?", (h,)).fetchone()
+        if row is None:
+            raise KeyError(h.hex())
+        return json.loads(CODECS[row[0]][1](row[1]))
+
+    def payloads(self, since=None):
+        """[(payload_id, fetched_at), ...] oldest first, optionally from unix time `since`."""
+        return self.conn.execute(
+            "SELECT payload_id, fetched_at FROM archive_payloads WHERE fetched_at >= ? ORDER BY fetched_at, payload_id",
+            (since or 0,)).fetchall()
+
+    def items(self, payload_id):
+        """[(series_name, fragment hash), ...] in payload order."""
+        return self.conn.execute(
+            "SELECT series_name, fragment FROM archive_items WHERE payload_id = ? ORDER BY pos",
+            (payload_id,)).fetchall()
+
+    def rebuild(self, payload_id):
+        """The payload as a dict (equal to the fetched JSON; key order aside)."""
+        row = self.conn.execute("SELECT skeleton FROM archive_payloads WHERE payload_id = ?", (payload_id,)).fetchone()
+        if row is None:
+            raise KeyError(payload_id)
+        fragments = [self.fragment(h) for _, h in self.items(payload_id)]
+        return _fill(self.fragment(row[0]), fragments)
+
+    def stats(self):
+        payloads, body_bytes = self.conn.execute(
+            "SELECT COUNT(*), IFNULL(SUM(body_size), 0) FROM archive_payloads").fetchone()
+        fragments, raw, stored = self.conn.execute(
+            "SELECT COUNT(*), IFNULL(SUM(raw_size), 0), IFNULL(SUM(LENGTH(data)), 0) FROM archive_fragments").fetchone()
+        items = self.conn.execute("SELECT COUNT(*) FROM archive_items").fetchone()[0]
+        return {
+            "payloads": payloads,
+            "match_items": items,
+            "fragments": fragments,
+            "body_bytes": body_bytes,
+            "fragment_raw_bytes": raw,
+            "stored_bytes": stored,
+            "ratio": round(body_bytes / stored, 1) if stored else None,
+        }
+
+    def close(self):
+        self.conn.close()
+
+
+class PayloadWriter:
+    """One payload being archived: add() each (series_name, match) in order, fill
+    `skeleton` (as split_payload builds it), then finish().
+
+    Fragments are written as they arrive, in a transaction finish() commits, so
+    neither the body nor the decoded document is held whole. A failed write
+    doesn't interrupt the caller's parse: the payload is dropped and finish()
+    reports the error.
+    """
+
+    def __init__(self, archive, fetched_at=None):
+        self.archive = archive
+        self.fetched_at = int(fetched_at if fetched_at is not None else time.time())
+        self.skeleton = {}
+        self.error = None
+        self._items = []      # (series_name, fragment hash)
+        self._new = self._added = 0
+
+    def add(self, series_name, match):
+        if self.error is not None:
+            return
+        try:
+            with self.archive._lock:
+                h, n = self.archive._put(match)
+        except sqlite3.Error as e:
+            self.abort(e)
+            return
+        self._items.append((series_name, h))
+        self._added += n
+        self._new += bool(n)
+
+    def abort(self, error=None):
+        """Drop what was written so far (the parse failed, or a write did)."""
+        self.error = error or RuntimeError("payload archiving was aborted")
+        self._items = []
+        with self.archive._lock:
+            try:
+                self.archive.conn.rollback()
+            except sqlite3.Error:
+                pass    # nothing to undo if the connection itself failed
+
+    def finish(self, body_size, digest=None):
+        """Store the skeleton and the payload row; returns payload_id, matches, new fragments and bytes stored."""
+        if self.error is not None:
+            return {"error": str(self.error)}
+        conn = self.archive.conn
+        with self.archive._lock, conn:
+            skel_hash, n = self.archive._put(self.skeleton)
+            payload_id = conn.execute(
+                "INSERT INTO archive_payloads (fetched_at, digest, body_size, skeleton) VALUES (?, ?, ?, ?)",
+                (self.fetched_at, digest, body_size, skel_hash)).lastrowid
+            conn.executemany(
+                "INSERT INTO archive_items (payload_id, pos, series_name, fragment) VALUES (?, ?, ?, ?)",
+                [(payload_id, i, series, h) for i, (series, h) in enumerate(self._items)])
+        return {"payload_id": payload_id, "matches": len(self._items), "new_fragments": self._new,
+                "stored_bytes": self._added + n}
+
+
+_archive = None
+_archive_lock = threading.Lock()
+
+def get_archive(path=ARCHIVE_PATH):
+    """Process-wide archive writer (the poller's)."""
+    global _archive
+    with _archive_lock:
+        if _archive is None or _archive.path != path:
+            _archive = PayloadArchive(path)
+        return _archive
@@ -0,0 +1,250 @@
+# utils/poller.py
+"""Background ingestion worker: polls LIVE_URL on a schedule and upserts into live_matches.
+
+One poller runs per Streamlit server process (see get_poller), so page reruns
+only read the DB and never wait on RapidAPI. By default the interval adapts to
+match state (utils/scheduler.py); set_interval() switches to a fixed interval.
+"""
+import threading
+import time
+from concurrent.futures import TimeoutError as FutureTimeout
+from datetime import datetime
+
+from utils.columnar import export_incremental
+from utils.config import ARCHIVE_PATH, COLUMNAR_DIR, DB_PATH, get_monthly_quota
+from utils.db_connection import read_conn
+from utils.etl import load_incremental
+from utils.feed_stream import ingest_stream
+from utils.live_feed import apply_upsert, fetch_live_payload
+from utils.live_snapshot import get_live_snapshots
+from utils.payload_archive import get_archive
+from utils.scheduler import AdaptiveSchedule
+from utils.write_queue import get_write_queue
+
+DEFAULT_INTERVAL = 60   # seconds between polls in fixed mode
+MIN_INTERVAL = 10       # don't let anyone hammer the free plan
+WRITE_TIMEOUT_S = 120   # longest wait for the writer queue before the poll is failed
+
+
+def _utc_now():
+    return datetime.utcnow().isoformat(timespec="seconds") + "Z"
+
+def _iso(ts):
+    return datetime.utcfromtimestamp(ts).isoformat(timespec="seconds") + "Z"
+
+
+class LivePoller:
+    """Daemon thread that fetches, flattens and stores live matches on a schedule."""
+
+    def __init__(self, interval=DEFAULT_INTERVAL, db_path=DB_PATH, schedule=None, archive_path=ARCHIVE_PATH,
+                 columnar_dir=COLUMNAR_DIR):
+        self.db_path = db_path
+        self.archive_path = archive_path
+        self.columnar_dir = columnar_dir
+        self.schedule = schedule or AdaptiveSchedule()
+        self.adaptive = True
+        self._interval = max(MIN_INTERVAL, int(interval))
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._poll_requested = False
+        self._last_digest = None   # body hash of the last payload we ingested
+        self._status = {
+            "last_run_at": None,
+            "last_ok": None,
+            "last_error": None,
+            "last_count": 0,
+            "last_changes": None,
+            "last_duration_s": None,
+            "runs": 0,
+            "errors": 0,
+            "unchanged": 0,
+            "next_run_at": None,
+        }
+
+    # --- scheduler API ---
+    def start(self):
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return False
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="live-poller", daemon=True)
+            self._thread.start()
+            return True
+
+    def stop(self, timeout=5):
+        self._stop.set()
+        self._wake.set()
+        thread = self._thread
+        if thread and thread.is_alive() and thread is not threading.current_thread():
+            thread.join(timeout)
+        with self._lock:
+            self._status["next_run_at"] = None
+
+    @property
+    def running(self):
+        return bool(self._thread and self._thread.is_alive())
+
+    @property
+    def interval(self):
+        return self._interval
+
+    def set_interval(self, seconds):
+        """Poll every `seconds` regardless of match state (fixed mode)."""
+        self._interval = max(MIN_INTERVAL, int(seconds))
+        self.adaptive = False
+        self._wake.set()  # reschedule the pending sleep
+
+    def set_adaptive(self, enabled=True):
+        self.adaptive = bool(enabled)
+        self._wake.set()
+
+    def run_now(self):
+        """Ask the worker to poll immediately (non-blocking)."""
+        self._poll_requested = True
+        self._wake.set()
+
+    def status(self):
+        with self._lock:
+            st = dict(self._status)
+        st["running"] = self.running
+        st["adaptive"] = self.adaptive
+        st["interval_s"] = self._interval
+        st["quota"] = self.schedule.report()
+        return st
+
+    # --- worker ---
+    def poll_once(self):
+        """Fetch + flatten + upsert once; records the outcome in status()."""
+        started = time.monotonic()
+        run_at = _utc_now()
+        try:
+            if not self.schedule.acquire():
+                raise RuntimeError("API quota exhausted; waiting for the token bucket to refill")
+            resp = fetch_live_payload(stream=True)
+            if resp.digest is not None and resp.digest == self._last_digest:
+                # 304 / cache hit for a payload we've already stored: nothing to parse
+                with self._lock:
+                    self._status.update(last_run_at=run_at, last_ok=True, last_error=None,
+                                        last_duration_s=round(time.monotonic() - started, 3))
+                    self._status["runs"] += 1
+                    self._status["unchanged"] += 1
+                return True
+            # rows are parsed and written batch by batch while the body downloads,
+            # and the archive is fed the same match objects
+            chunks = resp.iter_content()
+            archive = self._archive_writer()
+            try:
+                changes = ingest_stream(chunks, self._write_batch, archive=archive)
+                # the parser stops at the closing brace; read the tail so the body
+                # (and its digest, for the unchanged-payload check) is complete
+                for _ in chunks:
+                    pass
+            except BaseException:
+                if archive is not None:
+                    archive.abort()
+                raise
+            self._last_digest = resp.digest
+            changes["archive"] = self._finish_archive(archive, resp.size, resp.digest)
+            if changes["inserted"] or changes["updated"]:
+                # keep the normalized analytics tables in step with what just landed
+                changes["etl"] = self._write(load_incremental)
+                # swap in the pages' shared snapshot now, not on some viewer's rerun
+                changes["snapshot"] = self._refresh_snapshot()
+                changes["columnar"] = self._export_columnar()
+        except Exception as e:
+            with self._lock:
+                self._status.update(last_run_at=run_at, last_ok=False, last_error=str(e),
+                                    last_duration_s=round(time.monotonic() - started, 3))
+                self._status["runs"] += 1
+                self._status["errors"] += 1
+            return False
+        with self._lock:
+            self._status.update(last_run_at=run_at, last_ok=True, last_error=None,
+                                last_count=changes.pop("rows"), last_changes=changes,
+                                last_duration_s=round(time.monotonic() - started, 3))
+            self._status["runs"] += 1
+        return True
+
+    def _archive_writer(self):
+        # keeps every field flatten_match drops; losing one payload must not fail the poll
+        try:
+            return get_archive(self.archive_path).writer()
+        except Exception:
+            return None
+
+    def _finish_archive(self, archive, body_size, digest):
+        if archive is None:
+            return {"error": "payload archive unavailable"}
+        try:
+            return archive.finish(body_size, digest)
+        except Exception as e:
+            return {"error": str(e)}
+
+    def _refresh_snapshot(self):
+        # readers fall back to reloading it themselves, so a failure here is not fatal
+        try:
+            return len(get_live_snapshots(self.db_path).refresh())
+        except Exception as e:
+            return {"error": str(e)}
+
+    def _export_columnar(self):
+        # analytics snapshots are derived data: a failed export is retried on the next change
+        try:
+            with read_conn(self.db_path) as conn:
+                return export_incremental(conn, self.columnar_dir)
+        except Exception as e:
+            return {"error": str(e)}
+
+    def _write(self, fn, *args):
+        # a stuck writer (locked DB, failed group) fails this poll rather than hanging the thread
+        fut = get_write_queue(self.db_path).submit(fn, *args)
+        try:
+            return fut.result(WRITE_TIMEOUT_S)
+        except FutureTimeout:
+            fut.cancel()    # dropped if the writer hasn't picked it up yet
+            raise RuntimeError(f"database writer did not answer within {WRITE_TIMEOUT_S}s") from None
+
+    def _write_batch(self, rows):
+        # goes through the shared writer so it group-commits with CRUD writes
+        return self._write(apply_upsert, rows)
+
+    def _next_poll_at(self, last_poll):
+        now = time.time()
+        if last_poll is None:
+            return now
+        if self.adaptive:
+            try:
+                with read_conn(self.db_path) as conn:
+                    return self.schedule.next_poll_at(conn, last_poll, now)
+            except Exception:
+                pass  # fall back to the fixed interval
+        return max(last_poll + self._interval, now + self.schedule.bucket.time_until(1))
+
+    def _run(self):
+        last_poll = None
+        while not self._stop.is_set():
+            due = self._next_poll_at(last_poll)
+            if self._poll_requested or (due is not None and time.time() >= due):
+                self._poll_requested = False
+                self.poll_once()
+                last_poll = time.time()
+                due = self._next_poll_at(last_poll)
+            with self._lock:
+                self._status["next_run_at"] = _iso(due) if due is not None else None
+            # sleep until the next tick, or until run_now()/set_interval()/stop() wakes us
+            self._wake.wait(None if due is None else max(0.0, due - time.time()))
+            self._wake.clear()
+
+
+_poller = None
+_poller_lock = threading.Lock()
+
+def get_poller():
+    """Process-wide poller shared by every Streamlit session."""
+    global _poller
+    with _poller_lock:
+        if _poller is None:
+            _poller = LivePoller(schedule=AdaptiveSchedule(monthly_quota=get_monthly_quota()))
+        return _poller
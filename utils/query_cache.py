@@ -0,0 +1,139 @@
+# utils/query_cache.py
+"""In-memory result cache for the SQL template pages, invalidated by new data.
+
+Results are keyed on the normalized SQL text (comments and whitespace don't
+matter) plus the parameters, and are stamped with the DB's data version when
+they were computed. The data version is `PRAGMA data_version` read on one
+dedicated connection (it moves whenever any other connection, in this process
+or another one, commits) plus the write queue's commit generation. A hit
+is only served if nothing was committed since. Entries are also evicted by
+age and by a total-cell budget, oldest-used first.
+
+    from utils.query_cache import cached_query
+    df = cached_query("SELECT ...")
+"""
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from utils.config import DB_PATH
+from utils.db_connection import get_pool, read_conn
+
+MAX_ENTRIES = 64
+MAX_AGE_S = 600
+MAX_CELLS = 2_000_000       # rows x columns across all cached results
+
+_COMMENT_RE = re.compile(r"--[^\n]*|/\*.*?\*/", re.DOTALL)
+_STRING_RE = re.compile(r"('(?:[^']|'')*')")
+_WS_RE = re.compile(r"\s+")
+
+
+def normalize_sql(sql):
+    """Canonical form of a statement: no comments, single spaces, no trailing ';'.
+
+    String literals are left untouched so 'India' and 'india' stay different keys.
+    """
+    out = []
+    for i, part in enumerate(_STRING_RE.split(sql)):
+        if i % 2:
+            out.append(part)
+        else:
+            out.append(_WS_RE.sub(" ", _COMMENT_RE.sub(" ", part)))
+    return "".join(out).strip().rstrip(";").strip()
+
+
+class QueryCache:
+    def __init__(self, db_path=DB_PATH, max_entries=MAX_ENTRIES, max_age_s=MAX_AGE_S, max_cells=MAX_CELLS):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.max_age_s = max_age_s
+        self.max_cells = max_cells
+        self.stats = {"hits": 0, "misses": 0, "stale": 0, "evictions": 0}
+        self._entries = OrderedDict()   # key -> (version, created, cells, value)
+        self._cells = 0
+        self._lock = threading.Lock()
+        self._watch = None
+
+    def data_version(self):
+        """Token that changes whenever anything is committed to the DB."""
+        from utils.write_queue import get_write_queue
+        if self._watch is None:
+            get_pool(self.db_path)      # make sure the schema exists first
+            self._watch = sqlite3.connect(self.db_path, check_same_thread=False)
+        dv = self._watch.execute("PRAGMA data_version").fetchone()[0]
+        return dv, get_write_queue(self.db_path).generation
+
+    def _evict(self, now):
+        for key in [k for k, e in self._entries.items() if now - e[1] > self.max_age_s]:
+            self._cells -= self._entries.pop(key)[2]
+            self.stats["evictions"] += 1
+        # then least recently used first until both budgets fit
+        while self._entries and (len(self._entries) > self.max_entries or self._cells > self.max_cells):
+            _, entry = self._entries.popitem(last=False)
+            self._cells -= entry[2]
+            self.stats["evictions"] += 1
+
+    def fetch(self, key, compute, size=lambda df: df.size):
+        """Cached value for `key`, calling compute() on a miss.
+
+        `size(value)` is the value's cost in cells against the cell budget.
+        Exceptions from compute() propagate and nothing is cached.
+        """
+        now = time.monotonic()
+        with self._lock:
+            version = self.data_version()
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] == version and now - entry[1] <= self.max_age_s:
+                    self._entries.move_to_end(key)
+                    self.stats["hits"] += 1
+                    return entry[3]
+                self._cells -= entry[2]
+                del self._entries[key]
+                self.stats["stale"] += 1
+            self.stats["misses"] += 1
+        value = compute()
+        cells = size(value)
+        with self._lock:
+            if cells <= self.max_cells:
+                self._entries[key] = (version, now, cells, value)
+                self._cells += cells
+                self._evict(now)
+        return value
+
+    def get(self, sql, params=()):
+        """Cached DataFrame for `sql`, running it on a pooled reader on a miss."""
+        import pandas as pd
+
+        def run():
+            with read_conn(self.db_path) as conn:
+                return pd.read_sql_query(sql, conn, params=tuple(params) or None)
+
+        return self.fetch((normalize_sql(sql), tuple(params)), run)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._cells = 0
+
+    def report(self):
+        with self._lock:
+            total = self.stats["hits"] + self.stats["misses"]
+            return dict(self.stats, entries=len(self._entries), cells=self._cells,
+                        hit_rate=round(self.stats["hits"] / total, 3) if total else None)
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+def get_query_cache(db_path=DB_PATH):
+    with _caches_lock:
+        cache = _caches.get(db_path)
+        if cache is None:
+            cache = _caches[db_path] = QueryCache(db_path)
+        return cache
+
+def cached_query(sql, params=(), db_path=DB_PATH):
+    return get_query_cache(db_path).get(sql, params)
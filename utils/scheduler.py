@@ -0,0 +1,179 @@
+# utils/scheduler.py
+"""Adaptive poll scheduling for the live feed, bounded by the RapidAPI plan quota.
+
+The next poll interval is picked from what is already stored in live_matches:
+  - "live"    : an incomplete match has started and is in play  -> fast interval
+  - "waiting" : only toss / innings-break / stumps / rain rows are pending -> slow interval
+  - "idle"    : nothing live -> idle interval, or earlier at the next known start_ts
+A token bucket sized to the monthly quota caps the overall request rate.
+"""
+import re
+import threading
+import time
+
+DEFAULT_MONTHLY_QUOTA = 200           # free (Basic) RapidAPI plan
+QUOTA_PERIOD_S = 30 * 24 * 3600
+DEFAULT_FAST_S = 60
+DEFAULT_SLOW_S = 600
+DEFAULT_IDLE_S = 6 * 3600             # finds newly listed matches; ~120 requests a month when always idle
+LIVE_WINDOW_S = 5 * 24 * 3600         # a Test lasts at most 5 days; older incomplete rows are stale
+
+# Status text for matches that are pending but not in play
+WAITING_RE = re.compile(
+    r"\b(opt(ed)? to (bat|bowl)|innings break|stumps|rain|delayed|lunch|tea|toss|starts at|yet to begin)\b",
+    re.IGNORECASE,
+)
+
+
+class TokenBucket:
+    """Classic token bucket: `capacity` burst, refilled at `rate` tokens per second."""
+
+    def __init__(self, capacity, rate):
+        self.capacity = float(capacity)
+        self.rate = float(rate)
+        self._tokens = float(capacity)
+        self._stamp = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._stamp) * self.rate)
+        self._stamp = now
+
+    def try_take(self, n=1):
+        with self._lock:
+            self._refill()
+            if self._tokens >= n:
+                self._tokens -= n
+                return True
+            return False
+
+    def time_until(self, n=1):
+        """Seconds until `n` tokens are available (0 if they already are)."""
+        with self._lock:
+            self._refill()
+            missing = n - self._tokens
+        if missing <= 0:
+            return 0.0
+        return missing / self.rate if self.rate > 0 else float("inf")
+
+    @property
+    def tokens(self):
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+
+def classify_matches(conn, now=None):
+    """Count stored matches by poll state; also return the next known start (epoch seconds)."""
+    now = time.time() if now is None else now
+    try:
+        rows = conn.execute(
+            "SELECT status, start_ts FROM live_matches WHERE COALESCE(is_complete, 0) = 0"
+        ).fetchall()
+    except Exception:
+        rows = []
+    live = waiting = 0
+    next_start = None
+    for status, start_ts in rows:
+        # start_ts is ms since epoch in the feed; tolerate seconds too
+        start = None
+        if start_ts:
+            start = start_ts / 1000 if start_ts > 1_000_000_000_000 else start_ts
+        if start is not None and start > now:
+            next_start = start if next_start is None else min(next_start, start)
+            continue
+        if start is not None and now - start > LIVE_WINDOW_S:
+            continue
+        if not status or WAITING_RE.search(status):
+            waiting += 1
+        else:
+            live += 1
+    return {"live": live, "waiting": waiting, "next_start": next_start}
+
+
+class AdaptiveSchedule:
+    """Picks the next poll delay from match state and keeps requests inside the plan quota."""
+
+    def __init__(self, fast_s=DEFAULT_FAST_S, slow_s=DEFAULT_SLOW_S,
+                 monthly_quota=DEFAULT_MONTHLY_QUOTA, burst=5, idle_s=DEFAULT_IDLE_S):
+        self.fast_s = fast_s
+        self.slow_s = slow_s
+        self.idle_s = idle_s          # None = only at the next known start_ts while idle
+        self.burst = burst
+        self.set_quota(monthly_quota)
+        self._requests = []           # monotonic timestamps of requests in the current period
+        self._last_state = None
+        self._lock = threading.Lock()
+
+    def set_quota(self, monthly_quota, burst=None):
+        self.monthly_quota = int(monthly_quota)
+        if burst is not None:
+            self.burst = burst
+        self.bucket = TokenBucket(self.burst, self.monthly_quota / QUOTA_PERIOD_S)
+
+    def tune(self, fast_s=None, slow_s=None, idle_s=False):
+        if fast_s is not None:
+            self.fast_s = fast_s
+        if slow_s is not None:
+            self.slow_s = slow_s
+        if idle_s is not False:
+            self.idle_s = idle_s
+
+    def acquire(self):
+        """Take a token for one API request; False when the quota bucket is empty."""
+        if not self.bucket.try_take():
+            return False
+        with self._lock:
+            self._requests.append(time.monotonic())
+        return True
+
+    def next_poll_at(self, conn, last_poll=None, now=None):
+        """Epoch seconds of the next poll, or None to wait for a manual trigger.
+
+        Never earlier than the time the bucket needs to refill a token.
+        """
+        now = time.time() if now is None else now
+        base = now if last_poll is None else last_poll
+        state = classify_matches(conn, now)
+        if state["live"]:
+            mode, due = "live", base + self.fast_s
+        elif state["waiting"]:
+            mode, due = "waiting", base + self.slow_s
+        else:
+            mode = "idle"
+            due = None if self.idle_s is None else base + self.idle_s
+            if state["next_start"] is not None:
+                due = state["next_start"] if due is None else min(due, state["next_start"])
+        state["mode"] = mode
+        self._last_state = state
+        if due is None:
+            return None
+        return max(due, now + self.bucket.time_until(1))
+
+    def _used_in_period(self):
+        cutoff = time.monotonic() - QUOTA_PERIOD_S
+        with self._lock:
+            self._requests = [t for t in self._requests if t >= cutoff]
+            return len(self._requests)
+
+    def report(self):
+        """Quota usage so far and what the current mode would burn over a full period."""
+        state = self._last_state or {"mode": "unknown", "live": 0, "waiting": 0, "next_start": None}
+        used = self._used_in_period()
+        delay = {"live": self.fast_s, "waiting": self.slow_s}.get(state["mode"], self.idle_s)
+        if delay:
+            # the bucket caps the sustained rate, whatever the interval says
+            per_period = min(QUOTA_PERIOD_S / delay, self.monthly_quota)
+        else:
+            per_period = 0
+        return {
+            "mode": state["mode"],
+            "live_matches": state["live"],
+            "waiting_matches": state["waiting"],
+            "monthly_quota": self.monthly_quota,
+            "used_this_period": used,
+            "tokens_available": round(self.bucket.tokens, 2),
+            "projected_period_use": int(per_period),
+            "projected_pct_of_quota": round(100.0 * per_period / self.monthly_quota, 1) if self.monthly_quota else None,
+        }
@@ -0,0 +1,131 @@
+# utils/sql_sandbox.py
+"""Bounded, read-only execution for the editable SQL box on the SQL Queries page.
+
+Every run gets its own connection opened read-only (mode=ro + query_only) with
+an authorizer that only lets SELECTs and a few introspection PRAGMAs through.
+The statement is stepped with fetchmany, so only one page (plus one look-ahead
+row) is ever held in memory, and nothing past MAX_ROWS is read at all. A
+progress handler aborts the statement at the timeout, and run_page() runs it
+on a worker thread so the caller can keep the UI alive and interrupt
+the connection when the user cancels or navigates away.
+
+    res = run_page(sql, page=0, on_wait=lambda s: placeholder.caption(f"{s:.1f}s"))
+    res["columns"], res["rows"], res["has_next"]
+"""
+import sqlite3
+import threading
+import time
+
+from utils.config import DB_PATH
+from utils.db_connection import get_pool
+
+PAGE_SIZE = 100
+MAX_ROWS = 10_000          # rows a query may be paged through in total
+TIMEOUT_S = 5.0
+PROGRESS_STEPS = 10_000    # VM instructions between timeout checks
+WAIT_TICK_S = 0.25
+
+_READ_PRAGMAS = {"table_info", "table_xinfo", "index_list", "index_info", "index_xinfo", "foreign_key_list"}
+
+
+def _authorizer(action, arg1, arg2, db_name, trigger):
+    if action in (sqlite3.SQLITE_SELECT, sqlite3.SQLITE_READ, sqlite3.SQLITE_FUNCTION, sqlite3.SQLITE_RECURSIVE):
+        return sqlite3.SQLITE_OK
+    if action == sqlite3.SQLITE_PRAGMA and arg1 and arg1.lower() in _READ_PRAGMAS:
+        return sqlite3.SQLITE_OK
+    return sqlite3.SQLITE_DENY
+
+
+def open_sandbox(db_path=DB_PATH):
+    """Read-only connection that refuses anything but queries."""
+    get_pool(db_path)          # schema exists before we open read-only
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True, check_same_thread=False)
+    conn.execute("PRAGMA query_only=ON")
+    conn.set_authorizer(_authorizer)
+    return conn
+
+
+def execute_page(conn, sql, page=0, page_size=PAGE_SIZE, max_rows=MAX_ROWS, timeout_s=TIMEOUT_S, cancel=None):
+    """Run `sql` on `conn` and return one page of its result.
+
+    Raises TimeoutError after `timeout_s`, and sqlite3.OperationalError
+    ("interrupted") if `cancel` (a threading.Event) is set while it runs.
+    """
+    started = time.monotonic()
+    deadline = started + timeout_s
+    timed_out = []
+
+    def check():
+        if time.monotonic() > deadline:
+            timed_out.append(True)
+            return 1
+        return 1 if cancel is not None and cancel.is_set() else 0
+
+    offset = page * page_size
+    limit = max(0, min(page_size, max_rows - offset))
+    conn.set_progress_handler(check, PROGRESS_STEPS)
+    try:
+        cur = conn.execute(sql)
+        columns = [d[0] for d in cur.description] if cur.description else []
+        skipped = 0
+        while skipped < offset:
+            chunk = cur.fetchmany(min(page_size, offset - skipped))
+            if not chunk:
+                break
+            skipped += len(chunk)
+        rows = cur.fetchmany(limit + 1) if limit else []
+        cur.close()
+    except sqlite3.OperationalError:
+        if timed_out:
+            raise TimeoutError(f"Query stopped after {timeout_s:g}s") from None
+        raise
+    finally:
+        conn.set_progress_handler(None, 0)
+    more = len(rows) > limit
+    return {
+        "columns": columns,
+        "rows": rows[:limit],
+        "page": page,
+        "page_size": page_size,
+        "has_next": more and offset + limit < max_rows,
+        "capped": more and offset + limit >= max_rows,
+        "elapsed_s": round(time.monotonic() - started, 3),
+    }
+
+
+def run_page(sql, page=0, page_size=PAGE_SIZE, max_rows=MAX_ROWS, timeout_s=TIMEOUT_S,
+             db_path=DB_PATH, on_wait=None):
+    """execute_page() on a worker thread; calls on_wait(elapsed_s) while it runs.
+
+    If the caller is unwound while waiting (e.g. Streamlit stops the script
+    because the user pressed Cancel), the query is interrupted on the way out.
+    """
+    conn = open_sandbox(db_path)
+    cancel = threading.Event()
+    done = threading.Event()
+    out = {}
+
+    def work():
+        try:
+            out["result"] = execute_page(conn, sql, page, page_size, max_rows, timeout_s, cancel)
+        except BaseException as e:
+            out["error"] = e
+        finally:
+            done.set()
+
+    worker = threading.Thread(target=work, name="sql-sandbox", daemon=True)
+    started = time.monotonic()
+    worker.start()
+    try:
+        while not done.wait(WAIT_TICK_S):
+            if on_wait is not None:
+                on_wait(time.monotonic() - started)
+    finally:
+        if not done.is_set():
+            cancel.set()
+            conn.interrupt()
+            done.wait(timeout_s)
+        conn.close()
+    if "error" in out:
+        raise out["error"]
+    return out["result"]
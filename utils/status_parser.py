@@ -0,0 +1,152 @@
+# utils/status_parser.py
+"""Parse Cricbuzz status strings into winner / victory_type / victory_margin / is_complete.
+
+parse_status() works on one string and is memoized (most rows share a handful of
+status texts). derive_status_columns() does the same for a whole pandas Series
+at once, and backfill_status() uses it to re-derive those columns for every
+row of live_matches.
+
+Forms handled:
+  "India won by 4 wickets" / "won by 4 wkts" / "won by 23 runs (DLS method)"
+  "England won by an innings and 12 runs"
+  "Match tied (Pakistan won the Super Over)"
+  "New Zealand A need 98 runs in 91 balls", "trail by 40 runs", "lead by 2 runs", "opt to bat" (in progress)
+  tied / drawn / no result / abandoned / match over (complete, no winner), also
+  "Match drawn - India lead the series 1-0" and "Stumps - Day 5: Match drawn"
+  "Day 2: Stumps" (a day break of a multi-day match: in progress)
+"""
+import re
+from datetime import datetime
+from functools import lru_cache
+
+WIN_RE = re.compile(
+    r"^(?P<winner>.*?)\s+won\s+by\s+(?:(?P<innings>an\s+innings)\s+and\s+)?"
+    r"(?P<margin>\d+)\s+(?P<unit>wickets?|wkts?|runs?)\b",
+    re.IGNORECASE,
+)
+SUPER_OVER_RE = re.compile(r"(?:^|\()\s*(?P<so_winner>[^()]+?)\s+won\s+(?:the\s+|by\s+)?super\s+over", re.IGNORECASE)
+# "lead by N" only: "India lead the series 1-0" follows a finished result
+IN_PROGRESS_RE = re.compile(
+    r"\b(?:need|needs|require|requires|(?:trail|lead)s?\s+by\s+\d+|opt(?:ed)?\s+to)\b", re.IGNORECASE)
+COMPLETE_RE = re.compile(r"\b(?:tied|tie|draw|drawn|no result|abandoned|match over)\b", re.IGNORECASE)
+
+STATUS_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=STATUS_CACHE_SIZE)
+def parse_status(status_text: str):
+    """Parse winner, victory_type, victory_margin, is_complete from status string."""
+    if not status_text:
+        return "", "", None, 0
+    s = status_text.strip()
+    m = WIN_RE.search(s)
+    if m:
+        if m.group("innings"):
+            vtype = "innings"
+        elif m.group("unit").lower().startswith("w"):
+            vtype = "wickets"
+        else:
+            vtype = "runs"
+        return m.group("winner").strip(), vtype, int(m.group("margin")), 1
+    m = SUPER_OVER_RE.search(s)
+    if m:
+        return m.group("so_winner").strip(), "super over", None, 1
+    # chases and toss results can mention a team called e.g. "... Tie ..." - check first
+    if IN_PROGRESS_RE.search(s):
+        return "", "", None, 0
+    if COMPLETE_RE.search(s):
+        return "", "", None, 1
+    # stumps, lunch, toss, delays: not over yet
+    return "", "", None, 0
+
+
+def derive_status_columns(statuses):
+    """Vectorized parse_status over a pandas Series; returns a DataFrame with the four columns."""
+    import numpy as np
+    import pandas as pd
+
+    s = statuses.fillna("").astype(str).str.strip()
+    win = s.str.extract(WIN_RE)
+    so = s.str.extract(SUPER_OVER_RE)
+    has_win = win["margin"].notna().to_numpy()
+    has_so = so["so_winner"].notna().to_numpy() & ~has_win
+    in_progress = s.str.contains(IN_PROGRESS_RE).to_numpy()
+    done_kw = s.str.contains(COMPLETE_RE).to_numpy()
+
+    winner = np.where(has_win, win["winner"].fillna("").str.strip(),
+                      np.where(has_so, so["so_winner"].fillna("").str.strip(), ""))
+    is_wicket = win["unit"].fillna("").str.lower().str.startswith("w").to_numpy()
+    victory_type = np.select(
+        [has_win & win["innings"].notna().to_numpy(), has_win & is_wicket, has_win, has_so],
+        ["innings", "wickets", "runs", "super over"],
+        default="",
+    )
+    margin = pd.to_numeric(win["margin"], errors="coerce").astype("Int64")
+    is_complete = (has_win | has_so | (~in_progress & done_kw)).astype(int)
+
+    out = pd.DataFrame({
+        "winner": winner,
+        "victory_type": victory_type,
+        "victory_margin": margin,
+        "is_complete": is_complete,
+    }, index=statuses.index)
+    return out
+
+
+def backfill_status(conn, chunk_size=5000):
+    """Re-derive winner/victory_type/victory_margin/is_complete for all of live_matches.
+
+    Only rows whose derived values differ are written (with a fresh content_hash
+    and updated_at, since their content really changed).
+    Returns the number of rows updated. The caller owns the connection.
+    """
+    import pandas as pd
+    from utils.live_feed import CONTENT_COLUMNS, content_hash
+    from utils.migrations import migrate
+
+    migrate(conn)
+    df = pd.read_sql_query(
+        f"SELECT match_id, {', '.join(CONTENT_COLUMNS)} FROM live_matches", conn
+    )
+    if df.empty:
+        return 0
+    derived = derive_status_columns(df["status"])
+    old = pd.DataFrame({
+        "winner": df["winner"].fillna(""),
+        "victory_type": df["victory_type"].fillna(""),
+        "victory_margin": pd.to_numeric(df["victory_margin"], errors="coerce").astype("Int64"),
+        "is_complete": df["is_complete"].fillna(0).astype(int),
+    })
+    changed = pd.Series(False, index=df.index)
+    for col in derived.columns:
+        a, b = old[col], derived[col]
+        same = (a == b).fillna(False).astype(bool) | (a.isna() & b.isna())
+        changed |= ~same
+    if not changed.any():
+        return 0
+
+    now = datetime.utcnow().isoformat(timespec="seconds") + "Z"
+    updates = []
+    for idx in df.index[changed]:
+        rec = {k: (None if pd.isna(v) else v) for k, v in df.loc[idx].items()}
+        d = derived.loc[idx]
+        rec["winner"] = d["winner"]
+        rec["victory_type"] = d["victory_type"]
+        rec["victory_margin"] = None if pd.isna(d["victory_margin"]) else int(d["victory_margin"])
+        rec["is_complete"] = int(d["is_complete"])
+        if rec["start_ts"] is not None:
+            rec["start_ts"] = int(rec["start_ts"])
+        rec["content_hash"] = content_hash(rec)
+        rec["updated_at"] = now
+        updates.append(rec)
+
+    sql = """
+        UPDATE live_matches
+        SET winner=:winner, victory_type=:victory_type, victory_margin=:victory_margin,
+            is_complete=:is_complete, content_hash=:content_hash, updated_at=:updated_at
+        WHERE match_id=:match_id
+    """
+    with conn:
+        for i in range(0, len(updates), chunk_size):
+            conn.executemany(sql, updates[i:i + chunk_size])
+    return len(updates)
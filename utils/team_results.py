@@ -0,0 +1,118 @@
+# utils/team_results.py
+"""Per-team and head-to-head result summaries behind the Q5/Q22 free-API queries.
+
+team_results (team -> matches, wins) and head_to_head (team_a < team_b ->
+matches, wins_a, wins_b) are kept current by triggers on live_matches
+(migration 3), counting the parsed `winner` column.
+So the pages read a few indexed rows instead of LIKE-matching every status
+string. A team name of '' (missing in the feed) is not counted, and neither
+is an empty winner.
+
+rebuild_team_results() recomputes both tables from live_matches, and
+check_team_results() compares them with that recomputation (trigger drift) and
+with the original status-LIKE queries (parser vs LIKE differences).
+"""
+
+WINS_SQL = """
+SELECT team, wins
+FROM team_results
+WHERE wins > 0
+ORDER BY wins DESC
+"""
+
+HEAD_TO_HEAD_SQL = """
+SELECT team_a || ' vs ' || team_b AS pair,
+       matches AS matches_played,
+       wins_a AS wins_tA,
+       wins_b AS wins_tB
+FROM head_to_head
+ORDER BY matches DESC
+"""
+
+_EXPECTED_TEAMS = """
+SELECT team, COUNT(*) AS matches, SUM(won) AS wins
+FROM (
+    SELECT team1 AS team, IFNULL(winner <> '' AND winner = team1, 0) AS won FROM live_matches WHERE team1 <> ''
+    UNION ALL
+    SELECT team2, IFNULL(winner <> '' AND winner = team2, 0) FROM live_matches WHERE team2 <> ''
+)
+GROUP BY team
+"""
+
+_EXPECTED_PAIRS = """
+SELECT MIN(team1, team2) AS team_a, MAX(team1, team2) AS team_b, COUNT(*) AS matches,
+       SUM(IFNULL(winner <> '' AND winner = MIN(team1, team2), 0)) AS wins_a,
+       SUM(IFNULL(winner <> '' AND winner = MAX(team1, team2), 0)) AS wins_b
+FROM live_matches
+WHERE team1 <> '' AND team2 <> ''
+GROUP BY team_a, team_b
+"""
+
+# the ad-hoc queries Q5/Q22 ran before the summary tables existed
+LEGACY_WINS_SQL = """
+SELECT team, COUNT(*) as wins
+FROM (
+    SELECT
+        CASE
+            WHEN status LIKE team1 || ' won%' THEN team1
+            WHEN status LIKE team2 || ' won%' THEN team2
+        END as team
+    FROM live_matches
+) WHERE team IS NOT NULL
+GROUP BY team
+"""
+
+LEGACY_HEAD_TO_HEAD_SQL = """
+SELECT tA, tB, COUNT(*) AS matches_played,
+  SUM(CASE WHEN winner = tA THEN 1 ELSE 0 END) AS wins_tA,
+  SUM(CASE WHEN winner = tB THEN 1 ELSE 0 END) AS wins_tB
+FROM (
+  SELECT
+    CASE WHEN team1 < team2 THEN team1 ELSE team2 END AS tA,
+    CASE WHEN team1 < team2 THEN team2 ELSE team1 END AS tB,
+    CASE
+      WHEN status LIKE team1 || ' won%' THEN team1
+      WHEN status LIKE team2 || ' won%' THEN team2
+      ELSE NULL
+    END AS winner
+  FROM live_matches
+)
+WHERE tA IS NOT NULL AND tB IS NOT NULL
+GROUP BY tA, tB
+"""
+
+
+def rebuild_team_results(conn):
+    """Recompute both summary tables from live_matches. The caller owns the transaction."""
+    conn.execute("DELETE FROM team_results")
+    conn.execute("DELETE FROM head_to_head")
+    conn.execute(f"INSERT INTO team_results (team, matches, wins) {_EXPECTED_TEAMS}")
+    conn.execute(f"INSERT INTO head_to_head (team_a, team_b, matches, wins_a, wins_b) {_EXPECTED_PAIRS}")
+    return conn.execute("SELECT COUNT(*) FROM team_results").fetchone()[0]
+
+
+def _diff(expected, actual):
+    """[(key, expected, actual)] for keys whose values differ between two {key: tuple} maps."""
+    return [(k, expected.get(k), actual.get(k))
+            for k in sorted(set(expected) | set(actual))
+            if expected.get(k) != actual.get(k)]
+
+
+def check_team_results(conn):
+    """Compare the summary tables with live_matches.
+
+    "drift": tables vs. a fresh aggregation of the winner column (should always be empty).
+    "legacy_wins" / "legacy_head_to_head": tables vs. the old status-LIKE queries;
+    entries here are rows where the status parser and the LIKE prefix disagree
+    (e.g. super-over results, statuses edited by hand).
+    """
+    teams = {r[0]: tuple(r[1:]) for r in conn.execute("SELECT team, matches, wins FROM team_results")}
+    pairs = {r[:2]: tuple(r[2:]) for r in conn.execute(
+        "SELECT team_a, team_b, matches, wins_a, wins_b FROM head_to_head")}
+    drift = _diff({r[0]: tuple(r[1:]) for r in conn.execute(_EXPECTED_TEAMS)}, teams)
+    drift += _diff({r[:2]: tuple(r[2:]) for r in conn.execute(_EXPECTED_PAIRS)}, pairs)
+
+    legacy_wins = _diff({r[0]: (r[1],) for r in conn.execute(LEGACY_WINS_SQL)},
+                        {t: (v[1],) for t, v in teams.items() if v[1] > 0})
+    legacy_h2h = _diff({r[:2]: tuple(r[2:]) for r in conn.execute(LEGACY_HEAD_TO_HEAD_SQL)}, pairs)
+    return {"drift": drift, "legacy_wins": legacy_wins, "legacy_head_to_head": legacy_h2h}
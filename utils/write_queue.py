@@ -0,0 +1,151 @@
+# utils/write_queue.py
+"""Single writer thread with group commit for every write to cricbuzz.db.
+
+Streamlit sessions (CRUD clicks) and the ingest poller submit write requests
+instead of opening their own write transactions. The writer thread drains the
+queue, merges everything that arrives within a short commit window into one
+transaction (one fsync), runs each request under its own SAVEPOINT so a
+failing request doesn't sink the others, and resolves each caller's Future
+with that request's own result or exception once the group has committed.
+
+    fut = get_write_queue().execute("DELETE FROM live_matches WHERE match_id=?", (mid,))
+    fut.result(timeout=10)   # rowcount
+"""
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from utils.config import DB_PATH
+from utils.db_connection import get_pool
+
+COMMIT_WINDOW_S = 0.005    # how long to wait for more requests to join a group
+MAX_GROUP = 256            # requests per transaction
+
+
+class WriteQueue:
+    def __init__(self, db_path=DB_PATH, commit_window=COMMIT_WINDOW_S, max_group=MAX_GROUP):
+        self.db_path = db_path
+        self.commit_window = commit_window
+        self.max_group = max_group
+        self.generation = 0          # bumped after every committed group
+        self.stats = {"requests": 0, "groups": 0, "failed": 0}
+        self._q = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def _ensure_started(self):
+        if self._thread and self._thread.is_alive():
+            return
+        with self._lock:
+            if not (self._thread and self._thread.is_alive()):
+                self._thread = threading.Thread(target=self._run, name="db-writer", daemon=True)
+                self._thread.start()
+
+    # --- public API ---
+    def submit(self, fn, *args, **kwargs):
+        """Queue `fn(conn, *args, **kwargs)` to run in the next group; returns a Future."""
+        fut = Future()
+        self._ensure_started()
+        self._q.put((fn, args, kwargs, fut))
+        return fut
+
+    def execute(self, sql, params=()):
+        return self.submit(lambda conn: conn.execute(sql, params).rowcount)
+
+    def executemany(self, sql, seq):
+        return self.submit(lambda conn: conn.executemany(sql, seq).rowcount)
+
+    def stop(self, timeout=5):
+        self._q.put(None)
+        if self._thread:
+            self._thread.join(timeout)
+
+    # --- writer thread ---
+    def _collect(self, first):
+        group = [first]
+        deadline = time.monotonic() + self.commit_window
+        while len(group) < self.max_group:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._q.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is None:
+                self._q.put(None)    # let the loop see the stop marker after this group
+                break
+            group.append(item)
+        return group
+
+    def _fail(self, group, exc):
+        for _, _, _, fut in group:
+            if not fut.done():
+                fut.set_exception(exc)
+        self.stats["failed"] += len(group)
+
+    def _run_group(self, group):
+        # claim every request first: cancelled ones are dropped (their waiters
+        # notified) and the rest can't be cancelled any more, so whatever fails
+        # below (connect, BEGIN, COMMIT) can resolve all of them
+        group = [item for item in group if item[3].set_running_or_notify_cancel()]
+        if not group:
+            return
+        results = []
+        try:
+            # write() rolls the transaction back if anything in here raises
+            with get_pool(self.db_path).write() as conn:
+                if conn.in_transaction:
+                    conn.commit()
+                conn.execute("BEGIN IMMEDIATE")
+                for fn, args, kwargs, fut in group:
+                    conn.execute("SAVEPOINT req")
+                    try:
+                        res = fn(conn, *args, **kwargs)
+                        conn.execute("RELEASE req")
+                        results.append((True, res))
+                    except Exception as e:
+                        conn.execute("ROLLBACK TO req")
+                        conn.execute("RELEASE req")
+                        results.append((False, e))
+                conn.commit()
+        except Exception as e:
+            self._fail(group, e)
+            return
+        self.generation += 1
+        self.stats["groups"] += 1
+        self.stats["requests"] += len(group)
+        # resolve only after COMMIT, so a caller never sees a result that could still roll back
+        for (_, _, _, fut), (ok, value) in zip(group, results):
+            if ok:
+                fut.set_result(value)
+            else:
+                self.stats["failed"] += 1
+                fut.set_exception(value)
+
+    def _run(self):
+        while True:
+            first = self._q.get()
+            if first is None:
+                return
+            group = self._collect(first)
+            try:
+                self._run_group(group)
+            except Exception as e:
+                # one bad group must not take the writer thread (and every later caller) down
+                self._fail(group, e)
+
+_queues = {}
+_queues_lock = threading.Lock()
+
+def get_write_queue(db_path=DB_PATH):
+    """Process-wide writer for `db_path`."""
+    with _queues_lock:
+        wq = _queues.get(db_path)
+        if wq is None:
+            wq = _queues[db_path] = WriteQueue(db_path)
+        return wq
+
+def submit_write(fn, *args, db_path=DB_PATH, **kwargs):
+    return get_write_queue(db_path).submit(fn, *args, **kwargs)